@@ -0,0 +1,214 @@
+"""
+Offline stand-in for YouTube: a local HTTP server for media and avatars,
+and a fake `yt_dlp.YoutubeDL` that lists playlists and resolves videos to it.
+"""
+import functools
+import http.server
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import benchmarks.media as media
+
+@dataclass
+class FakeYouTubeOptions:
+    """
+    Shape of the simulated YouTube.
+    """
+    entries: int = 10 # Playlist length
+    channels: int = 10 # Channels the videos are spread over
+    media_seconds: float = 30.0 # Duration of every video's audio
+    bitrate: int = 96000 # bits/s
+    avatar_size: int = 64 * 1024 # bytes
+    server_latency: float = 0.0 # seconds per HTTP request
+    extractor_latency: float = 0.0 # seconds per extract_info call
+    playlist_json: Optional[str] = None # Recorded `yt-dlp -J --flat-playlist` output to list instead
+
+class FakeYouTube:
+    """
+    Serves one synthetic WebM file for every video and one PNG for every avatar.
+    """
+    def __init__(self, options: FakeYouTubeOptions) -> None:
+        self.options = options
+        self.webm = media.make_webm(options.media_seconds, options.bitrate)
+        self.avatar = media.make_png(options.avatar_size)
+        self.requests = 0
+        self._server: Optional[http.server.ThreadingHTTPServer] = None
+
+        self.entries = self._load_entries()
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _load_entries(self) -> List[Dict[str, Any]]:
+        if self.options.playlist_json:
+            with open(self.options.playlist_json, "r", encoding="utf-8") as f:
+                recorded = json.load(f)
+            return [
+                {"id": entry["id"],
+                 "title": entry.get("title") or entry["id"],
+                 "uploader": entry.get("uploader") or entry.get("channel") or "Channel",
+                 "uploader_id": entry.get("uploader_id") or "@channel"}
+                for entry in recorded.get("entries") or [] if entry and entry.get("id")
+            ]
+        return [
+            {"id": f"v{i:010d}",
+             "title": f"Benchmark video {i}",
+             "uploader": f"Channel {i % self.options.channels}",
+             "uploader_id": f"@channel{i % self.options.channels}"}
+            for i in range(self.options.entries)
+        ]
+
+    def start(self) -> None:
+        """Starts the HTTP server on a free local port."""
+        handler = functools.partial(_Handler, self)
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stops the HTTP server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def install(self) -> None:
+        """Replaces `yt_dlp.YoutubeDL` with a fake bound to this server."""
+        import yt_dlp # type: ignore
+        fake_youtube = self
+
+        class BoundFakeYoutubeDL(FakeYoutubeDL):
+            youtube = fake_youtube
+
+        yt_dlp.YoutubeDL = BoundFakeYoutubeDL
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def __init__(self, youtube: FakeYouTube, *args: Any, **kwargs: Any) -> None:
+        self.youtube = youtube
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.youtube.requests += 1
+        if self.youtube.options.server_latency:
+            time.sleep(self.youtube.options.server_latency)
+
+        if self.path.startswith("/media/"):
+            data, content_type = self.youtube.webm, "video/webm"
+        elif self.path.startswith("/avatar/"):
+            data, content_type = self.youtube.avatar, "image/png"
+        else:
+            self.send_error(404)
+            return
+
+        start, end = 0, len(data) - 1
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2)) if match.group(2) else end, end)
+            if start > end:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(data)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        self.wfile.write(data[start:end + 1])
+
+class FakeYoutubeDL:
+    """
+    Implements the parts of `yt_dlp.YoutubeDL` the app uses, backed by `FakeYouTube`.
+    """
+    youtube: FakeYouTube
+
+    def __init__(self, params: Optional[Dict[str, Any]] = None) -> None:
+        self.params = dict(params or {})
+        outtmpl = self.params.get("outtmpl")
+        self.params["outtmpl"] = {"default": outtmpl if isinstance(outtmpl, str) else "%(title)s [%(id)s].%(ext)s"}
+
+    def __enter__(self) -> "FakeYoutubeDL":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        pass
+
+    def extract_info(self, url: str, download: bool = True, process: bool = True) -> Dict[str, Any]:
+        options = self.youtube.options
+        if options.extractor_latency:
+            time.sleep(options.extractor_latency)
+
+        if "list=" in url:
+            entries = [{"_type": "url",
+                        "url": f"https://www.youtube.com/watch?v={entry['id']}",
+                        **entry} for entry in self.youtube.entries]
+            return {"_type": "playlist",
+                    "id": "PLbenchmark",
+                    "title": "Benchmark playlist",
+                    "entries": iter(entries) if not process and self.params.get("lazy_playlist") else entries}
+
+        match = re.search(r"watch\?v=([\w-]+)", url)
+        if match:
+            info = {"id": match.group(1),
+                    "ext": "webm",
+                    "protocol": "http",
+                    "url": f"{self.youtube.base_url}/media/{match.group(1)}.webm",
+                    "filesize": len(self.youtube.webm),
+                    "http_headers": {}}
+            if download:
+                self.process_ie_result(info, download=True)
+            return info
+
+        match = re.search(r"youtube\.com/(@[\w.-]+)", url)
+        if match:
+            return {"thumbnails": [{"id": "avatar_uncropped",
+                                    "url": f"{self.youtube.base_url}/avatar/{match.group(1)}.png"}]}
+
+        raise ValueError(f"Unsupported URL: {url}")
+
+    def process_ie_result(self, info: Dict[str, Any], download: bool = True) -> Dict[str, Any]:
+        if not download:
+            return info
+
+        import src.util.http as http_util
+        filepath = self.params["outtmpl"]["default"]
+        part_path = filepath + ".part"
+        started_at = time.monotonic()
+        offset = os.path.getsize(part_path) if self.params.get("continuedl") and os.path.exists(part_path) else 0
+
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        with http_util.get_session().get(info["url"], headers=headers, stream=True) as response:
+            response.raise_for_status()
+            with open(part_path, "ab" if offset else "wb") as f:
+                for chunk in response.iter_content(chunk_size=1 << 16):
+                    f.write(chunk)
+        os.replace(part_path, filepath)
+
+        for hook in self.params.get("progress_hooks") or []:
+            size = os.path.getsize(filepath)
+            hook({"status": "finished",
+                  "filename": filepath,
+                  "total_bytes": size,
+                  "downloaded_bytes": size,
+                  "elapsed": time.monotonic() - started_at})
+        return info
@@ -0,0 +1,77 @@
+"""
+Synthetic media for the benchmarks: Opus-in-WebM audio and PNG avatars.
+
+The files are structurally valid (the remuxer, mutagen and libmagic accept
+them) but carry noise instead of real audio and pictures.
+"""
+import random
+import struct
+import zlib
+
+_PACKET_MS = 20
+_PACKETS_PER_CLUSTER = 250 # 5 seconds; block timecodes are relative 16-bit ms
+_OPUS_TOC = 0xF8 # CELT fullband, 20 ms, one frame per packet
+
+def _element(element_id: int, data: bytes) -> bytes:
+    """EBML element with an 8-byte size field."""
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    return id_bytes + (0x01 << 56 | len(data)).to_bytes(8, "big") + data
+
+def _uint(element_id: int, value: int) -> bytes:
+    return _element(element_id, value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big"))
+
+def make_webm(seconds: float, bitrate: int = 96000, seed: int = 0) -> bytes:
+    """
+    Builds a WebM file with one Opus audio track.
+
+    Args:
+        seconds (float): Duration of the audio.
+        bitrate (int): Audio bitrate in bits per second; sets the packet size.
+        seed (int): Seed of the packet payload noise.
+
+    Returns:
+        bytes: The WebM file.
+    """
+    rng = random.Random(seed)
+    packet_count = max(1, int(seconds * 1000 / _PACKET_MS))
+    payload_size = max(1, bitrate // 8 * _PACKET_MS // 1000 - 1)
+
+    opus_head = b"OpusHead" + bytes([1, 2]) + struct.pack("<HIhB", 312, 48000, 0, 0)
+    ebml = _element(0x1A45DFA3, _element(0x4282, b"webm"))
+    info = _element(0x1549A966, _uint(0x2AD7B1, 1000000))
+    tracks = _element(0x1654AE6B, _element(0xAE, _uint(0xD7, 1) + _uint(0x83, 2)
+                                           + _element(0x86, b"A_OPUS") + _element(0x63A2, opus_head)))
+
+    clusters = []
+    for start in range(0, packet_count, _PACKETS_PER_CLUSTER):
+        blocks = [_uint(0xE7, start * _PACKET_MS)]
+        for i in range(min(_PACKETS_PER_CLUSTER, packet_count - start)):
+            packet = bytes([_OPUS_TOC]) + rng.randbytes(payload_size)
+            # Track 1, relative timecode, keyframe flag
+            blocks.append(_element(0xA3, bytes([0x81]) + struct.pack(">h", i * _PACKET_MS) + b"\x80" + packet))
+        clusters.append(_element(0x1F43B675, b"".join(blocks)))
+
+    segment = info + tracks + b"".join(clusters)
+    return ebml + _element(0x18538067, segment)
+
+def make_png(size: int, seed: int = 0) -> bytes:
+    """
+    Builds a noise PNG of roughly `size` bytes.
+
+    Args:
+        size (int): Approximate file size in bytes.
+        seed (int): Seed of the pixel noise.
+
+    Returns:
+        bytes: The PNG file.
+    """
+    rng = random.Random(seed)
+    side = max(1, int((max(size, 64) / 3) ** 0.5))
+    rows = b"".join(b"\x00" + rng.randbytes(side * 3) for _ in range(side))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", side, side, 8, 2, 0, 0, 0) # 8-bit RGB
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(rows, 1)) + chunk(b"IEND", b""))
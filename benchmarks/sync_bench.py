@@ -0,0 +1,286 @@
+"""
+Offline end-to-end sync benchmark.
+
+Syncs playlists of several sizes against a local YouTube stand-in (see
+`benchmarks.fake_youtube`), once from scratch and once more with nothing
+changed, and reports wall time, time per stage, peak RSS and counts of
+filesystem calls. Each size runs in its own process so that peak RSS and
+caches don't leak between sizes.
+
+Usage (from the repository root):
+    python -m benchmarks.sync_bench
+    python -m benchmarks.sync_bench --sizes 10,1000 --jobs 4 --output before.json
+    python -m benchmarks.sync_bench --sizes 10,1000 --jobs 4 --baseline before.json
+"""
+import argparse
+import builtins
+import contextlib
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.fake_youtube import FakeYouTube, FakeYouTubeOptions
+
+# Filesystem calls counted during a sync
+_COUNTED_CALLS = (
+    (os, "stat"),
+    (os, "lstat"),
+    (os, "scandir"),
+    (os, "listdir"),
+    (os, "replace"),
+    (os, "remove"),
+    (builtins, "open"),
+)
+
+class _CallCounter:
+    """
+    Counts calls of selected functions by wrapping them in place.
+    """
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def install(self) -> None:
+        for module, name in _COUNTED_CALLS:
+            setattr(module, name, self._wrap(name, getattr(module, name)))
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {name: self.counts[name] for _, name in _COUNTED_CALLS}
+
+    def _wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            with self._lock:
+                self.counts[name] += 1
+            return func(*args, **kwargs)
+        return counted
+
+def _configure(base_dir: str, args: argparse.Namespace) -> None:
+    import src.config as config
+    import src.util.rate_limit as rate_limit
+
+    config.BASE_DIR = base_dir
+    config.DOWN_DIR = os.path.join(base_dir, "Downloads")
+    config.SMPL_DIR = os.path.join(config.DOWN_DIR, "Playlists")
+    config.ICON_DIR = os.path.join(base_dir, "ChannelProfiles")
+    config.DB_PATH = os.path.join(base_dir, "downloaded_info.db")
+    config.FS_INDEX_PATH = os.path.join(base_dir, "fs_index.json")
+    config.METRICS_PATH = os.path.join(base_dir, "metrics.json")
+    config.COVER_ART_CACHE_DIR = None
+    config.STREAM_DOWNLOADS = args.stream
+
+    # The limiter's defaults are bound at import time; replace the shared instance
+    rate_limit._rate_limiter = rate_limit.RateLimiter(rate=args.rate_limit or 1e9,
+                                                      burst=max(1, int(args.rate_limit or 1e9)),
+                                                      console=Console(quiet=True))
+
+def run_single(entries: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Runs one cold sync and one unchanged resync of a playlist with `entries` videos.
+
+    Returns:
+        Dict[str, Any]: Measurements of both syncs.
+    """
+    base_dir = tempfile.mkdtemp(prefix="ypd-bench-")
+    _configure(base_dir, args)
+
+    import src.downloader.download_playlist as download_playlist
+    import src.pipeline.engine as engine
+    import src.playlist.smpl as smpl
+    from src.app import Application
+
+    youtube = FakeYouTube(FakeYouTubeOptions(entries=entries,
+                                             channels=args.channels,
+                                             media_seconds=args.media_seconds,
+                                             bitrate=args.bitrate,
+                                             avatar_size=args.avatar_size,
+                                             server_latency=args.server_latency / 1000,
+                                             extractor_latency=args.extractor_latency / 1000,
+                                             playlist_json=args.playlist_json))
+    youtube.start()
+    youtube.install()
+
+    # Collect stage stats and the time spent outside the pipeline
+    phases: Dict[str, float] = Counter()
+    stages: Dict[str, Dict[str, float]] = {}
+    original_run = engine.Pipeline.run
+
+    def run_pipeline(pipeline: engine.Pipeline, items: Any) -> List[Any]:
+        try:
+            return original_run(pipeline, items)
+        finally:
+            for stats in pipeline.stats():
+                stages[stats.name] = {"busy_seconds": stats.busy_seconds,
+                                      "elapsed_seconds": stats.elapsed_seconds,
+                                      "processed": stats.processed,
+                                      "dropped": stats.dropped}
+    engine.Pipeline.run = run_pipeline # type: ignore
+
+    def timed(module: Any, name: str) -> None:
+        func = getattr(module, name)
+        def wrapper(*a: Any, **kw: Any) -> Any:
+            started_at = time.perf_counter()
+            try:
+                return func(*a, **kw)
+            finally:
+                phases[name] += time.perf_counter() - started_at
+        setattr(module, name, wrapper)
+    timed(download_playlist, "get_playlist_info")
+    timed(smpl, "generate_smpl")
+
+    counter = _CallCounter()
+    counter.install()
+
+    results: Dict[str, Any] = {"entries": len(youtube.entries)}
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            app = Application()
+            try:
+                for label in ("cold", "resync"):
+                    phases.clear()
+                    stages.clear()
+                    calls_before = counter.snapshot()
+                    requests_before = youtube.requests
+
+                    started_at = time.perf_counter()
+                    app.run(playlist_url="https://www.youtube.com/playlist?list=PLbenchmark",
+                            playlist_name=None,
+                            reverse=False,
+                            jobs=args.jobs)
+                    wall = time.perf_counter() - started_at
+
+                    calls_after = counter.snapshot()
+                    results[label] = {
+                        "wall_seconds": wall,
+                        "phases": dict(phases),
+                        "stages": dict(stages),
+                        "calls": {name: calls_after[name] - calls_before[name] for name in calls_after},
+                        "http_requests": youtube.requests - requests_before,
+                    }
+            finally:
+                app.close()
+    finally:
+        youtube.stop()
+        if not args.keep:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    # ru_maxrss is in KiB on Linux
+    results["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return results
+
+def _child_args(args: argparse.Namespace) -> List[str]:
+    forwarded = ["--jobs", str(args.jobs),
+                 "--channels", str(args.channels),
+                 "--media-seconds", str(args.media_seconds),
+                 "--bitrate", str(args.bitrate),
+                 "--avatar-size", str(args.avatar_size),
+                 "--server-latency", str(args.server_latency),
+                 "--extractor-latency", str(args.extractor_latency),
+                 "--rate-limit", str(args.rate_limit)]
+    if args.playlist_json:
+        forwarded += ["--playlist-json", args.playlist_json]
+    if not args.stream:
+        forwarded.append("--no-stream")
+    if args.keep:
+        forwarded.append("--keep")
+    return forwarded
+
+def _print_report(results: List[Dict[str, Any]], baseline: Optional[List[Dict[str, Any]]], console: Console) -> None:
+    previous = {result["entries"]: result for result in baseline or []}
+
+    def delta(value: float, old: Optional[float]) -> str:
+        if not old:
+            return ""
+        return f" ({(value - old) / old * 100:+.0f}%)"
+
+    table = Table(title="Sync benchmark")
+    for column in ("entries", "cold s", "resync s", "peak RSS MB", "stat/lstat", "open", "scandir/listdir", "HTTP requests"):
+        table.add_column(column, justify="right")
+    for result in results:
+        old = previous.get(result["entries"])
+        cold, resync = result["cold"], result["resync"]
+        calls = cold["calls"]
+        table.add_row(str(result["entries"]),
+                      f"{cold['wall_seconds']:.2f}{delta(cold['wall_seconds'], old and old['cold']['wall_seconds'])}",
+                      f"{resync['wall_seconds']:.2f}{delta(resync['wall_seconds'], old and old['resync']['wall_seconds'])}",
+                      f"{result['peak_rss_mb']:.0f}{delta(result['peak_rss_mb'], old and old['peak_rss_mb'])}",
+                      f"{calls['stat'] + calls['lstat']} / {resync['calls']['stat'] + resync['calls']['lstat']}",
+                      f"{calls['open']} / {resync['calls']['open']}",
+                      f"{calls['scandir'] + calls['listdir']} / {resync['calls']['scandir'] + resync['calls']['listdir']}",
+                      f"{cold['http_requests']} / {resync['http_requests']}")
+    console.print(table)
+    console.print("[dim]Call and request counts: cold sync / resync[/dim]")
+
+    stage_table = Table(title="Time per stage (cold sync, busy seconds summed over workers / stage wall seconds)")
+    stage_table.add_column("entries", justify="right")
+    stage_names = list(dict.fromkeys(name for result in results for name in result["cold"]["stages"]))
+    for name in ["list"] + stage_names + ["smpl"]:
+        stage_table.add_column(name, justify="right")
+    for result in results:
+        cold = result["cold"]
+        row = [str(result["entries"]), f"{cold['phases'].get('get_playlist_info', 0):.2f}"]
+        for name in stage_names:
+            stage = cold["stages"].get(name)
+            row.append(f"{stage['busy_seconds']:.2f} / {stage['elapsed_seconds']:.2f}" if stage else "-")
+        row.append(f"{cold['phases'].get('generate_smpl', 0):.2f}")
+        stage_table.add_row(*row)
+    console.print(stage_table)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline end-to-end sync benchmark.")
+    parser.add_argument("--sizes", default="10,1000,10000", help="Comma-separated playlist lengths")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="Concurrent downloads")
+    parser.add_argument("--channels", type=int, default=20, help="Channels the videos are spread over")
+    parser.add_argument("--media-seconds", type=float, default=5.0, help="Audio duration of every video")
+    parser.add_argument("--bitrate", type=int, default=96000, help="Audio bitrate in bits/s")
+    parser.add_argument("--avatar-size", type=int, default=64 * 1024, help="Avatar image size in bytes")
+    parser.add_argument("--server-latency", type=float, default=0.0, help="Latency per HTTP request in ms")
+    parser.add_argument("--extractor-latency", type=float, default=0.0, help="Latency per extract_info call in ms")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second (0 disables the limiter)")
+    parser.add_argument("--playlist-json", help="Recorded `yt-dlp -J --flat-playlist` output to sync instead of synthetic entries")
+    parser.add_argument("--no-stream", dest="stream", action="store_false", help="Download to .webm and convert instead of streaming")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary download directories")
+    parser.add_argument("--output", help="Write the results as JSON, e.g. to compare commits")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS) # Internal: run one size in this process
+    args = parser.parse_args()
+
+    if args.single is not None:
+        print(json.dumps(run_single(args.single, args)))
+        return
+
+    console = Console()
+    results: List[Dict[str, Any]] = []
+    for size in (int(size) for size in args.sizes.split(",") if size.strip()):
+        console.print(f"[bold blue]➜ Syncing {size} entries...[/bold blue]")
+        process = subprocess.run([sys.executable, "-m", "benchmarks.sync_bench", "--single", str(size)] + _child_args(args),
+                                 stdout=subprocess.PIPE, text=True)
+        if process.returncode != 0:
+            console.print(f"[red]✖ Benchmark of {size} entries failed (exit code {process.returncode})[/red]")
+            continue
+        results.append(json.loads(process.stdout.strip().splitlines()[-1]))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    _print_report(results, baseline, console)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+        console.print(f"[bold green]✔ Results saved:[/bold green] {args.output}")
+
+if __name__ == "__main__":
+    main()
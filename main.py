@@ -1,40 +1,149 @@
 import argparse
+import contextlib
+import sys
+from typing import ContextManager
 
-from rich.prompt import Prompt
-
+import src.config as config
+import src.util.output as output
 from src.app import Application
+from src.exceptions import BatchFileError
+from src.playlist.batch import PlaylistRequest, parse_interval, read_batch_file
 
-def main():
+def add_run_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--output", choices=output.MODES, default=config.OUTPUT_MODE,
+                        help="Styled console output, JSON lines (e.g. for cron), or only a final summary")
+    parser.add_argument("--metrics", default=config.METRICS_PATH, metavar="PATH",
+                        help="Where to write the JSON metrics summary after every run")
+    parser.add_argument("--prometheus", default=config.METRICS_PROMETHEUS_PATH, metavar="PATH",
+                        help="Also write the metrics as a Prometheus textfile (e.g. for node_exporter)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the run with cProfile/tracemalloc and print the hottest call sites")
+
+def profiled(app: Application, enabled: bool) -> ContextManager[None]:
+    if not enabled:
+        return contextlib.nullcontext()
+    import src.util.profiling as profiling
+    return profiling.profile(console=app.console)
+
+def watch(argv: list[str]):
+    parser = argparse.ArgumentParser(prog="main.py watch",
+                                     description="Keep syncing YouTube playlists on an interval.")
+    parser.add_argument("playlist_url", nargs="*", help="YouTube playlist URL(s) to watch")
+    parser.add_argument("-f", "--file", help="Batch file with one `url[,name[,reverse[,interval]]]` row per playlist")
+    parser.add_argument("-r", "--reverse", action="store_true", help="Reverse playlist order (for URLs given on the command line)")
+    parser.add_argument("-i", "--interval", default=str(config.WATCH_INTERVAL),
+                        help="Default interval between polls of a playlist, e.g. 900, 15m or 1h")
+    parser.add_argument("-j", "--jobs", type=int, default=config.DEFAULT_JOBS, help="Number of videos downloaded concurrently")
+    add_run_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    interval = parse_interval(args.interval)
+    if interval is None:
+        parser.error(f"invalid interval: {args.interval}")
+
+    requests = [PlaylistRequest(url=url, reverse=args.reverse) for url in args.playlist_url]
+    if args.file:
+        try:
+            requests.extend(read_batch_file(args.file))
+        except BatchFileError as e:
+            parser.error(str(e))
+    if not requests:
+        parser.error("no playlists to watch")
+
+    output.configure(args.output)
+    app = Application(metrics_path=args.metrics, prometheus_path=args.prometheus)
+    try:
+        with profiled(app, args.profile):
+            app.watch(requests, default_interval=interval, jobs=max(1, args.jobs))
+    except KeyboardInterrupt:
+        app.console.print("[bold yellow]➜ Stopped watching[/bold yellow]")
+    finally:
+        app.close()
+
+def export(argv: list[str]):
+    parser = argparse.ArgumentParser(prog="main.py export",
+                                     description="Rebuild SMPL playlists from the DB without accessing YouTube.")
+    parser.add_argument("playlist_id", nargs="*", help="YouTube playlist ID(s) to export (default: every synced playlist)")
+    parser.add_argument("-j", "--jobs", type=int, default=config.EXPORT_WORKERS, help="Number of playlists exported concurrently")
+    parser.add_argument("--output", choices=output.MODES, default=config.OUTPUT_MODE,
+                        help="Styled console output, JSON lines (e.g. for cron), or only a final summary")
+
+    args = parser.parse_args(argv)
+
+    output.configure(args.output)
     app = Application()
+    try:
+        app.export(args.playlist_id or None, workers=max(1, args.jobs))
+    finally:
+        app.close()
 
-    parser = argparse.ArgumentParser(description="Download YouTube playlist audio and generate SMPL playlist.")
-    parser.add_argument("playlist_url", nargs="?", help="YouTube playlist URL (optional, for CLI mode)")
+def main():
+    if sys.argv[1:2] == ["watch"]:
+        watch(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["export"]:
+        export(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(description="Download YouTube playlist audio and generate SMPL playlist.",
+                                     epilog="Run `main.py watch --help` for watch mode and `main.py export --help` to rebuild SMPL playlists offline.")
+    parser.add_argument("playlist_url", nargs="*", help="YouTube playlist URL(s) (optional, for CLI mode)")
     parser.add_argument("-n", "--playlist_name", help="Custom playlist name (optional)")
     parser.add_argument("-r", "--reverse", action="store_true", help="Reverse playlist order")
+    parser.add_argument("-j", "--jobs", type=int, default=config.DEFAULT_JOBS, help="Number of videos downloaded concurrently")
+    parser.add_argument("-f", "--file", help="Batch file with one `url[,name[,reverse]]` row per playlist")
+    add_run_arguments(parser)
 
     args = parser.parse_args()
 
+    output.configure(args.output)
+    app = Application(metrics_path=args.metrics, prometheus_path=args.prometheus)
+
+    if args.file or len(args.playlist_url) > 1:
+        # Batch mode
+        if args.playlist_name:
+            parser.error("--playlist_name can't be used with several playlists; set names in the batch file")
+        requests = [PlaylistRequest(url=url, reverse=args.reverse) for url in args.playlist_url]
+        if args.file:
+            try:
+                requests.extend(read_batch_file(args.file))
+            except BatchFileError as e:
+                parser.error(str(e))
+        try:
+            with profiled(app, args.profile):
+                app.run_batch(requests, jobs=max(1, args.jobs))
+        finally:
+            app.close()
+        return
+
     playlist_url = ""
     playlist_name = ""
     reverse_order = False
 
     if args.playlist_url:
         # Command-line mode
-        playlist_url = args.playlist_url
+        playlist_url = args.playlist_url[0]
         playlist_name = args.playlist_name
         reverse_order = args.reverse or False
 
     else:
         # Manual mode
+        from rich.prompt import Prompt
         playlist_url = Prompt.ask("[bold yellow]Enter YouTube playlist URL[/bold yellow]")
         playlist_name = Prompt.ask("[bold yellow]Enter custom playlist name (optional)[/bold yellow]", default=None)
         reverse_order = Prompt.ask("[bold yellow]Reverse playlist order? (yes/no)[/bold yellow]", default="no").lower() == "yes"
     
-    app.run(
-        playlist_url=playlist_url,
-        playlist_name=playlist_name,
-        reverse=reverse_order
-    )
+    try:
+        with profiled(app, args.profile):
+            app.run(
+                playlist_url=playlist_url,
+                playlist_name=playlist_name,
+                reverse=reverse_order,
+                jobs=max(1, args.jobs)
+            )
+    finally:
+        app.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,31 +1,76 @@
 import os
-from typing import Optional
+import time
+from functools import cached_property
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
 
-from rich.console import Console
+from rich.markup import escape
 
 import src.config as config
 import src.downloader.download_playlist as download_playlist
+import src.downloader.ydl_pool as ydl_pool
+import src.playlist.export as export
 import src.playlist.smpl as smpl
+import src.playlist.sync as sync
+import src.util.metrics as metrics
+import src.util.output as output
 from src.db.db_manager import DatabaseManager
+from src.downloader.journal import JobJournal
+from src.downloader.profile_cache import ChannelProfileCache
+from src.playlist.batch import PlaylistRequest
+from src.playlist.model import Playlist, PlaylistEntry
+from src.playlist.scheduler import SyncScheduler
+from src.util.fs_index import DirectoryIndex
 
 class Application:
     """
     Main application class that orchestrates various components.
+
+    The DB and the other components are set up on first use, so commands
+    that don't need them start quickly.
     """
-    def __init__(self):
-        self.console = Console()
-        self.db_manager = DatabaseManager()
+    def __init__(self,
+                 metrics_path: Optional[str] = config.METRICS_PATH,
+                 prometheus_path: Optional[str] = config.METRICS_PROMETHEUS_PATH):
+        """
+        Args:
+            metrics_path (Optional[str]): Where to write the JSON metrics summary after
+                                          every run. None to disable.
+            prometheus_path (Optional[str]): Where to write the metrics in the Prometheus
+                                             textfile format after every run. None to disable.
+        """
+        self.console = output.get_console()
+        self.metrics_path = metrics_path
+        self.prometheus_path = prometheus_path
+        self.console.print("[bold green]✔ Application initialized.[/bold green]")
 
-        # Ensure directories exist
-        os.makedirs(config.SMPL_DIR, exist_ok=True)
-        os.makedirs(config.ICON_DIR, exist_ok=True)
+    @cached_property
+    def db_manager(self) -> DatabaseManager:
+        return DatabaseManager(console=self.console)
 
-        self.console.print("[bold green]✔ Application initialized.[/bold green]")
+    @cached_property
+    def profile_cache(self) -> ChannelProfileCache:
+        return ChannelProfileCache(self.db_manager, console=self.console)
+
+    @cached_property
+    def job_journal(self) -> JobJournal:
+        job_journal = JobJournal(self.db_manager, console=self.console)
+        # Clean up after runs that were interrupted
+        job_journal.collect_garbage()
+        return job_journal
+
+    def close(self) -> None:
+        """
+        Flushes pending DB writes and releases the DB connections and yt-dlp sessions.
+        """
+        if "db_manager" in self.__dict__:
+            self.db_manager.close()
+        ydl_pool.get_pool().close()
 
     def run(self,
             playlist_url: str,
             playlist_name: Optional[str],
-            reverse: bool) -> None:
+            reverse: bool,
+            jobs: int = config.DEFAULT_JOBS) -> None:
         """
         Main entry point for the application's core logic.
 
@@ -33,20 +78,260 @@ class Application:
             playlist_url (str): Target YouTube playlist URL
             playlist_name (Optional[str]): Custom playlist name
             reverse (bool): Generate SMPL playlist in reverse order.
+            jobs (int): Number of videos downloaded concurrently.
         """
 
         # Fetch playlist information
-        playlist_info = download_playlist.get_playlist_info(playlist_url)
-        final_playlist_name = ""
+        started_at = time.monotonic()
+        counters = self._count_downloads()
+
+        playlist = download_playlist.get_playlist_info(playlist_url, console=self.console)
+        final_playlist_name = self._resolve_playlist_name(playlist, playlist_name, reverse)
+
+        playlist_id = playlist.id or playlist_url
+        fetched_at = time.time()
+        snapshot = self.db_manager.get_playlist_snapshot(playlist_id)
+
+        current_ids: list[str] = []
+        if isinstance(playlist.entries, list):
+            current_ids = [entry.id for entry in playlist.entries]
+        else:
+            # Record the listed IDs while the lazy entries are consumed
+            def record_ids(entries: Iterable[PlaylistEntry]) -> Iterator[PlaylistEntry]:
+                for entry in entries:
+                    current_ids.append(entry.id)
+                    yield entry
+            playlist.entries = record_ids(playlist.entries)
+
+        new_playlist = download_playlist.download_playlist(playlist,
+                                                           self.db_manager,
+                                                           jobs=jobs,
+                                                           profile_cache=self.profile_cache,
+                                                           job_journal=self.job_journal,
+                                                           console=self.console)
+        self.db_manager.flush()
+
+        self._sync_playlist(new_playlist, playlist_id, final_playlist_name, reverse,
+                            snapshot, current_ids, {entry.id for entry in new_playlist.entries}, fetched_at)
+        self._collect_garbage()
+        self._emit_metrics()
+        self._print_summary(1, len(new_playlist.entries), counters, started_at)
+
+    def run_batch(self,
+                  requests: List[PlaylistRequest],
+                  jobs: int = config.DEFAULT_JOBS) -> None:
+        """
+        Syncs many playlists in one run.
+
+        All playlists are listed first. Videos shared between playlists are
+        downloaded only once, through one download pipeline for all playlists,
+        and then every SMPL playlist is written.
+
+        Args:
+            requests (List[PlaylistRequest]): Playlists to sync.
+            jobs (int): Number of videos downloaded concurrently.
+        """
+        started_at = time.monotonic()
+        counters = self._count_downloads()
+        listed: list[tuple[PlaylistRequest, Playlist, str, Optional[Dict[str, Any]], float]] = []
+        entries: list[PlaylistEntry] = []
+
+        for request in requests:
+            try:
+                playlist = download_playlist.get_playlist_info(request.url, lazy=False, console=self.console)
+            except Exception as e:
+                self.console.print(f"[red]✖ Failed to fetch playlist {request.url}:[/red] {escape(str(e))}")
+                continue
+
+            playlist_id = playlist.id or request.url
+            snapshot = self.db_manager.get_playlist_snapshot(playlist_id)
+            listed.append((request, playlist, playlist_id, snapshot, time.time()))
+            entries.extend(playlist.entries)
+
+        unique_count = len({entry.id for entry in entries})
+        self.console.print(f"[bold yellow]➜ {len(listed)} playlists, {len(entries)} videos "
+                           f"({unique_count} unique)[/bold yellow]")
+
+        # One pipeline for all playlists; download_playlist processes each video ID once
+        combined = download_playlist.download_playlist(Playlist(id=None, title=None, entries=entries),
+                                                       self.db_manager,
+                                                       jobs=jobs,
+                                                       profile_cache=self.profile_cache,
+                                                       job_journal=self.job_journal,
+                                                       console=self.console)
+        self.db_manager.flush()
+        available = {entry.id for entry in combined.entries}
+
+        # Created once the downloads are done; every channel directory is then read once for all playlists
+        fs_index = DirectoryIndex(config.DOWN_DIR, cache_path=config.FS_INDEX_PATH)
+        for request, playlist, playlist_id, snapshot, fetched_at in listed:
+            final_playlist_name = self._resolve_playlist_name(playlist, request.name, request.reverse)
+            new_playlist = Playlist(id=playlist.id,
+                                    title=playlist.title,
+                                    entries=[entry for entry in playlist.entries if entry.id in available])
+            self._sync_playlist(new_playlist, playlist_id, final_playlist_name, request.reverse,
+                                snapshot, [entry.id for entry in playlist.entries], available, fetched_at,
+                                fs_index=fs_index)
+        fs_index.save()
+
+        self._collect_garbage()
+        self._emit_metrics()
+        self._print_summary(len(listed), len(available), counters, started_at)
+
+    def watch(self,
+              requests: List[PlaylistRequest],
+              default_interval: float = config.WATCH_INTERVAL,
+              jobs: int = config.DEFAULT_JOBS) -> None:
+        """
+        Keeps polling playlists and syncs their changes until interrupted.
+
+        The DB connection, yt-dlp instances and HTTP sessions stay open between
+        polls, and each poll only downloads videos that aren't available yet.
 
+        Args:
+            requests (List[PlaylistRequest]): Playlists to watch.
+            default_interval (float): Seconds between polls of playlists without an interval.
+            jobs (int): Number of videos downloaded concurrently.
+        """
+        scheduler = SyncScheduler(requests,
+                                  lambda due: self.run_batch(due, jobs=jobs),
+                                  default_interval=default_interval,
+                                  console=self.console)
+        self.console.print(f"[bold blue]➜ Watching {len(requests)} playlists[/bold blue] (Ctrl+C to stop)")
+        scheduler.run()
+
+    def export(self,
+               playlist_ids: Optional[List[str]] = None,
+               workers: int = config.EXPORT_WORKERS) -> None:
+        """
+        Rebuilds the SMPL files of synced playlists from the DB, without accessing YouTube.
+
+        Args:
+            playlist_ids (Optional[List[str]]): Playlists to export. All synced playlists by default.
+            workers (int): Number of playlists exported concurrently.
+        """
+        started_at = time.monotonic()
+        result = export.export_playlists(self.db_manager,
+                                         playlist_ids=playlist_ids,
+                                         workers=workers,
+                                         console=self.console)
+        output.print_summary(self.console, "Export done!",
+                             written=result.written,
+                             unchanged=result.unchanged,
+                             failed=result.failed,
+                             seconds=round(time.monotonic() - started_at, 1))
+
+    def _collect_garbage(self) -> None:
+        """
+        Drops the journal entries and intermediates of the videos finished by this run,
+        so they don't pile up over the polls of watch mode.
+        """
+        self.db_manager.flush()
+        self.job_journal.collect_garbage(report_unfinished=False)
+
+    def _count_downloads(self) -> Dict[str, float]:
+        _metrics = metrics.get_metrics()
+        return {"downloaded": _metrics.total("downloads_total", result="ok"),
+                "failed": _metrics.total("downloads_total", result="failed")}
+
+    def _print_summary(self, playlists: int, available: int, counters_before: Dict[str, float], started_at: float) -> None:
+        """
+        Prints the summary of a run (shown in every output mode).
+
+        Args:
+            playlists (int): Number of playlists synced.
+            available (int): Number of videos available locally.
+            counters_before (Dict[str, float]): `_count_downloads()` at the start of the run.
+            started_at (float): `time.monotonic()` at the start of the run.
+        """
+        counters = self._count_downloads()
+        output.print_summary(self.console, "All done!",
+                             playlists=playlists,
+                             downloaded=int(counters["downloaded"] - counters_before["downloaded"]),
+                             failed=int(counters["failed"] - counters_before["failed"]),
+                             available=available,
+                             seconds=round(time.monotonic() - started_at, 1))
+
+    def _emit_metrics(self) -> None:
+        """
+        Writes the metrics collected since the process started (JSON summary and
+        Prometheus textfile, as configured).
+        """
+        _metrics = metrics.get_metrics()
+        try:
+            if self.metrics_path:
+                _metrics.write_json(self.metrics_path)
+                self.console.print(f"[bold green]✔ Metrics saved:[/bold green] {self.metrics_path}")
+            if self.prometheus_path:
+                _metrics.write_prometheus(self.prometheus_path)
+        except OSError as e:
+            # Metrics must never fail a sync
+            self.console.print(f"[yellow]⚠ Failed to write metrics:[/yellow] {escape(str(e))}")
+
+    def _resolve_playlist_name(self, playlist: Playlist, playlist_name: Optional[str], reverse: bool) -> str:
+        """
+        Returns the SMPL playlist name: the custom name if given, the YouTube title otherwise.
+        """
         self.console.print(f"[bold blue]➜ Reversed:[/bold blue] {reverse}")
         if playlist_name:
-            final_playlist_name = playlist_name
-            self.console.print(f"[bold blue]➜ Custom Playlist Name:[/bold blue] {playlist_name}")
+            self.console.print(f"[bold blue]➜ Custom Playlist Name:[/bold blue] {escape(playlist_name)}")
+            return playlist_name
+        self.console.print(f"[bold blue] Playlist Name:[/bold blue] {escape(str(playlist_name))}")
+        return playlist.title or ""
+
+    def _sync_playlist(self,
+                       new_playlist: Playlist,
+                       playlist_id: str,
+                       final_playlist_name: str,
+                       reverse: bool,
+                       snapshot: Optional[Dict[str, Any]],
+                       current_ids: List[str],
+                       available: Set[str],
+                       fetched_at: float,
+                       fs_index: Optional[DirectoryIndex] = None) -> None:
+        """
+        Writes the SMPL playlist if needed and stores the playlist snapshot.
+
+        Args:
+            new_playlist (Playlist): Playlist with only the entries available locally.
+            playlist_id (str): Playlist ID the snapshot is stored under.
+            final_playlist_name (str): SMPL playlist name.
+            reverse (bool): Generate SMPL playlist in reverse order.
+            snapshot (Optional[Dict[str, Any]]): Snapshot of the last sync, if any.
+            current_ids (List[str]): Listed video IDs in playlist order.
+            available (Set[str]): Video IDs available locally.
+            fetched_at (float): UNIX timestamp of the playlist fetch.
+            fs_index (Optional[DirectoryIndex]): Index of the download directory shared by the
+                                                 playlists of a run. The caller saves it.
+        """
+        was_available = {video_id for video_id, is_available in snapshot["entries"] if is_available} if snapshot else set()
+
+        # Compare with the last synced membership
+        diff = sync.diff_playlist([video_id for video_id, _ in snapshot["entries"]] if snapshot else None,
+                                  current_ids)
+        if not diff.first_sync:
+            self.console.print(f"[bold blue]➜ Changes since last sync:[/bold blue] "
+                               f"{len(diff.added)} added, {len(diff.removed)} removed"
+                               f"{', reordered' if diff.reordered else ''}")
+
+        # Videos can become available (downloaded) or unavailable (deleted, made private) between syncs
+        availability_changed = {video_id for video_id in current_ids if video_id in available} != was_available
+
+        # Regenerate the SMPL only if its content may have changed
+        if (diff.changed
+                or availability_changed
+                or snapshot is None
+                or snapshot["smpl_name"] != final_playlist_name
+                or snapshot["reverse"] != reverse
+                or not os.path.exists(smpl.get_smpl_path(final_playlist_name))):
+            smpl.generate_smpl(new_playlist, final_playlist_name, self.db_manager, reverse,
+                               fs_index=fs_index, console=self.console)
         else:
-            final_playlist_name = playlist_info['title']
-            self.console.print(f"[bold blue] Playlist Name:[/bold blue] {playlist_name}")
+            self.console.print("[dim]⏭ Playlist unchanged, skipping SMPL generation[/dim]")
 
-        new_playlist_info = download_playlist.download_playlist(playlist_info, self.db_manager)
-        smpl.generate_smpl(new_playlist_info, final_playlist_name, self.db_manager, reverse)
-        self.console.print("[bold green]✔ All done![/bold green]\n")
\ No newline at end of file
+        self.db_manager.save_playlist_snapshot(playlist_id=playlist_id,
+                                               title=new_playlist.title or "",
+                                               smpl_name=final_playlist_name,
+                                               reverse=reverse,
+                                               fetched_at=fetched_at,
+                                               entries=[(video_id, video_id in available) for video_id in current_ids])
@@ -6,4 +6,42 @@ DOWN_DIR = os.path.join(BASE_DIR, "Downloads")
 SMPL_DIR = os.path.join(DOWN_DIR, "Playlists")
 ICON_DIR = os.path.join(BASE_DIR, "ChannelProfiles")
 DB_PATH = os.path.join(BASE_DIR, "downloaded_info.db")
-SMPL_PREFIX = "/storage/emulated/0/ASMR/"
\ No newline at end of file
+FS_INDEX_PATH = os.path.join(BASE_DIR, "fs_index.json") # Set to None to disable the persisted index
+SMPL_PREFIX = "/storage/emulated/0/ASMR/"
+DEFAULT_JOBS = 1
+CONVERT_WORKERS = 2
+TAG_WORKERS = 2
+PIPELINE_QUEUE_SIZE = 4
+DB_BATCH_WRITES = True
+DB_BATCH_SIZE = 50
+DB_FLUSH_INTERVAL = 5.0 # seconds
+DB_BACKFILL_BATCH_SIZE = 500 # Videos updated per transaction when backfilling file info
+JOURNAL_GC_MIN_AGE = 3600 # seconds; younger intermediates may belong to another running sync
+LAZY_PLAYLIST = True # Start downloading while the playlist listing is still streaming
+LOOKUP_CHUNK_SIZE = 200 # Entries resolved per batched DB lookup
+PROFILE_FAILURE_TTL = 7 * 24 * 3600 # seconds before a failed channel profile lookup is retried
+PROFILE_TRANSIENT_FAILURE_TTL = 10 * 60 # seconds before a lookup that failed e.g. on a timeout is retried
+COVER_ART_CACHE_SIZE = 64 # Encoded cover art blocks kept in memory
+COVER_ART_CACHE_DIR = None # e.g. os.path.join(BASE_DIR, "CoverArtCache") to also cache on disk
+HTTP_POOL_SIZE = 8 # Connections kept alive per host
+HTTP_TIMEOUT = 30 # seconds
+HTTP_CHUNK_SIZE = 10 * 1024 * 1024 # Bytes per Range request when streaming media
+HTTP_RESUME_ATTEMPTS = 5 # Reconnects per stream after a dropped connection
+REMUX_ENGINE = "python" # "python" (in-process remuxer) or "ffmpeg"
+REMUX_FFMPEG_FALLBACK = True # Use ffmpeg for inputs the in-process remuxer can't handle
+STREAM_DOWNLOADS = True # Pipe downloads straight into the remuxer; only the .ogg is written to disk
+RETRY_BACKOFF_BASE = 2.0 # seconds; doubles with every failed attempt
+RETRY_BACKOFF_MAX = 60.0 # seconds
+RATE_LIMIT_RATE = 2.0 # YouTube requests per second
+RATE_LIMIT_BURST = 5 # Requests that may be sent at once after an idle period
+RATE_LIMIT_MIN_RATE = 0.1 # requests per second
+RATE_LIMIT_MAX_CONCURRENCY = 8 # Downloads in flight at once (also bounded by --jobs)
+RATE_LIMIT_COOLDOWN = 10.0 # seconds between two slow-downs
+RATE_LIMIT_THROTTLED_SPEED = 64 * 1024 # bytes/s; slower downloads count as throttled
+WATCH_INTERVAL = 15 * 60 # Default seconds between polls of a playlist in watch mode
+METRICS_PATH = os.path.join(BASE_DIR, "metrics.json") # JSON summary written after every run; None to disable
+METRICS_PROMETHEUS_PATH = None # e.g. a *.prom file in node_exporter's textfile directory
+PROFILE_TOP = 25 # Call sites and allocation sites printed by --profile
+PROFILE_PATH = os.path.join(BASE_DIR, "profile.prof") # Raw cProfile stats written by --profile
+OUTPUT_MODE = "console" # "console" (styled), "json" (JSON lines) or "quiet" (final summary only)
+EXPORT_WORKERS = 4 # Playlists exported concurrently by `main.py export`
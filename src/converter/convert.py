@@ -1,18 +1,33 @@
 import os
 import re
-from typing import Optional
+from typing import Callable, Dict, List, Optional
 
-import ffmpeg # type: ignore
 from rich.console import Console as RichConsole
+from rich.markup import escape
 
-from src.exceptions import FileConversionError
+import src.config as config
+import src.converter.metadata as metadata
+import src.converter.remux as remux
+import src.util.output as output
+from src.exceptions import FileConversionError, RemuxError
 
-def convert_to_ogg(filepath: str, console: Optional[RichConsole] = None) -> str:
+def convert_to_ogg(filepath: str,
+                   tags: Optional[Dict[str, List[str]]] = None,
+                   on_remuxed: Optional[Callable[[str], None]] = None,
+                   console: Optional[RichConsole] = None) -> str:
     """
     Extracts Ogg audio from a .webm file and saves it to a new .ogg file.
 
+    By default the Opus stream is remuxed in-process and `tags` are written in
+    the same pass. ffmpeg is used if configured, or as a fallback for inputs
+    the in-process remuxer doesn't support; `tags` are then written afterwards.
+
     Args:
         filepath (str): Path of the .webm file to convert.
+        tags (Optional[Dict[str, List[str]]]): Vorbis comments to write into the new file.
+        on_remuxed (Optional[Callable[[str], None]]): Called with the .ogg path once it is
+                                                      complete but before `tags` are written
+                                                      (ffmpeg only).
 
     Returns:
         str: The full path to the newly created .ogg file.
@@ -21,7 +36,7 @@ def convert_to_ogg(filepath: str, console: Optional[RichConsole] = None) -> str:
         ValueError: If the input `filepath` does not have a .webm extension.
         FileConversionError: If the file conversion process fails (e.g., ffmpeg error).
     """
-    _console = console if console else RichConsole()
+    _console = console if console else output.get_console()
     
     new_filepath = None # Initialize
     try:
@@ -32,19 +47,36 @@ def convert_to_ogg(filepath: str, console: Optional[RichConsole] = None) -> str:
         # Generate new filename
         new_filepath = re.sub(r"\.webm$", ".ogg", filepath, flags=re.IGNORECASE)
 
-        # Delete target file if exists
-        if os.path.exists(new_filepath):
-            os.remove(new_filepath)
+        remuxed = False
+        if config.REMUX_ENGINE == "python":
+            try:
+                remux.remux_webm_to_ogg(filepath, new_filepath, tags)
+                remuxed = True
+            except RemuxError as e:
+                if not config.REMUX_FFMPEG_FALLBACK:
+                    raise
+                _console.print(f"  [yellow]⚠ In-process remux failed, falling back to ffmpeg:[/yellow] {escape(str(e))}")
+
+        if not remuxed:
+            # Delete target file if exists
+            if os.path.exists(new_filepath):
+                os.remove(new_filepath)
+
+            import ffmpeg # type: ignore # Only needed for the ffmpeg fallback
+            ffmpeg.input(filepath).output(new_filepath, format="ogg", c="copy").run(overwrite_output=True, quiet=True) # type: ignore
+            if on_remuxed:
+                on_remuxed(new_filepath)
+            if tags:
+                metadata.write_tags(new_filepath, tags)
 
-        # Convert to ogg and remove old file
-        ffmpeg.input(filepath).output(new_filepath, format="ogg", c="copy").run(overwrite_output=True, quiet=True) # type: ignore
+        # Remove old file
         os.remove(filepath)
 
         _console.print(f"  [bold cyan]✔ Converted to OGG[/bold cyan]")
         return new_filepath
     
     except Exception as e:
-        _console.print(f"  [red]✖ Conversion error:[/red] {e}")
+        _console.print(f"  [red]✖ Conversion error:[/red] {escape(str(e))}")
         raise FileConversionError(input_path=filepath,
                                   output_path=new_filepath,
-                                  original_exception=e)
\ No newline at end of file
+                                  original_exception=e)
@@ -0,0 +1,99 @@
+import base64
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import src.config as config
+
+class CoverArtCache:
+    """
+    Cache of ready-to-embed `METADATA_BLOCK_PICTURE` values.
+
+    Building the block (reading the image, wrapping it in a FLAC picture and
+    base64-encoding it) gives the same result for every video of a channel,
+    so it is done once per image and kept in an LRU cache. If `cache_dir` is
+    set, encoded blocks are also stored on disk keyed by the image's hash.
+    """
+    def __init__(self,
+                 max_entries: int = config.COVER_ART_CACHE_SIZE,
+                 cache_dir: Optional[str] = config.COVER_ART_CACHE_DIR) -> None:
+        self.max_entries = max(1, max_entries)
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        # (path, mtime_ns, size) -> encoded block
+        self._blocks: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+
+    def get_picture_block(self, image_path: str) -> str:
+        """
+        Returns the base64-encoded FLAC picture block for an image.
+
+        Args:
+            image_path (str): Path of a JPEG or PNG image.
+
+        Returns:
+            str: Value for the `METADATA_BLOCK_PICTURE` Vorbis comment.
+
+        Raises:
+            ValueError: If the image is not a JPEG or PNG.
+            OSError: If the image cannot be read.
+        """
+        stat = os.stat(image_path)
+        key = (image_path, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is not None:
+                self._blocks.move_to_end(key)
+                return block
+
+        block = self._build(image_path)
+
+        with self._lock:
+            self._blocks[key] = block
+            self._blocks.move_to_end(key)
+            while len(self._blocks) > self.max_entries:
+                self._blocks.popitem(last=False)
+        return block
+
+    def _build(self, image_path: str) -> str:
+        if image_path.lower().endswith((".jpg", ".jpeg")):
+            mime = "image/jpeg"
+        elif image_path.lower().endswith(".png"):
+            mime = "image/png"
+        else:
+            raise ValueError("Unsupported image format. Please use JPEG or PNG.")
+
+        # Read the image data
+        with open(image_path, "rb") as img:
+            image_data = img.read()
+
+        disk_path = None
+        if self.cache_dir:
+            digest = hashlib.sha256(image_data).hexdigest()
+            disk_path = os.path.join(self.cache_dir, f"{digest}.b64")
+            try:
+                with open(disk_path, "r", encoding="ascii") as f:
+                    return f.read()
+            except OSError:
+                pass
+
+        # Create a Picture object
+        from mutagen.flac import Picture
+        picture = Picture()
+        picture.mime = mime
+        picture.type = 3  # Front cover
+        picture.data = image_data
+
+        # Convert to Base64
+        block = base64.b64encode(picture.write()).decode("utf-8")
+
+        if disk_path:
+            os.makedirs(self.cache_dir, exist_ok=True) # type: ignore
+            tmp_path = f"{disk_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="ascii") as f:
+                f.write(block)
+            os.replace(tmp_path, disk_path)
+
+        return block
@@ -1,78 +1,118 @@
-import os
-import base64
-from typing import Optional
+from typing import Dict, List, Optional
 
-from mutagen.flac import Picture
-from mutagen.oggopus import OggOpus
 from rich.console import Console as RichConsole
+from rich.markup import escape
 
-import src.config as config
-import src.downloader.channel as channel
+import src.util.output as output
+from src.converter.cover_art import CoverArtCache
 from src.db.db_manager import DatabaseManager
+from src.downloader.profile_cache import ChannelProfileCache
 
-def update_metadata(filepath: str,
-                    title: str,
-                    video_id: str,
-                    channel_name: str,
-                    channel_handle: str,
-                    db_manager: DatabaseManager,
-                    console: Optional[RichConsole] = None) -> None:
+# Shared by all callers that don't pass their own cache
+_default_cover_art_cache = CoverArtCache()
+
+def build_tags(title: str,
+               video_id: str,
+               channel_name: str,
+               channel_handle: Optional[str],
+               db_manager: DatabaseManager,
+               profile_cache: Optional[ChannelProfileCache] = None,
+               cover_art_cache: Optional[CoverArtCache] = None,
+               console: Optional[RichConsole] = None) -> Dict[str, List[str]]:
     """
-    Update metadata of given .ogg file.
+    Builds the Vorbis comments for a video, including the channel profile picture as cover art.
 
     Args:
-        filepath (str): Path to taget .ogg file.
         title (str): Video title.
         video_id (str): Video ID.
         channel_name (str): Channel name.
-        channel_handle (str): Channel handle.
+        channel_handle (Optional[str]): Channel handle.
         db_manager (DatabaseManager): DatabaseManager instance.
+        profile_cache (Optional[ChannelProfileCache]): Shared channel profile cache.
+        cover_art_cache (Optional[CoverArtCache]): Cache of encoded cover art blocks.
+
+    Returns:
+        Dict[str, List[str]]: Vorbis comment fields.
     """
-    _console = console if console else RichConsole()
+    _console = console if console else output.get_console()
     
+    _profile_cache = profile_cache if profile_cache else ChannelProfileCache(db_manager, console=_console)
+
     # Get channel profile picture
-    image_filename = db_manager.get_channel_image_filename(channel_handle)
-    image_path = None
-    if image_filename:
-        image_path = os.path.join(config.ICON_DIR, image_filename)
-    else:
-        profile_image_url = channel.get_channel_profile_url(channel_handle)
-        if profile_image_url:
-            image_path = channel.download_channel_profile_image(channel_handle=channel_handle,
-                                                                url=profile_image_url,
-                                                                db_manager=db_manager)
+    image_path = _profile_cache.get_image_path(channel_handle)
     
-    # Open file and put text metadata
-    ogg = OggOpus(filepath)
-    ogg["title"] = title
-    ogg["artist"] = channel_name
-    ogg["comment"] = f"https://www.youtube.com/watch?v={video_id}"
+    # Text metadata
+    tags: Dict[str, List[str]] = {
+        "title": [title],
+        "artist": [channel_name],
+        "comment": [f"https://www.youtube.com/watch?v={video_id}"]
+    }
 
     # Put album art if exists
     if image_path:
         try:
-            # Read the image data
-            with open(image_path, "rb") as img:
-                image_data = img.read()
-
-            if image_path.lower().endswith((".jpg", ".jpeg")):
-                mime = "image/jpeg"
-            elif image_path.lower().endswith(".png"):
-                mime = "image/png"
-            else:
-                raise ValueError("Unsupported image format. Please use JPEG or PNG.")
-
-            # Create a Picture object
-            picture = Picture()
-            picture.mime = mime
-            picture.type = 3  # Front cover
-            picture.data = image_data
-
-            # Convert to Base64 and add to Vorbis comments
-            encoded_picture = base64.b64encode(picture.write()).decode("utf-8")
-            ogg["METADATA_BLOCK_PICTURE"] = [encoded_picture]
+            _cover_art_cache = cover_art_cache if cover_art_cache else _default_cover_art_cache
+            tags["METADATA_BLOCK_PICTURE"] = [_cover_art_cache.get_picture_block(image_path)]
         except Exception as image_error:
-            _console.print(f"    ⚠ Image processing error: {image_error}")
+            _console.print(f"    ⚠ Image processing error: {escape(str(image_error))}")
+
+    return tags
+
+def write_tags(filepath: str, tags: Dict[str, List[str]]) -> None:
+    """
+    Writes Vorbis comments into an existing .ogg file.
+
+    Args:
+        filepath (str): Path to target .ogg file.
+        tags (Dict[str, List[str]]): Vorbis comment fields.
+    """
+    from mutagen.oggopus import OggOpus
+    ogg = OggOpus(filepath)
+    for key, values in tags.items():
+        ogg[key] = values
 
     # Save the updated metadata
-    ogg.save() # type: ignore
\ No newline at end of file
+    ogg.save() # type: ignore
+
+def read_duration(filepath: str) -> Optional[float]:
+    """
+    Reads the duration of an .ogg (Opus) file.
+
+    Args:
+        filepath (str): Path to target .ogg file.
+
+    Returns:
+        Optional[float]: Duration in seconds, or None if the file can't be read.
+    """
+    from mutagen import MutagenError
+    from mutagen.oggopus import OggOpus
+    try:
+        return float(OggOpus(filepath).info.length)
+    except (MutagenError, OSError):
+        return None
+
+def update_metadata(filepath: str,
+                    title: str,
+                    video_id: str,
+                    channel_name: str,
+                    channel_handle: str,
+                    db_manager: DatabaseManager,
+                    profile_cache: Optional[ChannelProfileCache] = None,
+                    cover_art_cache: Optional[CoverArtCache] = None,
+                    console: Optional[RichConsole] = None) -> None:
+    """
+    Update metadata of given .ogg file.
+
+    Args:
+        filepath (str): Path to taget .ogg file.
+        title (str): Video title.
+        video_id (str): Video ID.
+        channel_name (str): Channel name.
+        channel_handle (str): Channel handle.
+        db_manager (DatabaseManager): DatabaseManager instance.
+        profile_cache (Optional[ChannelProfileCache]): Shared channel profile cache.
+        cover_art_cache (Optional[CoverArtCache]): Cache of encoded cover art blocks.
+    """
+    tags = build_tags(title, video_id, channel_name, channel_handle, db_manager,
+                      profile_cache=profile_cache, cover_art_cache=cover_art_cache, console=console)
+    write_tags(filepath, tags)
@@ -0,0 +1,530 @@
+"""
+In-process WebM (Matroska) → Ogg Opus remuxer.
+
+YouTube serves Opus audio in WebM containers. Moving the Opus packets into an
+Ogg container is a pure stream copy, so instead of spawning ffmpeg for every
+file the packets are read block by block and written out as Ogg pages. The
+Vorbis comments (including cover art) are written in the same pass.
+"""
+import os
+import struct
+import zlib
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from src.exceptions import RemuxError
+
+# Matroska element IDs (with their length marker bits)
+_EBML = 0x1A45DFA3
+_SEGMENT = 0x18538067
+_INFO = 0x1549A966
+_TIMECODE_SCALE = 0x2AD7B1
+_TRACKS = 0x1654AE6B
+_TRACK_ENTRY = 0xAE
+_TRACK_NUMBER = 0xD7
+_TRACK_TYPE = 0x83
+_CODEC_ID = 0x86
+_CODEC_PRIVATE = 0x63A2
+_CLUSTER = 0x1F43B675
+_SIMPLE_BLOCK = 0xA3
+_BLOCK_GROUP = 0xA0
+_BLOCK = 0xA1
+_DISCARD_PADDING = 0x75A2
+
+# Children of Segment; any of these ends a Cluster of unknown size
+_LEVEL1_IDS = {
+    0x114D9B74, # SeekHead
+    _INFO,
+    _TRACKS,
+    _CLUSTER,
+    0x1C53BB6B, # Cues
+    0x1043A770, # Chapters
+    0x1254C367, # Tags
+    0x1941A469, # Attachments
+}
+
+_TRACK_TYPE_AUDIO = 2
+_OPUS_SAMPLE_RATE = 48000
+_VENDOR = b"youtube-playlist-downloader"
+
+# Ogg pages are flushed once they hold this much data (same as libogg)
+_PAGE_FILL = 4096
+
+# Samples per Opus frame at 48 kHz, indexed by the TOC config number (RFC 6716, 3.1)
+_OPUS_FRAME_SAMPLES = (
+    [480, 960, 1920, 2880] * 3 +  # SILK-only, NB/MB/WB
+    [480, 960] * 2 +              # Hybrid, SWB/FB
+    [120, 240, 480, 960] * 4      # CELT-only, NB/WB/SWB/FB
+)
+
+_BITREV = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+def _ogg_crc(data: bytes) -> int:
+    """
+    Ogg page checksum (CRC-32, poly 0x04C11DB7, unreflected, init 0).
+
+    zlib implements the reflected variant of the same polynomial in C, so the
+    input bytes and the result are bit-reversed around it.
+    """
+    crc = zlib.crc32(data.translate(_BITREV), 0xFFFFFFFF) ^ 0xFFFFFFFF
+    return int(f"{crc:032b}"[::-1], 2)
+
+def _opus_packet_samples(packet: bytes) -> int:
+    """
+    Number of 48 kHz samples in an Opus packet, from its TOC byte.
+    """
+    if not packet:
+        return 0
+    toc = packet[0]
+    frame_samples = _OPUS_FRAME_SAMPLES[toc >> 3]
+    code = toc & 0x03
+    if code == 0:
+        frames = 1
+    elif code in (1, 2):
+        frames = 2
+    else:
+        if len(packet) < 2:
+            return 0
+        frames = packet[1] & 0x3F
+    return frame_samples * frames
+
+class _EbmlReader:
+    """
+    Sequential EBML element reader over a binary stream.
+    """
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+        self._seekable = stream.seekable() if hasattr(stream, "seekable") else False
+        self.pos = 0
+        self._peeked: Optional[Tuple[int, Optional[int]]] = None
+
+    def read(self, size: int) -> bytes:
+        data = self._stream.read(size)
+        if len(data) < size:
+            raise EOFError("Unexpected end of stream")
+        self.pos += size
+        return data
+
+    def skip(self, size: int) -> None:
+        if self._seekable:
+            self._stream.seek(size, os.SEEK_CUR)
+            self.pos += size
+            return
+        while size > 0:
+            chunk = self.read(min(size, 1 << 16))
+            size -= len(chunk)
+
+    def _read_vint(self, keep_marker: bool) -> Tuple[int, int]:
+        first = self._stream.read(1)
+        if not first:
+            raise EOFError("End of stream")
+        self.pos += 1
+        byte = first[0]
+        length = 1
+        mask = 0x80
+        while length <= 8 and not byte & mask:
+            length += 1
+            mask >>= 1
+        if length > 8:
+            raise RemuxError("Invalid EBML variable-length integer.")
+        value = byte if keep_marker else byte & (mask - 1)
+        if length > 1:
+            for b in self.read(length - 1):
+                value = (value << 8) | b
+        return value, length
+
+    def read_header(self) -> Tuple[int, Optional[int]]:
+        """
+        Reads an element header.
+
+        Returns:
+            Tuple[int, Optional[int]]: Element ID and data size (None for unknown size).
+        """
+        if self._peeked is not None:
+            header, self._peeked = self._peeked, None
+            return header
+        element_id, _ = self._read_vint(keep_marker=True)
+        size, length = self._read_vint(keep_marker=False)
+        if size == (1 << (7 * length)) - 1:
+            return element_id, None
+        return element_id, size
+
+    def peek_header(self) -> Tuple[int, Optional[int]]:
+        if self._peeked is None:
+            self._peeked = self.read_header()
+        return self._peeked
+
+    def read_uint(self, size: int) -> int:
+        return int.from_bytes(self.read(size), "big") if size else 0
+
+    def read_sint(self, size: int) -> int:
+        return int.from_bytes(self.read(size), "big", signed=True) if size else 0
+
+def _split_laced(data: bytes, offset: int, lacing: int) -> List[bytes]:
+    """
+    Splits the payload of a laced Matroska block into frames.
+    """
+    count = data[offset] + 1
+    offset += 1
+    sizes: List[int] = []
+
+    if lacing == 0x02: # Xiph
+        for _ in range(count - 1):
+            size = 0
+            while True:
+                b = data[offset]
+                offset += 1
+                size += b
+                if b != 255:
+                    break
+            sizes.append(size)
+    elif lacing == 0x06: # EBML
+        size, offset = _read_block_vint(data, offset, signed=False)
+        sizes.append(size)
+        for _ in range(count - 2):
+            delta, offset = _read_block_vint(data, offset, signed=True)
+            size += delta
+            sizes.append(size)
+    else: # Fixed
+        frame_size, rest = divmod(len(data) - offset, count)
+        if rest:
+            raise RemuxError("Invalid fixed-size lacing.")
+        sizes = [frame_size] * (count - 1)
+
+    if any(size < 0 for size in sizes) or offset + sum(sizes) > len(data):
+        raise RemuxError("Lace sizes exceed the block.")
+
+    frames: List[bytes] = []
+    for size in sizes:
+        frames.append(data[offset:offset + size])
+        offset += size
+    frames.append(data[offset:])
+    return frames
+
+def _read_block_vint(data: bytes, offset: int, signed: bool) -> Tuple[int, int]:
+    byte = data[offset]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not byte & mask:
+        length += 1
+        mask >>= 1
+    value = byte & (mask - 1)
+    for b in data[offset + 1:offset + length]:
+        value = (value << 8) | b
+    if signed:
+        value -= (1 << (7 * length - 1)) - 1
+    return value, offset + length
+
+class _WebmOpusDemuxer:
+    """
+    Streams the Opus packets of the first Opus audio track of a WebM file.
+    """
+    def __init__(self, stream: BinaryIO) -> None:
+        self._reader = _EbmlReader(stream)
+        self.timecode_scale = 1_000_000
+        self.track_number: Optional[int] = None
+        self.opus_head: Optional[bytes] = None
+        self._segment_end: Optional[int] = None
+        self._open()
+
+    def _open(self) -> None:
+        """Reads up to the track list so that `opus_head` is known."""
+        reader = self._reader
+        element_id, size = reader.read_header()
+        if element_id != _EBML or size is None:
+            raise RemuxError("Not an EBML/Matroska file.")
+        reader.skip(size)
+
+        element_id, size = reader.read_header()
+        if element_id != _SEGMENT:
+            raise RemuxError("Matroska Segment not found.")
+        self._segment_end = reader.pos + size if size is not None else None
+
+        while self.opus_head is None:
+            element_id, size = reader.peek_header()
+            if element_id == _CLUSTER:
+                break
+            reader.read_header()
+            if size is None:
+                raise RemuxError(f"Unknown-size element 0x{element_id:X} is not supported.")
+            if element_id == _INFO:
+                self._parse_info(reader.pos + size)
+            elif element_id == _TRACKS:
+                self._parse_tracks(reader.pos + size)
+            else:
+                reader.skip(size)
+
+        if self.opus_head is None:
+            raise RemuxError("No Opus audio track found.")
+
+    def _parse_info(self, end: int) -> None:
+        reader = self._reader
+        while reader.pos < end:
+            element_id, size = reader.read_header()
+            if element_id == _TIMECODE_SCALE:
+                self.timecode_scale = reader.read_uint(size or 0)
+            else:
+                reader.skip(size or 0)
+
+    def _parse_tracks(self, end: int) -> None:
+        reader = self._reader
+        while reader.pos < end:
+            element_id, size = reader.read_header()
+            if element_id != _TRACK_ENTRY:
+                reader.skip(size or 0)
+                continue
+
+            entry_end = reader.pos + (size or 0)
+            number = None
+            track_type = None
+            codec_id = None
+            codec_private = None
+            while reader.pos < entry_end:
+                child_id, child_size = reader.read_header()
+                child_size = child_size or 0
+                if child_id == _TRACK_NUMBER:
+                    number = reader.read_uint(child_size)
+                elif child_id == _TRACK_TYPE:
+                    track_type = reader.read_uint(child_size)
+                elif child_id == _CODEC_ID:
+                    codec_id = reader.read(child_size).rstrip(b"\0").decode("ascii", "replace")
+                elif child_id == _CODEC_PRIVATE:
+                    codec_private = reader.read(child_size)
+                else:
+                    reader.skip(child_size)
+
+            if (self.opus_head is None and track_type == _TRACK_TYPE_AUDIO
+                    and codec_id == "A_OPUS" and codec_private
+                    and codec_private.startswith(b"OpusHead")):
+                self.track_number = number
+                self.opus_head = codec_private
+
+    def packets(self) -> Iterator[Tuple[bytes, int]]:
+        """
+        Yields the Opus packets in stream order.
+
+        Yields:
+            Tuple[bytes, int]: Packet data and the block's discard padding in nanoseconds.
+
+        Raises:
+            RemuxError: If the stream ends before the end of the Segment (or of a Cluster) it declares.
+        """
+        reader = self._reader
+        while self._segment_end is None or reader.pos < self._segment_end:
+            try:
+                element_id, size = reader.read_header()
+            except EOFError:
+                if self._segment_end is not None:
+                    # Cut off between clusters; the output would silently miss the rest
+                    raise RemuxError(f"Truncated WebM input: ended at byte {reader.pos} of {self._segment_end}")
+                return
+            if element_id == _CLUSTER:
+                yield from self._cluster_packets(reader.pos + size if size is not None else None)
+            elif size is None:
+                raise RemuxError(f"Unknown-size element 0x{element_id:X} is not supported.")
+            else:
+                reader.skip(size)
+
+    def _cluster_packets(self, end: Optional[int]) -> Iterator[Tuple[bytes, int]]:
+        reader = self._reader
+        while end is None or reader.pos < end:
+            if end is None:
+                try:
+                    element_id, _ = reader.peek_header()
+                except EOFError:
+                    return
+                if element_id in _LEVEL1_IDS:
+                    return
+            try:
+                element_id, size = reader.read_header()
+            except EOFError:
+                raise RemuxError(f"Truncated WebM input: cluster ended at byte {reader.pos} of {end}")
+            size = size or 0
+            if element_id == _SIMPLE_BLOCK:
+                yield from self._block_packets(reader.read(size), 0)
+            elif element_id == _BLOCK_GROUP:
+                group_end = reader.pos + size
+                block = None
+                discard_padding = 0
+                while reader.pos < group_end:
+                    child_id, child_size = reader.read_header()
+                    child_size = child_size or 0
+                    if child_id == _BLOCK:
+                        block = reader.read(child_size)
+                    elif child_id == _DISCARD_PADDING:
+                        discard_padding = reader.read_sint(child_size)
+                    else:
+                        reader.skip(child_size)
+                if block is not None:
+                    yield from self._block_packets(block, discard_padding)
+            else:
+                reader.skip(size)
+
+    def _block_packets(self, block: bytes, discard_padding: int) -> Iterator[Tuple[bytes, int]]:
+        track, offset = _read_block_vint(block, 0, signed=False)
+        if track != self.track_number:
+            return
+        flags = block[offset + 2]
+        offset += 3 # int16 timecode + flags
+        lacing = flags & 0x06
+        if not lacing:
+            yield block[offset:], discard_padding
+            return
+        frames = _split_laced(block, offset, lacing)
+        for i, frame in enumerate(frames):
+            yield frame, discard_padding if i == len(frames) - 1 else 0
+
+class _OggWriter:
+    """
+    Packs packets of a single logical stream into Ogg pages.
+    """
+    def __init__(self, out: BinaryIO, serial: int) -> None:
+        self._out = out
+        self._serial = serial
+        self._sequence = 0
+        self._segments = bytearray()
+        self._data: List[bytes] = []
+        self._data_size = 0
+        self._granule = -1 # Granule of the last packet completed on the pending page
+        self._continued = False # The pending page starts with the rest of a packet
+        self._first = True
+
+    def write_packet(self, packet: bytes, granule: int, flush: bool = False) -> None:
+        """
+        Adds a packet to the stream.
+
+        Args:
+            packet (bytes): Packet data.
+            granule (int): Granule position at the end of this packet.
+            flush (bool): End the page after this packet (required for header packets).
+        """
+        if self._data_size >= _PAGE_FILL:
+            self._emit_page()
+
+        offset = 0
+        remaining = len(packet)
+        while True:
+            if len(self._segments) == 255:
+                self._emit_page()
+                # The next page starts with the rest of this packet
+                self._continued = offset > 0
+            lace = min(remaining, 255)
+            self._segments.append(lace)
+            self._data.append(packet[offset:offset + lace])
+            self._data_size += lace
+            offset += lace
+            remaining -= lace
+            if lace < 255:
+                break
+
+        self._granule = granule
+        if flush:
+            self._emit_page()
+
+    def close(self, final_granule: Optional[int] = None) -> None:
+        """
+        Writes the pending page with the end-of-stream flag.
+
+        Args:
+            final_granule (Optional[int]): Granule of the last page (for end trimming).
+        """
+        if final_granule is not None:
+            self._granule = final_granule
+        self._emit_page(eos=True)
+
+    def _emit_page(self, eos: bool = False) -> None:
+        if not self._segments and not eos:
+            return
+        flags = 0
+        if self._continued:
+            flags |= 0x01
+        if self._first:
+            flags |= 0x02
+        if eos:
+            flags |= 0x04
+        header = struct.pack("<4sBBqIIIB", b"OggS", 0, flags, self._granule,
+                             self._serial, self._sequence, 0, len(self._segments))
+        page = bytearray(header)
+        page += self._segments
+        for data in self._data:
+            page += data
+        struct.pack_into("<I", page, 22, _ogg_crc(bytes(page)))
+        self._out.write(page)
+
+        self._sequence += 1
+        self._first = False
+        self._continued = False
+        self._segments = bytearray()
+        self._data = []
+        self._data_size = 0
+        self._granule = -1
+
+def build_opus_tags(tags: Dict[str, List[str]]) -> bytes:
+    """
+    Builds an OpusTags header packet (RFC 7845, 5.2).
+
+    Args:
+        tags (Dict[str, List[str]]): Vorbis comment fields, e.g. {"title": ["..."]}.
+
+    Returns:
+        bytes: The OpusTags packet.
+    """
+    comments = [f"{key}={value}".encode("utf-8") for key, values in tags.items() for value in values]
+    parts = [b"OpusTags", struct.pack("<I", len(_VENDOR)), _VENDOR, struct.pack("<I", len(comments))]
+    for comment in comments:
+        parts.append(struct.pack("<I", len(comment)))
+        parts.append(comment)
+    return b"".join(parts)
+
+def remux_webm_to_ogg(source: Union[str, BinaryIO],
+                      output_path: str,
+                      tags: Optional[Dict[str, List[str]]] = None) -> None:
+    """
+    Copies the Opus stream of a WebM file into a new Ogg Opus file.
+
+    The output is written to a temporary file and moved into place once
+    complete, so `output_path` never holds a partial file.
+
+    Args:
+        source (Union[str, BinaryIO]): Path of the .webm file or a readable binary stream.
+        output_path (str): Path of the .ogg file to create.
+        tags (Optional[Dict[str, List[str]]]): Vorbis comments to write into the OpusTags header.
+
+    Raises:
+        RemuxError: If the input is not a WebM file with an Opus audio track or is malformed.
+        OSError: If reading the input or writing the output fails.
+    """
+    if isinstance(source, str):
+        with open(source, "rb", buffering=1 << 20) as stream:
+            remux_webm_to_ogg(stream, output_path, tags)
+        return
+
+    tmp_path = f"{output_path}.part"
+    try:
+        demuxer = _WebmOpusDemuxer(source)
+        opus_head = demuxer.opus_head or b""
+        pre_skip = struct.unpack_from("<H", opus_head, 10)[0] if len(opus_head) >= 12 else 0
+
+        with open(tmp_path, "wb", buffering=1 << 20) as out:
+            writer = _OggWriter(out, serial=zlib.crc32(os.path.basename(output_path).encode("utf-8")))
+            writer.write_packet(opus_head, 0, flush=True)
+            writer.write_packet(build_opus_tags(tags or {}), 0, flush=True)
+
+            granule = 0
+            trim = 0
+            for packet, discard_padding in demuxer.packets():
+                granule += _opus_packet_samples(packet)
+                writer.write_packet(packet, granule)
+                if discard_padding > 0:
+                    trim = discard_padding * _OPUS_SAMPLE_RATE // 1_000_000_000
+
+            writer.close(final_granule=max(pre_skip, granule - trim) if granule else 0)
+
+        os.replace(tmp_path, output_path)
+    except EOFError as e:
+        raise RemuxError(f"Truncated WebM input: {e}")
+    except (IndexError, ValueError, struct.error) as e:
+        # Corrupt sizes or lacing send the parser out of bounds
+        raise RemuxError(f"Malformed WebM input: {e}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -1,66 +1,215 @@
 import sqlite3
-from typing import Optional, Dict
+import threading
+import time
+from typing import Any, Optional, Dict, Iterable, Iterator, List, Tuple
 
 from rich.console import Console as RichConsole
+from rich.markup import escape
 
 import src.config as config
+import src.db.migrations as migrations
+import src.util.metrics as metrics
+import src.util.output as output
+
+# Stay well below SQLite's bound-parameter limit (999 on older builds)
+_MAX_QUERY_PARAMS = 500
+
+def _chunked(items: List[str], size: int = _MAX_QUERY_PARAMS) -> Iterator[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
 
 class DatabaseManager:
     """
     Manages all database operations for video and channel profile information.
     """
 
-    def __init__(self, console: Optional[RichConsole] = None) -> None:
+    def __init__(self,
+                 console: Optional[RichConsole] = None,
+                 batch_writes: bool = config.DB_BATCH_WRITES,
+                 batch_size: int = config.DB_BATCH_SIZE,
+                 flush_interval: float = config.DB_FLUSH_INTERVAL) -> None:
         """
         Initializes the DatabaseManager with the path to the SQLite database.
 
+        When `batch_writes` is enabled, `save_video_info` and `save_channel_image_filename`
+        are queued and committed together in one transaction once `batch_size` writes are
+        pending or `flush_interval` seconds after the first of them was queued, even if
+        no further writes arrive (e.g. while watch mode waits for the next poll). The timed
+        flushes run on one background thread with its own connection for the lifetime of
+        the manager. Pending writes are visible to reads immediately and are committed by
+        `flush()`/`close()`.
+
         Args:
-            db_path (str): The file path to the SQLite database.
+            console (Optional[RichConsole]): `rich.console.Console` for styled output.
+            batch_writes (bool): Group writes into batched transactions.
+            batch_size (int): Number of pending writes that triggers a flush.
+            flush_interval (float): Seconds after which pending writes are flushed.
         """
-        self._console = console if console else RichConsole()
+        self._console = console if console else output.get_console()
         self.db_path = config.DB_PATH
+
+        self._local = threading.local()
+        self._connections: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._connections_lock = threading.Lock()
+
+        self._batch_writes = batch_writes
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._write_lock = threading.RLock()
+        self._pending_writes: List[Tuple[str, Tuple[Any, ...]]] = []
+        self._pending_videos: Dict[str, Dict[str, str]] = {}
+        self._pending_channel_images: Dict[str, str] = {}
+        self._pending_since = 0.0 # time.monotonic() of the oldest pending write
+        self._flush_wakeup = threading.Condition(self._write_lock)
+        self._flush_thread: Optional[threading.Thread] = None
+        self._closing = False
+
         self._initialize_db()
 
+    def __enter__(self) -> "DatabaseManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def _get_connection(self) -> sqlite3.Connection:
         """
-        Establishes and returns a database connection.
+        Returns the calling thread's database connection, opening it on first use.
         Sets row_factory to sqlite3.Row for column name access.
 
+        Connections are kept open for the lifetime of the manager (or of their
+        thread) and use WAL journaling, so readers never block the writer.
+
         Returns:
             sqlite3.Connection: An active SQLite database connection.
         """
-        conn = sqlite3.connect(self.db_path)
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        # check_same_thread=False only so that close() may close it from another thread
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
         conn.row_factory = sqlite3.Row # Allow accessing columns by name (e.g., row["title"])
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL") # Durable in WAL mode without an fsync per commit
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-16000") # 16 MiB
+
+        self._local.conn = conn
+        with self._connections_lock:
+            # Close connections of finished threads (e.g. workers of an earlier pipeline run)
+            alive = []
+            for thread, thread_conn in self._connections:
+                if thread.is_alive():
+                    alive.append((thread, thread_conn))
+                else:
+                    thread_conn.close()
+            alive.append((threading.current_thread(), conn))
+            self._connections = alive
         return conn
 
+    def _write(self, sql: str, params: Tuple[Any, ...]) -> None:
+        """
+        Executes a write statement, or queues it when batching is enabled.
+
+        Args:
+            sql (str): SQL statement.
+            params (Tuple[Any, ...]): Statement parameters.
+        """
+        if not self._batch_writes:
+            with self._get_connection() as conn:
+                conn.execute(sql, params)
+            return
+
+        with self._write_lock:
+            if not self._pending_writes:
+                self._pending_since = time.monotonic()
+                if self._flush_thread is None:
+                    self._flush_thread = threading.Thread(target=self._flush_loop, name="db-flush", daemon=True)
+                    self._flush_thread.start()
+                self._flush_wakeup.notify()
+            self._pending_writes.append((sql, params))
+            if len(self._pending_writes) >= self._batch_size:
+                self.flush()
+
+    def _flush_loop(self) -> None:
+        """
+        Flushes pending writes `flush_interval` seconds after the oldest of them was
+        queued, even if no further writes arrive. Runs until `close()`.
+        """
+        with self._write_lock:
+            while not self._closing:
+                if not self._pending_writes:
+                    self._flush_wakeup.wait()
+                    continue
+                remaining = self._pending_since + self._flush_interval - time.monotonic()
+                if remaining > 0:
+                    self._flush_wakeup.wait(remaining)
+                    continue
+                try:
+                    self.flush()
+                except sqlite3.Error as e:
+                    # Keep the batch; it is retried on the next write or by close()
+                    self._console.print(f"  [red]✖ DB write error:[/red] {escape(str(e))}")
+                    self._flush_wakeup.wait(self._flush_interval)
+
+    @metrics.timed("db_call_seconds")
+    def flush(self) -> None:
+        """
+        Commits all pending batched writes in a single transaction.
+        """
+        with self._write_lock:
+            if not self._pending_writes:
+                return
+            conn = self._get_connection()
+            try:
+                with conn:
+                    for sql, params in self._pending_writes:
+                        conn.execute(sql, params)
+            except sqlite3.IntegrityError:
+                # One bad row must not discard the whole batch; retry row by row
+                for sql, params in self._pending_writes:
+                    try:
+                        with conn:
+                            conn.execute(sql, params)
+                    except sqlite3.IntegrityError as e:
+                        self._console.print(f"  [red]✖ DB write error:[/red] {escape(str(e))}")
+            self._pending_writes.clear()
+            self._pending_videos.clear()
+            self._pending_channel_images.clear()
+
+    def close(self) -> None:
+        """
+        Flushes pending writes and closes every connection opened by this manager.
+        """
+        with self._write_lock:
+            self._closing = True
+            self._flush_wakeup.notify()
+        if self._flush_thread is not None:
+            self._flush_thread.join()
+        with self._write_lock:
+            # The manager can still be used; later writes start a new flusher
+            self._flush_thread = None
+            self._closing = False
+        self.flush()
+        with self._connections_lock:
+            for _, conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
     def _initialize_db(self) -> None:
         """
-        Initializes the database by creating necessary tables if they don't exist.
+        Initializes the database by creating the tables or upgrading their schema
+        to the current version (see `src.db.migrations`).
         This is called automatically when a DatabaseManager instance is created.
         """
-        with self._get_connection() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS videos (
-                    video_id TEXT PRIMARY KEY,
-                    title TEXT,
-                    channel_name TEXT,
-                    channel_handle TEXT,
-                    filename TEXT
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS channel_profiles (
-                    channel_handle TEXT PRIMARY KEY,
-                    image_filename TEXT
-                )
-                """
-            )
-            conn.commit()
+        conn = self._get_connection()
+        migrations.migrate(conn, console=self._console)
+        migrations.backfill_video_files(conn, console=self._console)
         self._console.print("[bold green]✔ Database initialized.[/bold green]")
 
+    @metrics.timed("db_call_seconds")
     def is_downloaded(self, video_id: str) -> bool:
         """
         Checks if a video_id is registered in the DB.
@@ -71,19 +220,49 @@ class DatabaseManager:
         Returns:
             bool: True if the video_id is registered in the DB, False otherwise.
         """
+        if video_id in self._pending_videos:
+            return True
         with self._get_connection() as conn:
             # SELECT 1 is efficient for quickly checking existence
             result = conn.execute("SELECT 1 FROM videos WHERE video_id=?", (video_id,)).fetchone()
             return result is not None
 
+    @metrics.timed("db_call_seconds")
+    def is_downloaded_many(self, video_ids: Iterable[str]) -> Dict[str, bool]:
+        """
+        Checks which of the given video_ids are registered in the DB.
+
+        Lookups are done with chunked `IN (...)` queries over a single connection.
+
+        Args:
+            video_ids (Iterable[str]): Video IDs to lookup.
+
+        Returns:
+            Dict[str, bool]: Maps every given video_id to True if registered, False otherwise.
+        """
+        ids = list(dict.fromkeys(video_ids))
+        result = {video_id: video_id in self._pending_videos for video_id in ids}
+        with self._get_connection() as conn:
+            for chunk in _chunked(ids):
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(f"SELECT video_id FROM videos WHERE video_id IN ({placeholders})", chunk)
+                for row in rows:
+                    result[row["video_id"]] = True
+        return result
+
+    @metrics.timed("db_call_seconds")
     def save_video_info(self,
                         video_id: str,
                         title: str,
                         channel_name: str,
                         channel_handle: str,
-                        filename: str) -> None:
+                        filename: str,
+                        file_size: Optional[int] = None,
+                        mtime: Optional[float] = None,
+                        duration: Optional[float] = None) -> None:
         """
-        Inserts information of a downloaded video into the DB.
+        Inserts information of a downloaded video into the DB, or updates it if the
+        video is already registered (e.g. when a resumed job records it again).
 
         Args:
             video_id (str): Video ID.
@@ -91,15 +270,28 @@ class DatabaseManager:
             channel_name (str): Channel name.
             channel_handle (str): Channel handle.
             filename (str): Downloaded file name.
+            file_size (Optional[int]): Size of the file in bytes.
+            mtime (Optional[float]): Modification time of the file.
+            duration (Optional[float]): Duration of the audio in seconds.
         """
-        with self._get_connection() as conn:
-            conn.execute(
-                "INSERT INTO videos (video_id, title, channel_name, channel_handle, filename) VALUES (?, ?, ?, ?, ?)",
-                (video_id, title, channel_name, channel_handle, filename)
+        with self._write_lock:
+            if self._batch_writes:
+                self._pending_videos[video_id] = {
+                    "title": title,
+                    "channel_name": channel_name,
+                    "filename": filename
+                }
+            self._write(
+                "INSERT INTO videos (video_id, title, channel_name, channel_handle, filename, file_size, mtime, duration, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(video_id) DO UPDATE SET title=excluded.title, channel_name=excluded.channel_name, "
+                "channel_handle=excluded.channel_handle, filename=excluded.filename, file_size=excluded.file_size, "
+                "mtime=excluded.mtime, duration=excluded.duration",
+                (video_id, title, channel_name, channel_handle, filename, file_size, mtime, duration, time.time())
             )
-            conn.commit()
         self._console.print(f"  [bold cyan]✔ Saved to DB[/bold cyan]")
 
+    @metrics.timed("db_call_seconds")
     def get_video_info(self, video_id: str) -> Optional[Dict[str, str]]:
         """
         Retrieves video information (title, channel_name, filename) from the DB.
@@ -111,6 +303,10 @@ class DatabaseManager:
             Optional[Dict[str, str]]: Video details (title, channel_name, filename)
                                       or None if not found.
         """
+        pending = self._pending_videos.get(video_id)
+        if pending:
+            return dict(pending)
+
         with self._get_connection() as conn:
             row = conn.execute(
                 "SELECT title, channel_name, filename FROM videos WHERE video_id=?",
@@ -126,6 +322,41 @@ class DatabaseManager:
             else:
                 return None
 
+    @metrics.timed("db_call_seconds")
+    def get_video_info_many(self, video_ids: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Retrieves video information (title, channel_name, filename) for many videos at once.
+
+        Lookups are done with chunked `IN (...)` queries over a single connection.
+
+        Args:
+            video_ids (Iterable[str]): Video IDs to lookup.
+
+        Returns:
+            Dict[str, Dict[str, str]]: Maps video_id to its details (title, channel_name, filename).
+                                       Videos not found in the DB are omitted.
+        """
+        ids = list(dict.fromkeys(video_ids))
+        result: Dict[str, Dict[str, str]] = {
+            video_id: dict(self._pending_videos[video_id])
+            for video_id in ids if video_id in self._pending_videos
+        }
+        with self._get_connection() as conn:
+            for chunk in _chunked(ids):
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT video_id, title, channel_name, filename FROM videos WHERE video_id IN ({placeholders})",
+                    chunk
+                )
+                for row in rows:
+                    result[row["video_id"]] = {
+                        "title": row["title"],
+                        "channel_name": row["channel_name"],
+                        "filename": row["filename"]
+                    }
+        return result
+
+    @metrics.timed("db_call_seconds")
     def save_channel_image_filename(self, channel_handle: str, image_filename: str) -> None:
         """
         Inserts or updates a channel's profile image path in the DB.
@@ -134,15 +365,17 @@ class DatabaseManager:
             channel_handle (str): Channel handle to insert or update.
             image_filename (str): The file path to the channel's profile image.
         """
-        with self._get_connection() as conn:
+        with self._write_lock:
+            if self._batch_writes:
+                self._pending_channel_images[channel_handle] = image_filename
             # Use INSERT OR REPLACE to update if existing, insert if not.
-            conn.execute(
+            self._write(
                 "INSERT OR REPLACE INTO channel_profiles (channel_handle, image_filename) VALUES (?, ?)",
                 (channel_handle, image_filename)
             )
-            conn.commit()
         self._console.print(f"  [bold cyan]✔ Saved channel profile for:[/bold cyan] {channel_handle}")
 
+    @metrics.timed("db_call_seconds")
     def get_channel_image_filename(self, channel_handle: str) -> Optional[str]:
         """
         Retrieves profile image filename from the DB for a given channel handle.
@@ -153,6 +386,10 @@ class DatabaseManager:
         Returns:
             Optional[str]: Image filename or None if not found.
         """
+        pending = self._pending_channel_images.get(channel_handle)
+        if pending:
+            return pending
+
         with self._get_connection() as conn:
             row = conn.execute(
                 "SELECT image_filename FROM channel_profiles WHERE channel_handle=?",
@@ -163,3 +400,244 @@ class DatabaseManager:
                 return row["image_filename"]
             else:
                 return None
+
+    @metrics.timed("db_call_seconds")
+    def save_channel_profile_failure(self, channel_handle: str, failed_at: float, reason: Optional[str]) -> None:
+        """
+        Records a failed channel profile lookup, so it is not retried until it expires.
+
+        Args:
+            channel_handle (str): Channel handle.
+            failed_at (float): UNIX timestamp of the failure.
+            reason (Optional[str]): Short failure reason.
+        """
+        self._write(
+            "INSERT OR REPLACE INTO channel_profile_failures (channel_handle, failed_at, reason) VALUES (?, ?, ?)",
+            (channel_handle, failed_at, reason)
+        )
+
+    @metrics.timed("db_call_seconds")
+    def get_channel_profile_failure(self, channel_handle: str) -> Optional[float]:
+        """
+        Retrieves the time of the last failed profile lookup for a channel.
+
+        Args:
+            channel_handle (str): Channel handle to lookup.
+
+        Returns:
+            Optional[float]: UNIX timestamp of the failure or None if not found.
+        """
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT failed_at FROM channel_profile_failures WHERE channel_handle=?",
+                (channel_handle,)
+            ).fetchone()
+
+            if row:
+                return row["failed_at"]
+            else:
+                return None
+
+    @metrics.timed("db_call_seconds")
+    def get_playlist_snapshot(self, playlist_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves the last-seen membership of a playlist.
+
+        Args:
+            playlist_id (str): Playlist ID to lookup.
+
+        Returns:
+            Optional[Dict[str, Any]]: Snapshot (title, smpl_name, reverse, fetched_at, entries)
+                                      or None if the playlist was never synced. `entries` is
+                                      a list of (video_id, available) tuples in playlist order.
+        """
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT title, smpl_name, reverse, fetched_at FROM playlists WHERE playlist_id=?",
+                (playlist_id,)
+            ).fetchone()
+
+            if not row:
+                return None
+
+            entries = conn.execute(
+                "SELECT video_id, available FROM playlist_entries WHERE playlist_id=? ORDER BY position",
+                (playlist_id,)
+            ).fetchall()
+
+            return {
+                "title": row["title"],
+                "smpl_name": row["smpl_name"],
+                "reverse": bool(row["reverse"]),
+                "fetched_at": row["fetched_at"],
+                "entries": [(entry["video_id"], bool(entry["available"])) for entry in entries]
+            }
+
+    @metrics.timed("db_call_seconds")
+    def get_playlist_snapshots(self) -> List[Dict[str, Any]]:
+        """
+        Retrieves the last-seen membership of every synced playlist in two queries.
+
+        Returns:
+            List[Dict[str, Any]]: Snapshots as returned by `get_playlist_snapshot`,
+                                  with an additional `playlist_id` key.
+        """
+        with self._get_connection() as conn:
+            snapshots: Dict[str, Dict[str, Any]] = {}
+            for row in conn.execute("SELECT playlist_id, title, smpl_name, reverse, fetched_at FROM playlists"):
+                snapshots[row["playlist_id"]] = {
+                    "playlist_id": row["playlist_id"],
+                    "title": row["title"],
+                    "smpl_name": row["smpl_name"],
+                    "reverse": bool(row["reverse"]),
+                    "fetched_at": row["fetched_at"],
+                    "entries": []
+                }
+
+            rows = conn.execute("SELECT playlist_id, video_id, available FROM playlist_entries ORDER BY playlist_id, position")
+            for entry in rows:
+                snapshot = snapshots.get(entry["playlist_id"])
+                if snapshot is not None:
+                    snapshot["entries"].append((entry["video_id"], bool(entry["available"])))
+
+            return list(snapshots.values())
+
+    @metrics.timed("db_call_seconds")
+    def save_playlist_snapshot(self,
+                               playlist_id: str,
+                               title: str,
+                               smpl_name: str,
+                               reverse: bool,
+                               fetched_at: float,
+                               entries: List[Tuple[str, bool]]) -> None:
+        """
+        Replaces the stored membership of a playlist in one transaction.
+
+        Args:
+            playlist_id (str): Playlist ID.
+            title (str): Playlist title on YouTube.
+            smpl_name (str): Name of the generated SMPL playlist.
+            reverse (bool): Whether the SMPL playlist is generated in reverse order.
+            fetched_at (float): UNIX timestamp of the playlist fetch.
+            entries (List[Tuple[str, bool]]): (video_id, available) tuples in playlist order.
+        """
+        with self._get_connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO playlists (playlist_id, title, smpl_name, reverse, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (playlist_id, title, smpl_name, int(reverse), fetched_at)
+            )
+            conn.execute("DELETE FROM playlist_entries WHERE playlist_id=?", (playlist_id,))
+            conn.executemany(
+                "INSERT INTO playlist_entries (playlist_id, position, video_id, available) VALUES (?, ?, ?, ?)",
+                [(playlist_id, position, video_id, int(available))
+                 for position, (video_id, available) in enumerate(entries)]
+            )
+
+    @metrics.timed("db_call_seconds")
+    def add_video_jobs(self, jobs: List[Tuple[str, str]]) -> None:
+        """
+        Registers newly listed videos in the job journal in one transaction.
+        Videos that already have a journal entry are left untouched.
+
+        Journal writes are committed immediately (not batched) so that they
+        survive a crash.
+
+        Args:
+            jobs (List[Tuple[str, str]]): (video_id, filepath) tuples.
+        """
+        if not jobs:
+            return
+        now = time.time()
+        with self._get_connection() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO video_jobs (video_id, stage, filepath, file_size, updated_at) VALUES (?, 'listed', ?, NULL, ?)",
+                [(video_id, filepath, now) for video_id, filepath in jobs]
+            )
+
+    @metrics.timed("db_call_seconds")
+    def save_video_job_stage(self,
+                             video_id: str,
+                             stage: str,
+                             filepath: str,
+                             file_size: Optional[int],
+                             queued: bool = False) -> None:
+        """
+        Records the last completed stage of a video in the job journal.
+
+        Args:
+            video_id (str): Video ID.
+            stage (str): Name of the completed stage.
+            filepath (str): Path of the file produced by the stage.
+            file_size (Optional[int]): Size of that file in bytes.
+            queued (bool): Commit it with the pending batched writes, in order, instead
+                           of right away (e.g. when it depends on a queued `save_video_info`).
+        """
+        sql = "INSERT OR REPLACE INTO video_jobs (video_id, stage, filepath, file_size, updated_at) VALUES (?, ?, ?, ?, ?)"
+        params = (video_id, stage, filepath, file_size, time.time())
+        if queued:
+            self._write(sql, params)
+            return
+        with self._get_connection() as conn:
+            conn.execute(sql, params)
+
+    @metrics.timed("db_call_seconds")
+    def get_video_jobs_many(self, video_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieves job journal entries (stage, filepath, file_size) for many videos at once.
+
+        Args:
+            video_ids (Iterable[str]): Video IDs to lookup.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Maps video_id to its journal entry.
+                                       Videos without an entry are omitted.
+        """
+        ids = list(dict.fromkeys(video_ids))
+        result: Dict[str, Dict[str, Any]] = {}
+        with self._get_connection() as conn:
+            for chunk in _chunked(ids):
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT video_id, stage, filepath, file_size FROM video_jobs WHERE video_id IN ({placeholders})",
+                    chunk
+                )
+                for row in rows:
+                    result[row["video_id"]] = {
+                        "stage": row["stage"],
+                        "filepath": row["filepath"],
+                        "file_size": row["file_size"]
+                    }
+        return result
+
+    @metrics.timed("db_call_seconds")
+    def get_video_jobs(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieves all job journal entries.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Maps video_id to its journal entry (stage, filepath, file_size).
+        """
+        with self._get_connection() as conn:
+            rows = conn.execute("SELECT video_id, stage, filepath, file_size FROM video_jobs").fetchall()
+            return {
+                row["video_id"]: {
+                    "stage": row["stage"],
+                    "filepath": row["filepath"],
+                    "file_size": row["file_size"]
+                }
+                for row in rows
+            }
+
+    @metrics.timed("db_call_seconds")
+    def delete_video_jobs(self, video_ids: Iterable[str]) -> None:
+        """
+        Removes finished videos from the job journal.
+
+        Args:
+            video_ids (Iterable[str]): Video IDs to remove.
+        """
+        ids = list(dict.fromkeys(video_ids))
+        with self._get_connection() as conn:
+            for chunk in _chunked(ids):
+                placeholders = ",".join("?" * len(chunk))
+                conn.execute(f"DELETE FROM video_jobs WHERE video_id IN ({placeholders})", chunk)
@@ -0,0 +1,250 @@
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rich.console import Console as RichConsole
+
+import src.config as config
+import src.util.output as output
+import src.util.string_utils as string_utils
+from src.exceptions import SchemaVersionError
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    One step of the schema history. `apply` upgrades the schema from
+    `version - 1` to `version` and must not commit.
+    """
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection, RichConsole], None]
+
+def _create_tables(conn: sqlite3.Connection, console: RichConsole) -> None:
+    # The schema before versioning; existing databases already have these tables
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS videos (
+            video_id TEXT PRIMARY KEY,
+            title TEXT,
+            channel_name TEXT,
+            channel_handle TEXT,
+            filename TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS channel_profiles (
+            channel_handle TEXT PRIMARY KEY,
+            image_filename TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS channel_profile_failures (
+            channel_handle TEXT PRIMARY KEY,
+            failed_at REAL,
+            reason TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS playlists (
+            playlist_id TEXT PRIMARY KEY,
+            title TEXT,
+            smpl_name TEXT,
+            reverse INTEGER,
+            fetched_at REAL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS playlist_entries (
+            playlist_id TEXT,
+            position INTEGER,
+            video_id TEXT,
+            available INTEGER,
+            PRIMARY KEY (playlist_id, position)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS video_jobs (
+            video_id TEXT PRIMARY KEY,
+            stage TEXT,
+            filepath TEXT,
+            file_size INTEGER,
+            updated_at REAL
+        )
+        """
+    )
+
+def _add_video_file_columns(conn: sqlite3.Connection, console: RichConsole) -> None:
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(videos)")}
+    for column, column_type in (("file_size", "INTEGER"), ("mtime", "REAL"), ("duration", "REAL"), ("added_at", "REAL")):
+        if column not in existing:
+            conn.execute(f"ALTER TABLE videos ADD COLUMN {column} {column_type}")
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_channel_handle ON videos (channel_handle)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_channel_filename ON videos (channel_name, filename)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_added_at ON videos (added_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_playlist_entries_video_id ON playlist_entries (video_id)")
+    # The values of existing rows are filled in by `backfill_video_files`, outside of the transaction
+
+# Append new migrations here; never change or reorder applied ones
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Create tables", _create_tables),
+    Migration(2, "Add file size, mtime, duration and added_at columns to videos, with indexes", _add_video_file_columns),
+]
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """
+    Returns the schema version of a database.
+
+    Args:
+        conn (sqlite3.Connection): Database connection.
+
+    Returns:
+        int: Version of the last applied migration, 0 for a new database.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at REAL
+        )
+        """
+    )
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+def migrate(conn: sqlite3.Connection, console: Optional[RichConsole] = None) -> int:
+    """
+    Upgrades a database to the latest schema version.
+
+    Every migration runs in its own transaction together with recording its
+    version, so an interrupted migration is rolled back and retried on the next
+    start. The write lock is taken before the version is checked, so concurrent
+    processes never apply a migration twice.
+
+    Args:
+        conn (sqlite3.Connection): Database connection with no open transaction.
+        console (Optional[RichConsole]): `rich.console.Console` for styled output.
+
+    Returns:
+        int: Number of migrations applied.
+
+    Raises:
+        SchemaVersionError: If the database has a newer schema than this app supports.
+    """
+    _console = console if console else output.get_console()
+
+    version = get_schema_version(conn)
+    conn.commit()
+    if version > SCHEMA_VERSION:
+        raise SchemaVersionError(version=version, supported_version=SCHEMA_VERSION)
+
+    applied = 0
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = get_schema_version(conn)
+            if migration.version <= version:
+                conn.rollback()
+                continue
+            migration.apply(conn, _console)
+            conn.execute("INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                         (migration.version, migration.description, time.time()))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        version = migration.version
+        applied += 1
+        _console.print(f"[dim]  Migrated database to schema version {migration.version}: {migration.description}[/dim]")
+    return applied
+
+def backfill_video_files(conn: sqlite3.Connection,
+                         batch_size: int = config.DB_BACKFILL_BATCH_SIZE,
+                         console: Optional[RichConsole] = None) -> int:
+    """
+    Fills in file_size, mtime, duration and added_at of videos downloaded
+    before these columns existed, from the files on disk. The file mtime
+    stands in for the unknown download time; videos without a file get the
+    time of the backfill.
+
+    Files are read without holding the write lock and the results are committed
+    in batches, so other processes aren't blocked by a large library and an
+    interrupted backfill continues where it stopped on the next start.
+
+    Args:
+        conn (sqlite3.Connection): Database connection with no open transaction.
+        batch_size (int): Number of videos updated per transaction.
+        console (Optional[RichConsole]): `rich.console.Console` for styled output.
+
+    Returns:
+        int: Number of videos backfilled.
+    """
+    _console = console if console else output.get_console()
+
+    rows = conn.execute("SELECT video_id, channel_name, filename FROM videos WHERE added_at IS NULL").fetchall()
+    conn.commit()
+    if not rows:
+        return 0
+    _console.print(f"[bold yellow]➜ Backfilling file info of {len(rows)} videos...[/bold yellow]")
+
+    from src.converter.metadata import read_duration # Imports mutagen; only needed for the backfill
+
+    # One directory read per channel instead of one stat per video
+    listings: Dict[str, Dict[str, os.stat_result]] = {}
+    missing = 0
+    for start in range(0, len(rows), max(1, batch_size)):
+        updates: List[Tuple[Optional[int], Optional[float], Optional[float], float, str]] = []
+        for video_id, channel_name, filename in rows[start:start + batch_size]:
+            directory = string_utils.clean_channel_name(channel_name or "")
+            if directory not in listings:
+                listings[directory] = _list_files(os.path.join(config.DOWN_DIR, directory))
+
+            stat = listings[directory].get(filename or "")
+            if stat is None:
+                missing += 1
+                updates.append((None, None, None, time.time(), video_id))
+                continue
+            try:
+                duration = read_duration(os.path.join(config.DOWN_DIR, directory, filename))
+            except Exception:
+                duration = None # A corrupt file must not stop the backfill of the others
+            updates.append((stat.st_size, stat.st_mtime, duration, stat.st_mtime, video_id))
+
+        # Rows another process backfilled in the meantime are left alone
+        with conn:
+            conn.executemany("UPDATE videos SET file_size=?, mtime=?, duration=?, added_at=? "
+                             "WHERE video_id=? AND added_at IS NULL", updates)
+
+    if missing:
+        _console.print(f"[yellow]⚠ {missing} recorded videos have no file on disk[/yellow]")
+    return len(rows)
+
+def _list_files(directory: str) -> Dict[str, os.stat_result]:
+    files: Dict[str, os.stat_result] = {}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_file():
+                        files[entry.name] = entry.stat()
+                except OSError:
+                    continue # Unreadable files are treated as missing
+    except OSError:
+        pass
+    return files
@@ -1,21 +1,32 @@
 import os
+import tempfile
 from typing import Optional
 
-import requests
-import yt_dlp # type: ignore
-import magic
 from rich.console import Console as RichConsole
+from rich.markup import escape
 
 import src.config as config
+import src.downloader.ydl_pool as ydl_pool
+import src.util.http as http
+import src.util.metrics as metrics
+import src.util.output as output
+import src.util.rate_limit as rate_limit
 import src.util.string_utils as string_utils
 from src.exceptions import UnsupportedFileTypeError, ProfileImageDownloadError, NoProfileImageError, GetProfileImageURLError
 from src.db.db_manager import DatabaseManager
 from src.util.file_types import mime_to_extension
-    
+
+# Bytes needed by libmagic to identify common image formats
+_MIME_SNIFF_SIZE = 2048
+
+# yt-dlp options of the pooled YoutubeDL instances used for channel lookups
+_CHANNEL_OPTIONS = {"quiet": True, "extract_flat": True, "playlist_items": "1"}
+
+@metrics.timed("avatar_fetch_seconds")
 def download_channel_profile_image(channel_handle: str,
                                    url: str,
                                    db_manager: DatabaseManager,
-                                   console: Optional[RichConsole] = None) -> None:
+                                   console: Optional[RichConsole] = None) -> str:
     """
     Downloads a channel's profile image with automatic extension detection.
 
@@ -27,38 +38,61 @@ def download_channel_profile_image(channel_handle: str,
         db_manager (DatabaseManager): An instance of the `DBManager` to save the image filename.
         console (Optional[RichConsole]): `rich.console.Console` for styled output.
 
+    Returns:
+        str: Path of the downloaded image.
+
     Raises:
         UnsupportedFileTypeError: If the downloaded image's file type is not supported.
         ProfileImageDownloadError: If an error occurs during the image download process.
     """
-    _console = console if console else RichConsole()
+    _console = console if console else output.get_console()
 
+    tmp_path = None
     try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-
-        content = b""  # Accumulate the downloaded content
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:  # filter out keep-alive new chunks
-                content += chunk
-
-        mime_type: Optional[str] = magic.from_buffer(content, mime=True)
-        extension = mime_to_extension(mime_type)
-
-        if not extension:
-            raise UnsupportedFileTypeError(message="Could not determine file extension", file_type=mime_type)
-        
-        image_name = f"{string_utils.clean_filename(channel_handle)}.{extension}"
-        image_path = os.path.join(config.ICON_DIR, image_name)
-
-        with open(image_path, "wb") as f:
-            f.write(content)
+        with rate_limit.get_rate_limiter().request(slot=False), \
+                http.get_session().get(url, stream=True, timeout=config.HTTP_TIMEOUT) as response:
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=8192)
+
+            # Sniff the MIME type from the head of the file only
+            head = b""
+            for chunk in chunks:
+                head += chunk
+                if len(head) >= _MIME_SNIFF_SIZE:
+                    break
+
+            import magic # Loads libmagic; only needed when an image is downloaded
+            mime_type: Optional[str] = magic.from_buffer(head, mime=True)
+            extension = mime_to_extension(mime_type)
+
+            if not extension:
+                raise UnsupportedFileTypeError(message="Could not determine file extension", file_type=mime_type)
+            
+            image_name = f"{string_utils.clean_filename(channel_handle)}.{extension}"
+            image_path = os.path.join(config.ICON_DIR, image_name)
+
+            # Stream the rest into a temp file, then move it into place atomically
+            os.makedirs(config.ICON_DIR, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=config.ICON_DIR, suffix=".part", delete=False) as f:
+                tmp_path = f.name
+                f.write(head)
+                for chunk in chunks:
+                    if chunk:  # filter out keep-alive new chunks
+                        f.write(chunk)
+            os.chmod(tmp_path, 0o644) # Temp files are private (0600); icons are read by other apps
+            os.replace(tmp_path, image_path)
+            tmp_path = None
 
         db_manager.save_channel_image_filename(channel_handle=channel_handle, image_filename=image_name)
+        return image_path
 
     except Exception as e:
         raise ProfileImageDownloadError(url=url, original_exception=e)
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
     
+@metrics.timed("avatar_fetch_seconds")
 def get_channel_profile_url(channel_handle: str, console: Optional[RichConsole] = None) -> str:
     """
     Retrieves the profile image URL for a given channel handle.
@@ -74,13 +108,13 @@ def get_channel_profile_url(channel_handle: str, console: Optional[RichConsole]
         NoProfileImageError: If no profile image URL is found for the channel.
         GetProfileImageURLError: If an error occurs during the process of fetching the URL (e.g., network issue, parsing error).
     """
-    _console = console if console else RichConsole()
+    _console = console if console else output.get_console()
 
-    # Explicitly type ydl as yt_dlp.YoutubeDL
-    ydl: yt_dlp.YoutubeDL = yt_dlp.YoutubeDL({"quiet": True, "extract_flat": True, "playlist_items": "1"})
     try:
         uploader_url = f"https://www.youtube.com/{channel_handle}"
-        info = ydl.extract_info(uploader_url, download=False) # type: ignore
+        with ydl_pool.get_pool().session("channel", _CHANNEL_OPTIONS) as ydl, \
+                rate_limit.get_rate_limiter().request(slot=False):
+            info = ydl.extract_info(uploader_url, download=False) # type: ignore
         thumbnails = info.get("thumbnails", []) # type: ignore
         for thumbnail in thumbnails: # type: ignore
             if thumbnail.get("id") == "avatar_uncropped": # type: ignore
@@ -94,5 +128,5 @@ def get_channel_profile_url(channel_handle: str, console: Optional[RichConsole]
         raise NoProfileImageError(channel_handle=channel_handle)
     
     except Exception as e:
-        _console.print(f"  [red]✖ Error fetching channel profile image:[/red] {e}")
+        _console.print(f"  [red]✖ Error fetching channel profile image:[/red] {escape(str(e))}")
         raise GetProfileImageURLError(channel_handle=channel_handle, original_exception=e)
\ No newline at end of file
@@ -1,120 +1,453 @@
+import io
 import os
-from typing import Any, Dict, List, Optional, cast
+import re
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional
 
-import yt_dlp # type: ignore
 from rich.console import Console as RichConsole
+from rich.markup import escape
 
 import src.config as config
+import src.downloader.journal as journal
+import src.downloader.retry as retry
+import src.downloader.ydl_pool as ydl_pool
+import src.util.http as http
+import src.util.metrics as metrics
+import src.util.output as output
+import src.util.rate_limit as rate_limit
 import src.util.string_utils as string_utils
 import src.converter.convert as convert
 import src.converter.metadata as metadata
+import src.converter.remux as remux
 from src.db.db_manager import DatabaseManager
-from src.exceptions import ConversionMaxRetryAttemptError, DownloadError, FileConversionError
+from src.downloader.journal import JobJournal
+from src.downloader.profile_cache import ChannelProfileCache
+from src.playlist.model import Playlist, PlaylistEntry
+from src.pipeline.engine import Pipeline, Stage
+from src.exceptions import ConversionMaxRetryAttemptError, DownloadError, FileConversionError, PermanentDownloadError, RangeNotSupportedError, RemuxError
+from src.util.fs_index import DirectoryIndex
 
-def get_playlist_info(url: str, console: Optional[RichConsole] = None) -> dict[str, Any]:
+if TYPE_CHECKING:
+    import yt_dlp # type: ignore
+
+# yt-dlp option profiles of the pooled YoutubeDL instances
+_PLAYLIST_OPTIONS: Dict[str, Any] = {"quiet": True, "extract_flat": True}
+_LAZY_PLAYLIST_OPTIONS: Dict[str, Any] = {"quiet": True, "extract_flat": True, "lazy_playlist": True}
+_STREAM_OPTIONS: Dict[str, Any] = {
+    "format": "bestaudio[ext=webm]/best",
+    "noplaylist": True,
+    "quiet": True
+}
+
+def get_playlist_info(url: str,
+                      lazy: bool = config.LAZY_PLAYLIST,
+                      console: Optional[RichConsole] = None) -> Playlist:
     """
     Fetches playlist information json from YouTube.
 
+    In lazy mode, `entries` is a generator that yields entries as yt-dlp
+    fetches the playlist pages, so downloads can start before the listing
+    finishes. Otherwise the full listing is fetched up front.
+    Either way each entry is reduced to a compact `PlaylistEntry`.
+
     Args:
         url (str): Playlist URL
+        lazy (bool): Stream entries instead of fetching the whole listing first.
     
     Returns:
-        dict: Playlist object
+        Playlist: Playlist object
     """
-    _console = console if console else RichConsole()
+    _console = console if console else output.get_console()
 
     _console.print(f"[bold blue]➜ Fetching playlist:[/bold blue] {url}")
 
     playlist_info: dict[str, Any] = {}
     
-    # Explicitly type ydl as yt_dlp.YoutubeDL
-    ydl: yt_dlp.YoutubeDL = yt_dlp.YoutubeDL({"quiet": True, "extract_flat": True})
-    playlist_info = ydl.extract_info(url, download=False) # type: ignore
+    pool = ydl_pool.get_pool()
+    _metrics = metrics.get_metrics()
 
-    # Remove empty or faulty entries(e.g. private video) from playlist_info
-    raw_entries = cast(Optional[List[Dict[str, Any]]], playlist_info.get("entries"))
-    entries: list[dict[str, Any]] = [
-        entry for entry in (raw_entries or []) if entry
-    ]
+    if lazy:
+        # process=False returns the extractor result as-is, with entries as a lazy generator
+        ydl: "yt_dlp.YoutubeDL" = pool.acquire("playlist_lazy", _LAZY_PLAYLIST_OPTIONS)
+        try:
+            # Covers the first page only; later pages are fetched as the entries are consumed
+            with _metrics.timer("playlist_fetch_seconds", mode="lazy"), rate_limit.get_rate_limiter().request(slot=False):
+                playlist_info = ydl.extract_info(url, download=False, process=False) # type: ignore
+        except BaseException:
+            pool.release("playlist_lazy", ydl)
+            raise
+        if playlist_info.get("_type") == "playlist":
+            _console.print(f"[bold yellow]➜ Streaming playlist entries[/bold yellow]")
+            return Playlist(id=playlist_info.get("id"),
+                            title=playlist_info.get("title"),
+                            entries=_iter_lazy_entries(playlist_info.get("entries"), pool, ydl))
+        # e.g. a redirect to another URL; let yt-dlp resolve it the regular way
+        pool.release("playlist_lazy", ydl)
+
+    with _metrics.timer("playlist_fetch_seconds", mode="full"), \
+            pool.session("playlist", _PLAYLIST_OPTIONS) as ydl, rate_limit.get_rate_limiter().request(slot=False):
+        playlist_info = ydl.extract_info(url, download=False) # type: ignore
+
+    entries = list(_iter_entries(playlist_info.get("entries")))
 
     _console.print(f"[bold yellow]➜ Playlist contains {len(entries)} videos[/bold yellow]")
 
-    playlist_info["entries"] = entries
-    return playlist_info
+    return Playlist(id=playlist_info.get("id"),
+                    title=playlist_info.get("title"),
+                    entries=entries)
+
+def _iter_entries(raw_entries: Optional[Iterable[Optional[Dict[str, Any]]]]) -> Iterator[PlaylistEntry]:
+    """
+    Converts yt-dlp playlist entries to `PlaylistEntry` objects.
+
+    Args:
+        raw_entries (Optional[Iterable]): yt-dlp playlist entries (list or generator).
+
+    Yields:
+        PlaylistEntry: One per non-empty entry.
+    """
+    for info in raw_entries or []:
+        # Skip empty or faulty entries(e.g. private video)
+        entry = PlaylistEntry.from_info(info)
+        if entry:
+            yield entry
+
+def _iter_lazy_entries(raw_entries: Optional[Iterable[Optional[Dict[str, Any]]]],
+                       pool: ydl_pool.YoutubeDLPool,
+                       ydl: "yt_dlp.YoutubeDL") -> Iterator[PlaylistEntry]:
+    """
+    Like `_iter_entries`, but returns the YoutubeDL fetching the pages to the pool once done.
+    """
+    try:
+        yield from _iter_entries(raw_entries)
+    finally:
+        pool.release("playlist_lazy", ydl)
 
-def download_playlist(playlist_info: dict[str, Any],
+@dataclass
+class _VideoJob:
+    """
+    A playlist entry travelling through the download pipeline.
+    """
+    entry: PlaylistEntry
+    idx: int
+    video_id: str
+    title: str
+    channel_name: str
+    channel_handle: Optional[str]
+    filepath: str
+    tags: Optional[dict[str, list[str]]] = None
+    stage: str = journal.LISTED # Last completed stage
+
+def download_playlist(playlist: Playlist,
                       db_manager: DatabaseManager,
-                      console: Optional[RichConsole] = None) -> dict[str, Any]:
+                      jobs: int = config.DEFAULT_JOBS,
+                      profile_cache: Optional[ChannelProfileCache] = None,
+                      job_journal: Optional[JobJournal] = None,
+                      console: Optional[RichConsole] = None) -> Playlist:
     """
     Download playlist as audio files and convert to .ogg file.
 
+    Videos run through a staged pipeline (download → tag → convert → record)
+    so that conversion and tagging overlap with network I/O. The returned
+    entries always keep the original playlist order, regardless of the order
+    in which the stages finish.
+
+    Each completed stage is recorded in the job journal, so videos interrupted
+    by a crash resume from their last completed stage on the next run.
+
     Args:
-        playlist_info (dict): Playlist object
+        playlist (Playlist): Playlist object
         db_manager: DatabaseManager instance
+        jobs (int): Number of videos downloaded concurrently.
+        profile_cache (Optional[ChannelProfileCache]): Channel profile cache shared by the
+                                                       tagging workers.
+        job_journal (Optional[JobJournal]): Journal recording the progress of each video.
     
     Returns:
-        Dict[str, Any]: Playlist object
-    """
-    _console = console if console else RichConsole()
-    new_entries = []
-
-    for idx, entry in enumerate(playlist_info["entries"], start=1):
-        video_id = entry["id"]
-        channel_name = entry.get("uploader")
-        channel_handle = entry.get("uploader_id")
-        title = string_utils.clean_title(entry["title"])
-        
-        if channel_name and "러끼" in channel_name:
-            title = string_utils.special_processing_7ucky(title)
-        
-        if not channel_name: # Private videos
-            continue
-        
-        filename = f"{string_utils.clean_filename(title)} ({video_id}).webm"
-        filepath = os.path.join(config.DOWN_DIR, string_utils.clean_channel_name(channel_name), filename)
-
-        _console.print(f"[bold green]⬇ Downloading {title} ({video_id}) ({idx}/{len(playlist_info["entries"])})[/bold green]")
-
-        if db_manager.is_downloaded(video_id):
-            new_entries.append(entry)
-            _console.print(f"  [dim]⏭ Skipping download[/dim]\n")
-            continue
+        Playlist: Playlist object with only the entries available locally
+    """
+    _console = console if console else output.get_console()
+    _profile_cache = profile_cache if profile_cache else ChannelProfileCache(db_manager, console=_console)
+    _journal = job_journal if job_journal else JobJournal(db_manager, console=_console)
+    raw_entries = playlist.entries
+    # Unknown while a lazy listing is still streaming
+    total = len(raw_entries) if isinstance(raw_entries, list) else None
+
+    # Registered videos whose file was deleted since are downloaded again
+    fs_index = DirectoryIndex(config.DOWN_DIR, cache_path=config.FS_INDEX_PATH)
+    entries: list[PlaylistEntry] = []
+    available: set[str] = set()
+    seen: set[str] = set()
+
+    def iter_pending() -> Iterator[_VideoJob]:
+        # Look entries up in chunks so a lazy listing is not materialized first
+        chunk: list[tuple[int, PlaylistEntry]] = []
+        for idx, entry in enumerate(raw_entries, start=1):
+            entries.append(entry)
+            chunk.append((idx, entry))
+            if len(chunk) >= config.LOOKUP_CHUNK_SIZE or (total is None and len(chunk) >= 10):
+                yield from filter_chunk(chunk)
+                chunk = []
+        yield from filter_chunk(chunk)
+
+    def filter_chunk(chunk: list[tuple[int, PlaylistEntry]]) -> Iterator[_VideoJob]:
+        video_infos = db_manager.get_video_info_many(entry.id for _, entry in chunk)
+        pending: list[_VideoJob] = []
+        for idx, entry in chunk:
+            video_id = entry.id
+            # A video may appear more than once in a playlist; process it only once
+            # so that two workers never write the same file.
+            if video_id in seen:
+                continue
+            seen.add(video_id)
+
+            job = _make_job(entry, idx)
+            if job is None: # Private videos
+                continue
+
+            db_info = video_infos.get(video_id)
+            if db_info:
+                if fs_index.contains(string_utils.clean_channel_name(db_info["channel_name"]), db_info["filename"]):
+                    available.add(video_id)
+                    _console.print(f"[dim]⏭ Skipping download: {escape(job.title)} ({video_id}) ({_position(idx, total)})[/dim]")
+                    continue
+                _console.print(f"[yellow]⚠ File of {escape(job.title)} ({video_id}) is missing, downloading it again[/yellow]")
+
+            pending.append(job)
+
+        # Resume videos interrupted in an earlier run
+        resume_points = _journal.resume_points(job.video_id for job in pending)
+        for job in pending:
+            if job.video_id in resume_points:
+                job.stage, job.filepath = resume_points[job.video_id]
+                _console.print(f"[dim]↻ Resuming {escape(job.title)} ({job.video_id}) after stage '{job.stage}'[/dim]")
+        _journal.add([(job.video_id, job.filepath) for job in pending if job.video_id not in resume_points])
+        tracker.add_total(len(pending))
+        yield from pending
+
+    if config.STREAM_DOWNLOADS:
+        # Tags are needed up front, since they are written while the download streams in
+        stages = [
+            Stage("tag", lambda job: _tag_stage(job, db_manager, _profile_cache, _console),
+                  workers=config.TAG_WORKERS, queue_size=config.PIPELINE_QUEUE_SIZE),
+            Stage("download", lambda job: _stream_stage(job, total, _journal, _console),
+                  workers=jobs, queue_size=config.PIPELINE_QUEUE_SIZE),
+        ]
+    else:
+        stages = [
+            Stage("download", lambda job: _download_stage(job, total, _journal, _console),
+                  workers=jobs, queue_size=config.PIPELINE_QUEUE_SIZE),
+            Stage("tag", lambda job: _tag_stage(job, db_manager, _profile_cache, _console),
+                  workers=config.TAG_WORKERS, queue_size=config.PIPELINE_QUEUE_SIZE),
+            Stage("convert", lambda job: _convert_stage(job, _journal, _console),
+                  workers=config.CONVERT_WORKERS, queue_size=config.PIPELINE_QUEUE_SIZE),
+        ]
+    stages.append(Stage("record", lambda job: _record_stage(job, db_manager, _journal),
+                        workers=1, queue_size=config.PIPELINE_QUEUE_SIZE))
+    with output.progress(_console, "Downloading") as tracker:
+        pipeline = Pipeline(stages, on_item_done=tracker.advance)
+        done = pipeline.run(iter_pending())
+    available.update(job.video_id for job in done)
+
+    if total is None:
+        _console.print(f"[bold yellow]➜ Playlist contains {len(entries)} videos[/bold yellow]")
+    metrics.get_metrics().increment("playlist_entries_total", len(entries))
+    metrics.get_metrics().increment("videos_already_downloaded_total", len(available - {job.video_id for job in done}))
+    if pipeline.stats()[0].processed or pipeline.stats()[0].dropped:
+        _print_pipeline_stats(pipeline, _console)
+
+    # Generate new playlist object from processed entries
+    return Playlist(id=playlist.id,
+                    title=playlist.title,
+                    entries=[entry for entry in entries if entry.id in available])
+
+def _make_job(entry: PlaylistEntry, idx: int) -> Optional[_VideoJob]:
+    """
+    Builds a pipeline job from a playlist entry.
+
+    Args:
+        entry (PlaylistEntry): Playlist entry
+        idx (int): 1-based position of the entry in the playlist.
+
+    Returns:
+        Optional[_VideoJob]: The job, or None if the entry has no channel (e.g. private video).
+    """
+    video_id = entry.id
+    channel_name = entry.uploader
+    title = string_utils.clean_title(entry.title)
+    
+    if not channel_name:
+        return None
+
+    if "러끼" in channel_name:
+        title = string_utils.special_processing_7ucky(title)
+    
+    filename = f"{string_utils.clean_filename(title)} ({video_id}).webm"
+    filepath = os.path.join(config.DOWN_DIR, string_utils.clean_channel_name(channel_name), filename)
+
+    return _VideoJob(entry=entry,
+                     idx=idx,
+                     video_id=video_id,
+                     title=title,
+                     channel_name=channel_name,
+                     channel_handle=entry.uploader_id,
+                     filepath=filepath)
+
+def _position(idx: int, total: Optional[int]) -> str:
+    return f"{idx}/{total}" if total is not None else f"{idx}"
+
+def _download_stage(job: _VideoJob,
+                    total: Optional[int],
+                    job_journal: JobJournal,
+                    console: RichConsole) -> Optional[_VideoJob]:
+    if journal.reached(job.stage, journal.DOWNLOADED):
+        return job
+
+    console.print(f"[bold green]⬇ Downloading {escape(job.title)} ({job.video_id}) ({_position(job.idx, total)})[/bold green]")
+    try:
+        download_video(filepath=job.filepath,
+                       video_url=job.entry.url,
+                       channel_name=job.channel_name,
+                       trial_count=10,
+                       console=console)
+    except DownloadError:
+        metrics.get_metrics().increment("downloads_total", mode="download", result="failed")
+        console.print(f"  [dim]⏭ Skipping download due to error: {job.video_id}[/dim]")
+        return None
+    metrics.get_metrics().increment("downloads_total", mode="download", result="ok")
+    job.stage = journal.DOWNLOADED
+    job_journal.mark(job.video_id, job.stage, job.filepath)
+    return job
+
+def _stream_stage(job: _VideoJob,
+                  total: Optional[int],
+                  job_journal: JobJournal,
+                  console: RichConsole) -> Optional[_VideoJob]:
+    if journal.reached(job.stage, journal.DOWNLOADED):
+        # Interrupted after a regular download; finish it the regular way
+        return _convert_stage(job, job_journal, console)
+
+    console.print(f"[bold green]⬇ Downloading {escape(job.title)} ({job.video_id}) ({_position(job.idx, total)})[/bold green]")
+    try:
+        ogg_path = stream_video(filepath=job.filepath,
+                                video_url=job.entry.url,
+                                channel_name=job.channel_name,
+                                tags=job.tags,
+                                trial_count=10,
+                                console=console)
+    except DownloadError:
+        metrics.get_metrics().increment("downloads_total", mode="stream", result="failed")
+        console.print(f"  [dim]⏭ Skipping download due to error: {job.video_id}[/dim]")
+        return None
+
+    if ogg_path:
+        metrics.get_metrics().increment("downloads_total", mode="stream", result="ok")
+        job.filepath = ogg_path
+        job.stage = journal.TAGGED # Tags are written while remuxing
+        job_journal.mark(job.video_id, job.stage, job.filepath)
+        return job
+
+    # Not streamable; download the file and convert it instead
+    if _download_stage(job, total, job_journal, console) is None:
+        return None
+    return _convert_stage(job, job_journal, console)
+
+def _convert_stage(job: _VideoJob, job_journal: JobJournal, console: RichConsole) -> _VideoJob:
+    if job.stage == journal.REMUXED:
+        # Interrupted before the tags were written
+        if job.tags:
+            metadata.write_tags(job.filepath, job.tags)
+        job.stage = journal.TAGGED
+        job_journal.mark(job.video_id, job.stage, job.filepath)
+    if journal.reached(job.stage, journal.TAGGED):
+        return job
+
+    def on_remuxed(ogg_path: str) -> None:
+        job_journal.mark(job.video_id, journal.REMUXED, ogg_path)
+
+    new_filepath = ""
 
+    # Try 3 times before failing
+    trial_count = 3
+    for trial in range(0, trial_count):
         try:
-            download_video(filepath=filepath,
-                            video_url=entry["url"],
-                            channel_name=channel_name,
-                            trial_count=10,
-                            console=_console)
-        except DownloadError:
-            _console.print(f"  [dim]⏭ Skipping download due to error[/dim]")
-            continue
-
-        new_filepath = ""
-
-        # Try 3 times before failing
-        trial_count = 3
-        for trial in range(0, trial_count):
-            try:
-                new_filepath = convert.convert_to_ogg(filepath)
-            except FileConversionError:
-                _console.print(f"    🔄 Retrying... ({trial+1}/{trial_count})")
-                _console.print(f"  [dim]⏭ Skipping conversion due to error[/dim]")
-            else:
-                break
-        
-        if new_filepath == "":
-            raise ConversionMaxRetryAttemptError(f"Conversion failed: Max retry attempts reached. (tried {trial_count} times.)")
-
-        filename = os.path.basename(new_filepath)
-        metadata.update_metadata(new_filepath, title, video_id, channel_name, channel_handle, db_manager)
-        db_manager.save_video_info(video_id, title, channel_name, channel_handle, filename)
-        new_entries.append(entry)
-        _console.print("")
+            with metrics.get_metrics().timer("remux_seconds"):
+                new_filepath = convert.convert_to_ogg(job.filepath, tags=job.tags, on_remuxed=on_remuxed, console=console)
+        except FileConversionError:
+            console.print(f"    🔄 Retrying... ({trial+1}/{trial_count})")
+        else:
+            break
     
-    # Generate new playlist object from new_entries
-    playlist_info["entries"] = new_entries
-    return playlist_info
+    if new_filepath == "":
+        raise ConversionMaxRetryAttemptError(f"Conversion failed: Max retry attempts reached. (tried {trial_count} times.)")
+
+    job.filepath = new_filepath
+    job.stage = journal.TAGGED # Tags are written during conversion
+    job_journal.mark(job.video_id, job.stage, job.filepath)
+    return job
+
+def _tag_stage(job: _VideoJob,
+               db_manager: DatabaseManager,
+               profile_cache: ChannelProfileCache,
+               console: RichConsole) -> _VideoJob:
+    if journal.reached(job.stage, journal.TAGGED):
+        return job
+    # Tags are written by the convert stage in the same pass as the remux
+    with metrics.get_metrics().timer("tag_seconds"):
+        job.tags = metadata.build_tags(job.title, job.video_id, job.channel_name, job.channel_handle,
+                                       db_manager, profile_cache=profile_cache, console=console)
+    return job
+
+def _record_stage(job: _VideoJob, db_manager: DatabaseManager, job_journal: JobJournal) -> _VideoJob:
+    try:
+        stat: Optional[os.stat_result] = os.stat(job.filepath)
+    except OSError:
+        stat = None
+    db_manager.save_video_info(job.video_id, job.title, job.channel_name, job.channel_handle,
+                               os.path.basename(job.filepath),
+                               file_size=stat.st_size if stat else None,
+                               mtime=stat.st_mtime if stat else None,
+                               duration=metadata.read_duration(job.filepath))
+    job.stage = journal.RECORDED
+    job_journal.mark(job.video_id, job.stage, job.filepath)
+    return job
+
+def _print_pipeline_stats(pipeline: Pipeline, console: RichConsole) -> None:
+    for stats in pipeline.stats():
+        console.print(f"[dim]  {stats.name}: {stats.processed} done, {stats.dropped} skipped, "
+                      f"{stats.throughput:.2f}/s ({stats.workers} workers, queue {stats.queue_depth}/{stats.queue_size})[/dim]")
+    console.print(f"[dim]  rate limit: {rate_limit.get_rate_limiter().status()}[/dim]")
+
+# Every WebM (Matroska) file starts with the EBML magic number
+_EBML_MAGIC = b"\x1a\x45\xdf\xa3"
+# Transfers smaller than this finish too quickly to judge their speed
+_THROTTLE_CHECK_MIN_SIZE = 1024 * 1024
+
+def _record_transfer(size: int, elapsed: float, mode: str) -> None:
+    _metrics = metrics.get_metrics()
+    _metrics.increment("download_bytes_total", size, mode=mode)
+    _metrics.observe("download_seconds", elapsed, mode=mode)
+    if elapsed > 0:
+        _metrics.observe("download_speed_bytes_per_second", size / elapsed, buckets=metrics.SPEED_BUCKETS, mode=mode)
+
+def _on_download_progress(progress: Dict[str, Any]) -> None:
+    if progress.get("status") != "finished":
+        return
+    size = progress.get("total_bytes") or progress.get("downloaded_bytes") or 0
+    elapsed = progress.get("elapsed") or 0
+    _record_transfer(size, elapsed, "download")
+    # A slow transfer is YouTube throttling this client
+    if size >= _THROTTLE_CHECK_MIN_SIZE and elapsed and size / elapsed < config.RATE_LIMIT_THROTTLED_SPEED:
+        rate_limit.get_rate_limiter().report_throttled("slow download")
+
+_DOWNLOAD_OPTIONS: Dict[str, Any] = {
+    "format": "bestaudio[ext=webm]/best",
+    "noplaylist": True,
+    "continuedl": True,
+    "progress_hooks": [_on_download_progress],
+    "quiet": True
+}
 
 def download_video(filepath: str,
                    video_url: str,
@@ -127,6 +460,12 @@ def download_video(filepath: str,
     This function attempts to download a video from the given URL to `filepath`.
     It includes a retry mechanism for robustness and handles directory creation.
 
+    Partial downloads (`.part` files) are kept across attempts and process
+    restarts and resumed with HTTP Range requests, after checking them against
+    the expected size and container format. Failed attempts are retried with
+    exponential backoff; permanent failures (e.g. private or removed videos)
+    are not retried.
+
     Args:
         filepath (str): Full path to save the video, including filename and extension.
         video_url (str): The URL of the video to download.
@@ -135,10 +474,12 @@ def download_video(filepath: str,
         console (Optional[RichConsole]): `rich.console.Console` object for styled output.
 
     Raises:
+        PermanentDownloadError: If the video can't be downloaded at all.
         DownloadError: If download fails after all specified retries. Contains original
                        Exception object in original_exception.
     """
-    _console = console if console else RichConsole()
+    _console = console if console else output.get_console()
+    limiter = rate_limit.get_rate_limiter()
 
     success = False
     original_exception = None
@@ -148,27 +489,43 @@ def download_video(filepath: str,
             # Create the directory if it doesn't exist
             os.makedirs(os.path.join(config.DOWN_DIR, string_utils.clean_channel_name(channel_name)), exist_ok=True)
 
-            # Delete target file if exists
-            if os.path.exists(filepath):
-                os.remove(filepath)
-            
-            # Delete temp (.part) file if exists
-            if os.path.exists(filepath + '.part'):
-                os.remove(filepath + '.part')
-
-            # Download video
-            with yt_dlp.YoutubeDL({
-                "format": "bestaudio[ext=webm]/best",
-                "outtmpl": filepath,
-                "noplaylist": True,
-                "quiet": True
-            }) as ydl:
-                ydl.download(video_url) # type: ignore
+            with ydl_pool.get_pool().session("download", _DOWNLOAD_OPTIONS, outtmpl=filepath) as ydl:
+                with limiter.request(slot=False):
+                    info = ydl.extract_info(video_url, download=False) # type: ignore
+                expected_size: Optional[int] = info.get("filesize")
+                is_webm = info.get("ext") == "webm"
+
+                if _is_valid_partial(filepath, expected_size, is_webm) and expected_size is not None \
+                        and os.path.getsize(filepath) == expected_size:
+                    _console.print(f"  [bold cyan]✔ Already downloaded[/bold cyan]")
+                    success = True
+                    break
+
+                # A leftover target file is a stale or broken download
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+
+                # Keep the temp (.part) file only if it can be resumed
+                part_path = filepath + '.part'
+                if os.path.exists(part_path):
+                    if _is_valid_partial(part_path, expected_size, is_webm):
+                        _console.print(f"  [dim]↻ Resuming from {os.path.getsize(part_path)} bytes[/dim]")
+                    else:
+                        os.remove(part_path)
+
+                # Download video
+                with limiter.request():
+                    ydl.process_ie_result(info, download=True) # type: ignore
                 _console.print(f"  [bold cyan]✔ Downloaded") # type: ignore
         except Exception as e:
             original_exception = e
-            _console.print(f"  [red]✖ Error:[/red] {e}")
-            _console.print(f"    🔄 Retrying... ({trial+1}/{trial_count})")
+            _console.print(f"  [red]✖ Error:[/red] {escape(str(e))}")
+            if retry.is_permanent_error(e):
+                raise PermanentDownloadError(original_exception=e)
+            if trial < trial_count:
+                delay = retry.backoff_delay(trial)
+                _console.print(f"    🔄 Retrying in {delay:.1f}s... ({trial+1}/{trial_count})")
+                time.sleep(delay)
         else:
             success = True
             break
@@ -178,4 +535,107 @@ def download_video(filepath: str,
             f"Download failed: Max retry attempts reached. (tried {trial_count} times.)",
             reason="Download retrial reached max retrial count",
             original_exception=original_exception
-        )
\ No newline at end of file
+        )
+
+def _is_valid_partial(path: str, expected_size: Optional[int], is_webm: bool) -> bool:
+    """
+    Checks whether an existing (partial) download can be continued.
+
+    Args:
+        path (str): Path of the file.
+        expected_size (Optional[int]): Full size of the media, if known.
+        is_webm (bool): Whether the media is a WebM file.
+
+    Returns:
+        bool: True if the file exists, is not larger than expected and has the right header.
+    """
+    try:
+        size = os.path.getsize(path)
+        if size == 0 or (expected_size is not None and size > expected_size):
+            return False
+        if is_webm:
+            with open(path, "rb") as f:
+                return f.read(len(_EBML_MAGIC)) == _EBML_MAGIC
+        return True
+    except OSError:
+        return False
+
+def stream_video(filepath: str,
+                 video_url: str,
+                 channel_name: str,
+                 tags: Optional[dict[str, list[str]]],
+                 trial_count: int,
+                 console: Optional[RichConsole] = None) -> Optional[str]:
+    """
+    Downloads a video's audio and remuxes it to .ogg on the fly.
+
+    The downloaded bytes are fed straight into the in-process remuxer, so the
+    tagged .ogg file is the only file written; no intermediate .webm is stored.
+
+    Args:
+        filepath (str): Full path of the .webm file a regular download would create.
+                        The .ogg file is created next to it.
+        video_url (str): The URL of the video to download.
+        channel_name (str): Channel name, used for organizing the download directory.
+        tags (Optional[dict[str, list[str]]]): Vorbis comments to write into the .ogg file.
+        trial_count (int): Maximum number of download attempts.
+        console (Optional[RichConsole]): `rich.console.Console` object for styled output.
+
+    Returns:
+        Optional[str]: Path of the .ogg file, or None if the video's format can't be
+                       streamed (the caller should fall back to a regular download).
+
+    Raises:
+        PermanentDownloadError: If the video can't be downloaded at all.
+        DownloadError: If download fails after all specified retries. Contains original
+                       Exception object in original_exception.
+    """
+    _console = console if console else output.get_console()
+
+    ogg_path = re.sub(r"\.webm$", ".ogg", filepath, flags=re.IGNORECASE)
+    limiter = rate_limit.get_rate_limiter()
+    original_exception = None
+
+    for trial in range(0, trial_count+1):
+        try:
+            # Create the directory if it doesn't exist
+            os.makedirs(os.path.join(config.DOWN_DIR, string_utils.clean_channel_name(channel_name)), exist_ok=True)
+
+            # Resolve the direct media URL of the audio format
+            with ydl_pool.get_pool().session("stream", _STREAM_OPTIONS) as ydl:
+                with limiter.request(slot=False):
+                    info = ydl.extract_info(video_url, download=False) # type: ignore
+
+            # Fragmented (DASH/HLS) or non-WebM formats need the regular download path
+            if info.get("protocol") not in ("http", "https") or info.get("ext") != "webm" or not info.get("url"):
+                return None
+
+            stream = http.RangeStream(info["url"],
+                                      headers=info.get("http_headers"),
+                                      size=info.get("filesize"),
+                                      limiter=limiter)
+            with limiter.request(), io.BufferedReader(stream, buffer_size=1 << 16) as reader:
+                started_at = time.perf_counter()
+                remux.remux_webm_to_ogg(reader, ogg_path, tags)
+            # Includes the remux, which runs at the pace of the download
+            _record_transfer(stream.pos, time.perf_counter() - started_at, "stream")
+            _console.print(f"  [bold cyan]✔ Downloaded and converted to OGG[/bold cyan]")
+            return ogg_path
+        except (RemuxError, RangeNotSupportedError) as e:
+            _console.print(f"  [yellow]⚠ Can't stream this format, downloading instead:[/yellow] {escape(str(e))}")
+            return None
+        except Exception as e:
+            original_exception = e
+            _console.print(f"  [red]✖ Error:[/red] {escape(str(e))}")
+            if retry.is_permanent_error(e):
+                raise PermanentDownloadError(original_exception=e)
+            if trial < trial_count:
+                delay = retry.backoff_delay(trial)
+                _console.print(f"    🔄 Retrying in {delay:.1f}s... ({trial+1}/{trial_count})")
+                time.sleep(delay)
+
+    raise DownloadError(
+        f"Download failed: Max retry attempts reached. (tried {trial_count} times.)",
+        reason="Download retrial reached max retrial count",
+        original_exception=original_exception
+    )
@@ -0,0 +1,150 @@
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from rich.console import Console as RichConsole
+
+import src.config as config
+import src.util.output as output
+from src.db.db_manager import DatabaseManager
+
+# Stages of a video job, in order
+LISTED = "listed"         # Seen in a playlist, nothing done yet
+DOWNLOADED = "downloaded" # .webm file complete on disk
+REMUXED = "remuxed"       # .ogg file complete, tags not written yet
+TAGGED = "tagged"         # Tagged .ogg file complete
+RECORDED = "recorded"     # Saved to the videos table
+
+STAGES = (LISTED, DOWNLOADED, REMUXED, TAGGED, RECORDED)
+
+def reached(stage: str, target: str) -> bool:
+    """
+    Checks whether `stage` is `target` or a later stage.
+    """
+    return STAGES.index(stage) >= STAGES.index(target)
+
+class JobJournal:
+    """
+    Crash-safe record of how far each video got through the pipeline.
+
+    Every completed stage is written to the DB together with the path and size
+    of the file it produced, so an interrupted run can resume each video from
+    its last completed stage instead of downloading it again.
+    """
+    def __init__(self,
+                 db_manager: DatabaseManager,
+                 console: Optional[RichConsole] = None) -> None:
+        self._db_manager = db_manager
+        self._console = console if console else output.get_console()
+
+    def add(self, jobs: List[Tuple[str, str]]) -> None:
+        """
+        Registers listed videos that aren't journaled yet.
+
+        Args:
+            jobs (List[Tuple[str, str]]): (video_id, filepath) tuples.
+        """
+        self._db_manager.add_video_jobs(jobs)
+
+    def mark(self, video_id: str, stage: str, filepath: str) -> None:
+        """
+        Records that a video completed `stage`, producing `filepath`.
+
+        Args:
+            video_id (str): Video ID.
+            stage (str): One of `STAGES`.
+            filepath (str): Path of the file produced by the stage.
+        """
+        try:
+            file_size: Optional[int] = os.path.getsize(filepath)
+        except OSError:
+            file_size = None
+        # RECORDED must not be committed before the videos row it stands for, which may
+        # still wait in the batched write queue; both are committed in the same transaction
+        self._db_manager.save_video_job_stage(video_id, stage, filepath, file_size, queued=stage == RECORDED)
+
+    def resume_points(self, video_ids: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """
+        Looks up where interrupted videos can be resumed.
+
+        A stage only counts if the file it produced is still on disk with the
+        recorded size; otherwise the video starts over.
+
+        Args:
+            video_ids (Iterable[str]): Video IDs to lookup.
+
+        Returns:
+            Dict[str, Tuple[str, str]]: Maps video_id to (stage, filepath) for videos
+                                        past the `listed` stage.
+        """
+        result: Dict[str, Tuple[str, str]] = {}
+        for video_id, job in self._db_manager.get_video_jobs_many(video_ids).items():
+            stage = job["stage"]
+            if stage not in STAGES or stage == LISTED:
+                continue
+            if _file_size(job["filepath"]) != job["file_size"]:
+                continue
+            result[video_id] = (stage, job["filepath"])
+        return result
+
+    def collect_garbage(self,
+                        report_unfinished: bool = True,
+                        min_age: float = config.JOURNAL_GC_MIN_AGE) -> None:
+        """
+        Removes intermediates left behind by interrupted runs.
+
+        Unfinished remux output (`.ogg.part`) can't be resumed and is deleted;
+        a `.webm` file is deleted once its `.ogg` file is complete. Partial
+        downloads (`.webm.part`) are kept so that they can be resumed.
+        Journal entries of recorded videos are removed.
+
+        Another process (e.g. a cron run overlapping a `watch` process) may be
+        working on the same files, so only files untouched for `min_age`
+        seconds are deleted.
+
+        Args:
+            report_unfinished (bool): Print the number of videos left unfinished.
+            min_age (float): Minimum age of an intermediate file, by its mtime, in seconds.
+        """
+        jobs = self._db_manager.get_video_jobs()
+        downloaded = self._db_manager.is_downloaded_many(jobs)
+
+        finished: List[str] = []
+        removed = 0
+        cutoff = time.time() - min_age
+        for video_id, job in jobs.items():
+            stage = job["stage"] if job["stage"] in STAGES else LISTED
+            base = os.path.splitext(job["filepath"] or "")[0]
+            if not base:
+                continue
+
+            orphans = [base + ".ogg.part"]
+            if reached(stage, REMUXED):
+                orphans.append(base + ".webm")
+            for path in orphans:
+                try:
+                    if os.path.getmtime(path) > cutoff:
+                        continue
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    continue
+
+            if stage == RECORDED and downloaded[video_id]:
+                finished.append(video_id)
+
+        self._db_manager.delete_video_jobs(finished)
+
+        unfinished = len(jobs) - len(finished)
+        if removed:
+            self._console.print(f"[dim]🧹 Removed {removed} leftover intermediate files[/dim]")
+        if unfinished and report_unfinished:
+            self._console.print(f"[bold yellow]➜ {unfinished} unfinished videos from previous runs[/bold yellow]")
+
+def _file_size(path: Optional[str]) -> Optional[int]:
+    if not path:
+        return None
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from rich.console import Console as RichConsole
+from rich.markup import escape
+
+import src.config as config
+import src.downloader.channel as channel
+import src.util.output as output
+from src.db.db_manager import DatabaseManager
+from src.exceptions import ChannelError, NoProfileImageError, UnsupportedFileTypeError
+
+class ChannelProfileCache:
+    """
+    Resolves channel handles to local profile image paths.
+
+    Lookups are cached in memory for the lifetime of the instance. Lookups that
+    can't succeed (e.g. a channel without an avatar) are recorded in the DB and
+    not retried until `failure_ttl` seconds have passed. Other failures (e.g.
+    timeouts or rate limiting) are only remembered in memory, for
+    `transient_failure_ttl` seconds. When several workers ask
+    for the same channel at once, only one of them fetches it while the others
+    wait for its result.
+    """
+    def __init__(self,
+                 db_manager: DatabaseManager,
+                 failure_ttl: float = config.PROFILE_FAILURE_TTL,
+                 transient_failure_ttl: float = config.PROFILE_TRANSIENT_FAILURE_TTL,
+                 console: Optional[RichConsole] = None) -> None:
+        self._db_manager = db_manager
+        self._failure_ttl = failure_ttl
+        self._transient_failure_ttl = transient_failure_ttl
+        self._console = console if console else output.get_console()
+
+        self._lock = threading.Lock()
+        self._paths: Dict[str, str] = {}
+        self._failures: Dict[str, float] = {} # channel_handle -> time of the next retry
+        self._in_flight: Dict[str, threading.Event] = {}
+
+    def get_image_path(self, channel_handle: Optional[str]) -> Optional[str]:
+        """
+        Returns the local profile image path of a channel, fetching it if needed.
+
+        Args:
+            channel_handle (Optional[str]): The unique handle of the channel (e.g., "@username").
+
+        Returns:
+            Optional[str]: Path of the profile image, or None if the channel has none
+                           or the lookup recently failed.
+        """
+        if not channel_handle:
+            return None
+
+        while True:
+            with self._lock:
+                if channel_handle in self._paths:
+                    return self._paths[channel_handle]
+                retry_at = self._failures.get(channel_handle)
+                if retry_at is not None and time.time() < retry_at:
+                    return None
+
+                event = self._in_flight.get(channel_handle)
+                if event is None:
+                    # This thread fetches; others wait on the event
+                    event = threading.Event()
+                    self._in_flight[channel_handle] = event
+                    break
+            event.wait()
+
+        try:
+            path, retry_at = self._resolve(channel_handle)
+            with self._lock:
+                if path:
+                    self._paths[channel_handle] = path
+                    self._failures.pop(channel_handle, None)
+                elif retry_at is not None:
+                    self._failures[channel_handle] = retry_at
+            return path
+        finally:
+            with self._lock:
+                del self._in_flight[channel_handle]
+            event.set()
+
+    def _resolve(self, channel_handle: str) -> tuple[Optional[str], Optional[float]]:
+        """
+        Looks the channel up in the DB and fetches its profile image if needed.
+
+        Returns:
+            tuple: (image path, None) on success, (None, time of the next retry) on failure.
+        """
+        image_filename = self._db_manager.get_channel_image_filename(channel_handle)
+        if image_filename:
+            return os.path.join(config.ICON_DIR, image_filename), None
+
+        failed_at = self._db_manager.get_channel_profile_failure(channel_handle)
+        if failed_at is not None and time.time() - failed_at < self._failure_ttl:
+            return None, failed_at + self._failure_ttl
+
+        try:
+            profile_image_url = channel.get_channel_profile_url(channel_handle, console=self._console)
+            path = channel.download_channel_profile_image(channel_handle=channel_handle,
+                                                          url=profile_image_url,
+                                                          db_manager=self._db_manager,
+                                                          console=self._console)
+            return path, None
+        except ChannelError as e:
+            failed_at = time.time()
+            if not _is_definitive(e):
+                self._console.print(f"  [yellow]⚠ Couldn't get channel profile for {channel_handle}, "
+                                    f"retrying in {self._transient_failure_ttl / 60:g}m:[/yellow] {escape(str(e))}")
+                return None, failed_at + self._transient_failure_ttl
+            self._console.print(f"  [yellow]⚠ No channel profile for {channel_handle}, "
+                                f"not retrying for {self._failure_ttl / 3600:g}h[/yellow]")
+            self._db_manager.save_channel_profile_failure(channel_handle, failed_at, e.reason)
+            return None, failed_at + self._failure_ttl
+
+def _is_definitive(error: ChannelError) -> bool:
+    # Lookup and download errors wrap the actual cause; only a missing avatar
+    # or an unusable image would fail again on retry
+    cause = getattr(error, "original_exception", error)
+    return isinstance(error, NoProfileImageError) or isinstance(cause, (NoProfileImageError, UnsupportedFileTypeError))
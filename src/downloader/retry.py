@@ -0,0 +1,72 @@
+import random
+import re
+from typing import Optional
+
+import src.config as config
+
+# Starts of yt-dlp error messages (without the "[extractor] id: " prefix) for
+# videos that will never download
+_PERMANENT_ERROR_PREFIXES = (
+    "private video",
+    "this video is private",
+    "video unavailable",
+    "this video has been removed",
+    "this video is not available",
+    "this video is no longer available",
+    "this video contains content from", # Blocked on copyright grounds
+    "the uploader has not made this video available",
+    "this video is only available to",  # e.g. members or Music Premium
+    "join this channel to get access",
+    "sign in to confirm your age",
+    "unsupported url",
+)
+# YouTube's rate limiting reuses the "Video unavailable" wording
+_TRANSIENT_ERROR_MARKERS = ("try again later",)
+# "ERROR: [youtube] dQw4w9WgXcQ: " in front of the message of an extractor error
+_ERROR_PREFIX = re.compile(r"^(?:ERROR:\s*)?(?:\[[^\]]+\]\s*(?:[\w-]+:\s*)?)?")
+
+def backoff_delay(attempt: int,
+                  base: float = config.RETRY_BACKOFF_BASE,
+                  cap: float = config.RETRY_BACKOFF_MAX) -> float:
+    """
+    Returns the delay before a retry, using exponential backoff with full jitter.
+
+    Args:
+        attempt (int): 0-based number of the failed attempt.
+        base (float): Delay ceiling of the first retry in seconds.
+        cap (float): Maximum delay in seconds.
+
+    Returns:
+        float: Seconds to wait.
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def is_permanent_error(error: Optional[BaseException]) -> bool:
+    """
+    Checks whether a download error can't be fixed by retrying (e.g. a private or removed video).
+
+    Args:
+        error (Optional[BaseException]): The error raised by the download attempt.
+
+    Returns:
+        bool: True if retrying is pointless.
+    """
+    if error is None:
+        return False
+
+    # yt-dlp wraps the extractor's error in a DownloadError
+    cause = error
+    exc_info = getattr(error, "exc_info", None)
+    if exc_info and isinstance(exc_info[1], BaseException):
+        cause = exc_info[1]
+
+    # Imported lazily; normally already loaded by the failed download attempt
+    from yt_dlp.utils import GeoRestrictedError, UnsupportedError
+    if isinstance(cause, (UnsupportedError, GeoRestrictedError)):
+        return True
+
+    message = getattr(cause, "orig_msg", None) or _ERROR_PREFIX.sub("", str(cause), count=1)
+    message = message.strip().lower()
+    if any(marker in message for marker in _TRANSIENT_ERROR_MARKERS):
+        return False
+    return message.startswith(_PERMANENT_ERROR_PREFIXES)
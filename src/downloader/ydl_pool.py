@@ -0,0 +1,104 @@
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    import yt_dlp # type: ignore
+
+_pool: Optional["YoutubeDLPool"] = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> "YoutubeDLPool":
+    """
+    Returns the process-wide `YoutubeDLPool`.
+
+    Returns:
+        YoutubeDLPool: Shared pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = YoutubeDLPool()
+        return _pool
+
+class YoutubeDLPool:
+    """
+    Pool of initialized `yt_dlp.YoutubeDL` instances, grouped by option profile.
+
+    Creating a YoutubeDL parses its options, sets up the extractor registry
+    and builds cookie and HTTP handlers, so instances are reused across
+    videos instead. A YoutubeDL isn't thread-safe; each instance is lent to
+    one caller at a time, so the pool grows to one instance per concurrent
+    worker and profile.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._idle: Dict[str, List["yt_dlp.YoutubeDL"]] = {}
+        self._created: List["yt_dlp.YoutubeDL"] = []
+
+    def acquire(self, profile: str, options: Dict[str, Any], outtmpl: Optional[str] = None) -> "yt_dlp.YoutubeDL":
+        """
+        Takes an idle instance of a profile out of the pool, creating one if there is none.
+
+        Args:
+            profile (str): Name of the option profile.
+            options (Dict[str, Any]): yt-dlp options of the profile, used when creating an instance.
+                                      All callers must pass the same options for a profile.
+            outtmpl (Optional[str]): Output template for this call.
+
+        Returns:
+            yt_dlp.YoutubeDL: The instance. Return it with `release()`.
+        """
+        ydl = None
+        with self._lock:
+            idle = self._idle.get(profile)
+            if idle:
+                ydl = idle.pop()
+
+        if ydl is None:
+            import yt_dlp # type: ignore # Slow to import; only needed once YouTube is accessed
+            ydl = yt_dlp.YoutubeDL(dict(options))
+            with self._lock:
+                self._created.append(ydl)
+
+        if outtmpl:
+            ydl.params["outtmpl"]["default"] = outtmpl
+        return ydl
+
+    def release(self, profile: str, ydl: "yt_dlp.YoutubeDL") -> None:
+        """
+        Returns an instance taken with `acquire()` to the pool.
+
+        Args:
+            profile (str): Name of the option profile it was acquired with.
+            ydl (yt_dlp.YoutubeDL): The instance.
+        """
+        with self._lock:
+            self._idle.setdefault(profile, []).append(ydl)
+
+    @contextmanager
+    def session(self, profile: str, options: Dict[str, Any], outtmpl: Optional[str] = None) -> Iterator["yt_dlp.YoutubeDL"]:
+        """
+        Lends an instance of a profile for the duration of the block.
+
+        Args:
+            profile (str): Name of the option profile.
+            options (Dict[str, Any]): yt-dlp options of the profile.
+            outtmpl (Optional[str]): Output template for this call.
+        """
+        ydl = self.acquire(profile, options, outtmpl)
+        try:
+            yield ydl
+        finally:
+            self.release(profile, ydl)
+
+    def close(self) -> None:
+        """
+        Closes every instance created by the pool (saving cookies and closing connections).
+        """
+        with self._lock:
+            created = self._created
+            self._created = []
+            self._idle.clear()
+        for ydl in created:
+            ydl.close()
@@ -14,6 +14,23 @@ class DownloadError(YPDError):
         self.reason = reason
         self.original_exception = original_exception
 
+class PermanentDownloadError(DownloadError):
+    """Download can't succeed by retrying (e.g. private or removed video)."""
+    def __init__(self,
+                 message: str = "Video is not downloadable.",
+                 reason: Optional[str] = "Permanent download error",
+                 original_exception: Optional[Exception] = None) -> None:
+        super().__init__(message, reason=reason, original_exception=original_exception)
+
+class RangeNotSupportedError(DownloadError):
+    """Server ignored a Range request, so a stream can't continue mid-file."""
+    def __init__(self,
+                 url: str,
+                 message: str = "Server does not support range requests.",
+                 reason: Optional[str] = "Range requests not supported") -> None:
+        super().__init__(message, reason=reason)
+        self.url = url
+
 class ChannelError(YPDError):
     """Error while processing channel data."""
     def __init__(self,
@@ -86,6 +103,13 @@ class ConversionMaxRetryAttemptError(ConvertError):
                  message: str = "Conversion retrial reached max retrial count.") -> None:
         super().__init__(message)
 
+class RemuxError(ConvertError):
+    """Input can't be remuxed by the in-process remuxer."""
+    def __init__(self,
+                 message: str = "Input can't be remuxed in-process.",
+                 reason: Optional[str] = "Remux error") -> None:
+        super().__init__(message, reason=reason)
+
 class UnsupportedFileTypeError(YPDError):
     """Unsupported file type"""
     def __init__(self, file_type: Optional[str], message: str = "Unsupported file type") -> None:
@@ -99,3 +123,34 @@ class PlaylistError(YPDError):
                  reason: Optional[str] = None) -> None:
         super().__init__(message)
         self.reason = reason
+
+class BatchFileError(PlaylistError):
+    """Malformed playlist batch file."""
+    def __init__(self,
+                 message: str = "Malformed batch file.",
+                 path: Optional[str] = None,
+                 line: Optional[int] = None,
+                 reason: Optional[str] = "Batch file error") -> None:
+        location = f"{path}:{line}" if line is not None else path
+        super().__init__(f"{location}: {message}" if location else message, reason=reason)
+        self.path = path
+        self.line = line
+
+class DatabaseError(YPDError):
+    """Error while accessing the database."""
+    def __init__(self,
+                 message: str = "Error occured while accessing the database.",
+                 reason: Optional[str] = None) -> None:
+        super().__init__(message)
+        self.reason = reason
+
+class SchemaVersionError(DatabaseError):
+    """Database schema is newer than this version of the app supports."""
+    def __init__(self,
+                 version: int,
+                 supported_version: int,
+                 message: str = "Database was created by a newer version of the app",
+                 reason: Optional[str] = "Unsupported schema version") -> None:
+        super().__init__(f"{message} (schema version {version}, supported up to {supported_version})", reason=reason)
+        self.version = version
+        self.supported_version = supported_version
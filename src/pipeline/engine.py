@@ -0,0 +1,205 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional
+
+import src.util.metrics as metrics
+
+# Marks the end of a stage's input. One sentinel is queued per worker.
+_SENTINEL = object()
+
+@dataclass
+class StageStats:
+    """
+    Snapshot of a pipeline stage's counters.
+    """
+    name: str
+    workers: int
+    queue_depth: int
+    queue_size: int
+    processed: int
+    dropped: int
+    busy_seconds: float
+    elapsed_seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second since the stage started."""
+        return self.processed / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+class Stage:
+    """
+    A single pipeline step with its own worker threads and bounded input queue.
+
+    `func` receives an item and returns the item handed to the next stage,
+    or None to drop it. Exceptions raised by `func` abort the whole pipeline;
+    recoverable errors should be handled inside `func` by returning None.
+    """
+    def __init__(self,
+                 name: str,
+                 func: Callable[[Any], Optional[Any]],
+                 workers: int = 1,
+                 queue_size: int = 1) -> None:
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.input: "queue.Queue[Any]" = queue.Queue(maxsize=self.queue_size)
+
+        self._lock = threading.Lock()
+        self._processed = 0
+        self._dropped = 0
+        self._busy_seconds = 0.0
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._remaining_workers = self.workers
+
+    def _record(self, busy: float, dropped: bool) -> None:
+        with self._lock:
+            self._busy_seconds += busy
+            if dropped:
+                self._dropped += 1
+            else:
+                self._processed += 1
+
+    def _worker_done(self) -> bool:
+        """Marks one worker as finished. Returns True for the last one."""
+        with self._lock:
+            self._remaining_workers -= 1
+            if self._remaining_workers == 0:
+                self._finished_at = time.monotonic()
+                return True
+            return False
+
+    def stats(self) -> StageStats:
+        """
+        Returns the current counters of this stage.
+
+        Returns:
+            StageStats: Queue depth, processed/dropped counts and timings.
+        """
+        with self._lock:
+            now = self._finished_at or time.monotonic()
+            elapsed = now - self._started_at if self._started_at else 0.0
+            return StageStats(name=self.name,
+                              workers=self.workers,
+                              queue_depth=self.input.qsize(),
+                              queue_size=self.queue_size,
+                              processed=self._processed,
+                              dropped=self._dropped,
+                              busy_seconds=self._busy_seconds,
+                              elapsed_seconds=elapsed)
+
+class Pipeline:
+    """
+    Runs items through a chain of stages joined by bounded queues.
+
+    Every stage works concurrently, so e.g. downloads keep streaming while
+    earlier items are converted. A full queue blocks the upstream stage,
+    which bounds the number of in-flight items (backpressure).
+
+    `on_item_done`, if given, is called from the worker threads whenever an
+    item leaves the pipeline, either through the last stage or by being dropped.
+    """
+    def __init__(self, stages: List[Stage], on_item_done: Optional[Callable[[], None]] = None) -> None:
+        if not stages:
+            raise ValueError("Pipeline requires at least one stage.")
+        self.stages = stages
+        self._on_item_done = on_item_done
+        self._results: List[Any] = []
+        self._results_lock = threading.Lock()
+        self._abort = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def run(self, items: Iterable[Any]) -> List[Any]:
+        """
+        Feeds `items` into the first stage and waits for all stages to finish.
+
+        Args:
+            items (Iterable[Any]): Items to process. Consumed lazily.
+
+        Returns:
+            List[Any]: Items returned by the last stage, in completion order.
+
+        Raises:
+            BaseException: The first exception raised by any stage function.
+        """
+        threads: List[threading.Thread] = []
+        for index, stage in enumerate(self.stages):
+            stage._started_at = time.monotonic()
+            next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            for n in range(stage.workers):
+                thread = threading.Thread(target=self._work,
+                                          args=(stage, next_stage),
+                                          name=f"{stage.name}-{n}",
+                                          daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        first = self.stages[0]
+        try:
+            for item in items:
+                if self._abort.is_set():
+                    break
+                first.input.put(item)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            for _ in range(first.workers):
+                first.input.put(_SENTINEL)
+
+        for thread in threads:
+            thread.join()
+
+        if self._error is not None:
+            raise self._error
+        return self._results
+
+    def stats(self) -> List[StageStats]:
+        """
+        Returns the current counters of every stage.
+
+        Returns:
+            List[StageStats]: One snapshot per stage, in pipeline order.
+        """
+        return [stage.stats() for stage in self.stages]
+
+    def _fail(self, error: BaseException) -> None:
+        with self._results_lock:
+            if self._error is None:
+                self._error = error
+        self._abort.set()
+
+    def _work(self, stage: Stage, next_stage: Optional[Stage]) -> None:
+        while True:
+            item = stage.input.get()
+            if item is _SENTINEL:
+                break
+            if self._abort.is_set():
+                # Keep draining so upstream puts never block forever
+                continue
+
+            started = time.monotonic()
+            try:
+                result = stage.func(item)
+            except BaseException as e:
+                stage._record(time.monotonic() - started, dropped=True)
+                self._fail(e)
+                continue
+            busy = time.monotonic() - started
+            stage._record(busy, dropped=result is None)
+            metrics.get_metrics().observe("pipeline_item_seconds", busy, stage=stage.name)
+
+            if result is not None and next_stage is not None:
+                next_stage.input.put(result)
+                continue
+            if result is not None:
+                with self._results_lock:
+                    self._results.append(result)
+            if self._on_item_done:
+                self._on_item_done()
+
+        if stage._worker_done() and next_stage is not None:
+            for _ in range(next_stage.workers):
+                next_stage.input.put(_SENTINEL)
@@ -0,0 +1,89 @@
+import csv
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.exceptions import BatchFileError
+
+_TRUE_VALUES = ("1", "true", "yes", "y", "r", "reverse")
+_FALSE_VALUES = ("", "0", "false", "no", "n")
+_INTERVAL_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+@dataclass
+class PlaylistRequest:
+    """
+    A playlist to sync, with the SMPL options it was requested with.
+    """
+    url: str
+    name: Optional[str] = None
+    reverse: bool = False
+    interval: Optional[float] = None # Seconds between polls in watch mode; None for the default
+
+def read_batch_file(path: str) -> List[PlaylistRequest]:
+    """
+    Reads playlists to sync from a batch file.
+
+    Each non-empty line is a CSV row of `url[,name[,reverse[,interval]]]`.
+    Lines starting with `#` are comments. Names containing commas must be
+    quoted. `interval` is only used in watch mode, e.g. `900`, `15m` or `2h`.
+
+    Example:
+        # url, name, reverse, interval
+        https://www.youtube.com/playlist?list=PL...,"My playlist",yes,1h
+        https://www.youtube.com/playlist?list=PL...
+
+    Args:
+        path (str): Path of the batch file.
+
+    Returns:
+        List[PlaylistRequest]: Requested playlists in file order.
+
+    Raises:
+        BatchFileError: If the file can't be read or a row is malformed.
+    """
+    try:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            lines = f.readlines()
+    except OSError as e:
+        raise BatchFileError(f"Can't read batch file: {e}", path=path)
+
+    requests: List[PlaylistRequest] = []
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+
+        row = [field.strip() for field in next(csv.reader([line], skipinitialspace=True))]
+        if len(row) > 4 or not row[0]:
+            raise BatchFileError("Expected `url[,name[,reverse[,interval]]]`", path=path, line=line_no)
+
+        reverse_value = row[2].lower() if len(row) > 2 else ""
+        if reverse_value not in _TRUE_VALUES + _FALSE_VALUES:
+            raise BatchFileError(f"Invalid reverse value '{row[2]}'", path=path, line=line_no)
+
+        interval = None
+        if len(row) > 3 and row[3]:
+            interval = parse_interval(row[3])
+            if interval is None:
+                raise BatchFileError(f"Invalid interval '{row[3]}'", path=path, line=line_no)
+
+        requests.append(PlaylistRequest(url=row[0],
+                                        name=row[1] if len(row) > 1 and row[1] else None,
+                                        reverse=reverse_value in _TRUE_VALUES,
+                                        interval=interval))
+    return requests
+
+def parse_interval(value: str) -> Optional[float]:
+    """
+    Parses a polling interval like `900`, `90s`, `15m`, `2h` or `1d`.
+
+    Args:
+        value (str): Interval string.
+
+    Returns:
+        Optional[float]: Interval in seconds, or None if `value` is not a positive interval.
+    """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([smhd]?)", value.strip().lower())
+    if not match:
+        return None
+    seconds = float(match.group(1)) * _INTERVAL_UNITS[match.group(2)]
+    return seconds if seconds > 0 else None
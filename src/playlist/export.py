@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from rich.console import Console as RichConsole
+from rich.markup import escape
+
+import src.config as config
+import src.playlist.smpl as smpl
+import src.util.output as output
+from src.db.db_manager import DatabaseManager
+from src.playlist.model import Playlist, PlaylistEntry
+from src.util.fs_index import DirectoryIndex
+
+@dataclass
+class ExportResult:
+    """
+    Outcome of an export.
+    """
+    written: int = 0
+    unchanged: int = 0
+    failed: int = 0
+
+def export_playlists(db_manager: DatabaseManager,
+                     playlist_ids: Optional[Iterable[str]] = None,
+                     workers: int = config.EXPORT_WORKERS,
+                     console: Optional[RichConsole] = None) -> ExportResult:
+    """
+    Regenerates the SMPL files of synced playlists from their stored snapshots,
+    without accessing YouTube.
+
+    Playlists are exported in parallel. Files whose content didn't change are
+    not rewritten. If several playlists share an SMPL name, only the most
+    recently synced one is exported, as a sync would leave it.
+
+    Args:
+        db_manager (DatabaseManager): DB manager with the playlist snapshots.
+        playlist_ids (Optional[Iterable[str]]): Playlists to export. All synced playlists by default.
+        workers (int): Number of playlists exported concurrently.
+        console (Optional[RichConsole]): `rich.console.Console` for styled output.
+
+    Returns:
+        ExportResult: Number of written, unchanged and failed SMPL files.
+    """
+    _console = console if console else output.get_console()
+
+    snapshots = db_manager.get_playlist_snapshots()
+    if playlist_ids is not None:
+        wanted = set(playlist_ids)
+        missing = wanted - {snapshot["playlist_id"] for snapshot in snapshots}
+        for playlist_id in sorted(missing):
+            _console.print(f"[yellow]⚠ Playlist was never synced:[/yellow] {playlist_id}")
+        snapshots = [snapshot for snapshot in snapshots if snapshot["playlist_id"] in wanted]
+
+    # One export per SMPL file; parallel writes to the same file would race
+    by_path: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        path = smpl.get_smpl_path(snapshot["smpl_name"])
+        if path not in by_path or (snapshot["fetched_at"] or 0) > (by_path[path]["fetched_at"] or 0):
+            by_path[path] = snapshot
+
+    _console.print(f"[bold blue]➜ Exporting {len(by_path)} playlists[/bold blue]")
+
+    # Shared, so every channel directory is read once for all playlists
+    fs_index = DirectoryIndex(config.DOWN_DIR, cache_path=config.FS_INDEX_PATH)
+
+    def export_one(snapshot: Dict[str, Any]) -> bool:
+        playlist = Playlist(id=snapshot["playlist_id"],
+                            title=snapshot["title"],
+                            entries=[PlaylistEntry(id=video_id, url=f"https://www.youtube.com/watch?v={video_id}", title="")
+                                     for video_id, _ in snapshot["entries"]])
+        # Videos downloaded for other playlists since the last sync are included too
+        return smpl.generate_smpl(playlist, snapshot["smpl_name"], db_manager, snapshot["reverse"],
+                                  fs_index=fs_index, console=_console)
+
+    result = ExportResult()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(export_one, snapshot): snapshot for snapshot in by_path.values()}
+        for future in as_completed(futures):
+            try:
+                written = future.result()
+            except Exception as e:
+                result.failed += 1
+                _console.print(f"[red]✖ Failed to export {escape(futures[future]['smpl_name'])}:[/red] {escape(str(e))}")
+                continue
+            if written:
+                result.written += 1
+            else:
+                result.unchanged += 1
+
+    fs_index.save()
+    return result
@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+@dataclass(slots=True)
+class PlaylistEntry:
+    """
+    A single playlist entry with only the fields the app uses.
+    """
+    id: str
+    url: str
+    title: str
+    uploader: Optional[str] = None
+    uploader_id: Optional[str] = None
+
+    @classmethod
+    def from_info(cls, info: Optional[dict[str, Any]]) -> Optional["PlaylistEntry"]:
+        """
+        Builds an entry from a flat yt-dlp playlist entry.
+
+        Args:
+            info (Optional[dict[str, Any]]): yt-dlp entry dict.
+
+        Returns:
+            Optional[PlaylistEntry]: The entry, or None for empty or faulty entries.
+        """
+        if not info or not info.get("id"):
+            return None
+        video_id = info["id"]
+        return cls(id=video_id,
+                   url=info.get("url") or f"https://www.youtube.com/watch?v={video_id}",
+                   title=info.get("title") or "",
+                   uploader=info.get("uploader"),
+                   uploader_id=info.get("uploader_id"))
+
+@dataclass(slots=True)
+class Playlist:
+    """
+    A YouTube playlist.
+
+    `entries` is a list, or a one-shot iterator while a lazy listing is still
+    streaming.
+    """
+    id: Optional[str]
+    title: Optional[str]
+    entries: Iterable[PlaylistEntry]
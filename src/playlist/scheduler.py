@@ -0,0 +1,94 @@
+import heapq
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from rich.console import Console as RichConsole
+from rich.markup import escape
+
+import src.config as config
+import src.util.output as output
+from src.playlist.batch import PlaylistRequest
+
+class SyncScheduler:
+    """
+    Polls playlists on per-playlist intervals.
+
+    First polls are staggered evenly across each playlist's interval, so a
+    large set of playlists doesn't poll in one burst. Later polls keep to
+    their schedule (a slow sync doesn't shift the following ones); playlists
+    that are due at the same time are synced together, so their shared
+    videos are downloaded once.
+    """
+    def __init__(self,
+                 requests: List[PlaylistRequest],
+                 sync: Callable[[List[PlaylistRequest]], None],
+                 default_interval: float = config.WATCH_INTERVAL,
+                 console: Optional[RichConsole] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Optional[Callable[[float], object]] = None) -> None:
+        """
+        Args:
+            requests (List[PlaylistRequest]): Playlists to poll.
+            sync (Callable[[List[PlaylistRequest]], None]): Syncs the given due playlists.
+            default_interval (float): Seconds between polls of playlists without an interval.
+            console (Optional[RichConsole]): `rich.console.Console` for styled output.
+            clock (Callable[[], float]): Monotonic clock in seconds.
+            sleep (Optional[Callable[[float], object]]): Waits the given seconds. Defaults to
+                                                        waiting until the timeout or `stop()`.
+        """
+        self._sync = sync
+        self._default_interval = default_interval
+        self._console = console if console else output.get_console()
+        self._stop = threading.Event()
+        self._clock = clock
+        self._sleep = sleep if sleep else self._stop.wait
+
+        # (due time, insertion order, request)
+        self._queue: List[Tuple[float, int, PlaylistRequest]] = []
+        now = self._clock()
+        for i, request in enumerate(requests):
+            offset = self._interval(request) * i / len(requests)
+            heapq.heappush(self._queue, (now + offset, i, request))
+
+    def _interval(self, request: PlaylistRequest) -> float:
+        return request.interval or self._default_interval
+
+    def stop(self) -> None:
+        """
+        Makes `run()` return after the current sync.
+        """
+        self._stop.set()
+
+    def run(self) -> None:
+        """
+        Runs the polling loop until `stop()` is called.
+
+        A failed sync is reported and retried at the playlist's next poll.
+        """
+        while self._queue and not self._stop.is_set():
+            due_at = self._queue[0][0]
+            self._sleep(max(0.0, due_at - self._clock()))
+            if self._stop.is_set():
+                break
+
+            now = self._clock()
+            due: List[Tuple[float, int, PlaylistRequest]] = []
+            while self._queue and self._queue[0][0] <= now:
+                due.append(heapq.heappop(self._queue))
+
+            try:
+                self._sync([request for _, _, request in due])
+            except Exception as e:
+                self._console.print(f"[red]✖ Sync failed:[/red] {escape(str(e))}")
+
+            now = self._clock()
+            for due_at, order, request in due:
+                # Keep the schedule; skip polls that were missed during a long sync
+                interval = self._interval(request)
+                next_at = due_at + interval
+                if next_at <= now:
+                    next_at += ((now - next_at) // interval + 1) * interval
+                heapq.heappush(self._queue, (next_at, order, request))
+
+            self._console.print(f"[dim]⏲ Next poll in {max(0.0, self._queue[0][0] - now):.0f}s[/dim]")
@@ -1,19 +1,38 @@
+import hashlib
 import os
 import json
 from typing import Any, Optional
 
 from rich.console import Console as RichConsole
+from rich.markup import escape
 
 import src.config as config
+import src.util.metrics as metrics
+import src.util.output as output
 import src.util.string_utils as string_utils
 from src.db.db_manager import DatabaseManager
+from src.playlist.model import Playlist
+from src.util.fs_index import DirectoryIndex
 
+def get_smpl_path(playlist_name: str) -> str:
+    """
+    Returns the path of the SMPL file for a playlist name.
+
+    Args:
+        playlist_name (str): SMPL playlist name.
 
-def generate_smpl(playlist_info: dict[str, Any],
+    Returns:
+        str: Full path to the .smpl file.
+    """
+    return os.path.join(config.SMPL_DIR, f"{string_utils.clean_filename(playlist_name)}.smpl")
+
+@metrics.timed("smpl_write_seconds")
+def generate_smpl(playlist: Playlist,
                   playlist_name: str,
                   db_manager: DatabaseManager,
                   reverse: bool = False,
-                  console: Optional[RichConsole] = None):
+                  fs_index: Optional[DirectoryIndex] = None,
+                  console: Optional[RichConsole] = None) -> bool:
     """
     Generates an SMPL playlist file for a YouTube playlist.
 
@@ -21,29 +40,35 @@ def generate_smpl(playlist_info: dict[str, Any],
     and creates an SMPL playlist file with local audio paths.
     Playlist order can be reversed.
 
+    The file is only written if its content changed, to spare the (phone-synced)
+    storage needless writes.
+
     Args:
-        playlist_info (dict[str, Any]): YouTube playlist details from yt-dlp.
+        playlist (Playlist): YouTube playlist.
         playlist_name (str): Desired name for the .m3u playlist file.
         db_manager (DatabaseManager): DB manager to check downloaded video info.
         reverse (bool): If True, playlist entries are reversed (newest first). Defaults to False.
+        fs_index (Optional[DirectoryIndex]): Index of the download directory, shared by several
+                                             calls. The caller saves it. By default one is loaded
+                                             and saved for this call.
         console (Optional[RichConsole]): `rich.console.Console` for styled output.
 
     Returns:
-        None: Generates a file; does not return a value.
+        bool: True if the file was written, False if it was already up to date.
     """
-    _console = console if console else RichConsole()
+    _console = console if console else output.get_console()
                   
+    entries = list(playlist.entries)
+    video_infos = db_manager.get_video_info_many(entry.id for entry in entries)
+    _fs_index = fs_index if fs_index else DirectoryIndex(config.DOWN_DIR, cache_path=config.FS_INDEX_PATH)
+
     videos: list[dict[str, Any]] = []
-    for entry in playlist_info["entries"]:
-        if not entry:
-            continue
-        video_id = entry["id"]
-        db_info = db_manager.get_video_info(video_id)
+    for entry in entries:
+        db_info = video_infos.get(entry.id)
         
         if db_info:
-            is_video_exist = os.path.exists(os.path.join(config.DOWN_DIR,
-                                                         string_utils.clean_channel_name(db_info['channel_name']),
-                                                         db_info['filename']))
+            is_video_exist = _fs_index.contains(string_utils.clean_channel_name(db_info['channel_name']),
+                                               db_info['filename'])
             if is_video_exist:
                 videos.append({
                     "artist": db_info["channel_name"],
@@ -66,8 +91,39 @@ def generate_smpl(playlist_info: dict[str, Any],
         "version": 1
     }
 
-    smpl_path = os.path.join(config.SMPL_DIR, f"{string_utils.clean_filename(playlist_name)}.smpl")
-    with open(smpl_path, "w", encoding="utf-8") as f:
-        json.dump(smpl_data, f, ensure_ascii=False, separators=(",", ":"))
+    if not fs_index:
+        _fs_index.save()
+
+    smpl_path = get_smpl_path(playlist_name)
+    content = json.dumps(smpl_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if not _write_if_changed(smpl_path, content):
+        _console.print(f"[dim]⏭ SMPL unchanged: {escape(smpl_path)}[/dim]")
+        return False
+
+    _console.print(f"[bold green]✔ SMPL saved:[/bold green] {escape(smpl_path)}")
+    return True
+
+def _write_if_changed(path: str, content: bytes) -> bool:
+    """
+    Writes `content` to `path` unless the file already has exactly this content.
+
+    Args:
+        path (str): File path.
+        content (bytes): New file content.
+
+    Returns:
+        bool: True if the file was written.
+    """
+    try:
+        # A different size means different content; only read the file if the sizes match
+        if os.path.getsize(path) == len(content):
+            with open(path, "rb") as f:
+                if hashlib.sha256(f.read()).digest() == hashlib.sha256(content).digest():
+                    return False
+    except FileNotFoundError:
+        pass
 
-    _console.print(f"[bold green]✔ SMPL saved:[/bold green] {smpl_path}")
\ No newline at end of file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+    return True
\ No newline at end of file
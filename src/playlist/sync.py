@@ -0,0 +1,45 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+@dataclass
+class PlaylistDiff:
+    """
+    Difference between the stored and the freshly fetched playlist membership.
+    """
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    reordered: bool = False
+    first_sync: bool = False
+
+    @property
+    def changed(self) -> bool:
+        """True if membership or order changed since the last sync."""
+        return self.first_sync or bool(self.added) or bool(self.removed) or self.reordered
+
+def diff_playlist(previous: Optional[List[str]], current: List[str]) -> PlaylistDiff:
+    """
+    Compares two playlist memberships.
+
+    Args:
+        previous (Optional[List[str]]): Video IDs of the stored snapshot in playlist
+                                        order, or None if the playlist was never synced.
+        current (List[str]): Video IDs of the fetched playlist in playlist order.
+
+    Returns:
+        PlaylistDiff: Added and removed video IDs (in playlist order) and whether
+                      the relative order of the remaining videos changed.
+    """
+    if previous is None:
+        return PlaylistDiff(added=list(dict.fromkeys(current)), first_sync=True)
+
+    previous_ids = set(previous)
+    current_ids = set(current)
+
+    added = [video_id for video_id in dict.fromkeys(current) if video_id not in previous_ids]
+    removed = [video_id for video_id in dict.fromkeys(previous) if video_id not in current_ids]
+
+    # Compare the order of the videos present in both snapshots
+    kept_before = [video_id for video_id in previous if video_id in current_ids]
+    kept_after = [video_id for video_id in current if video_id in previous_ids]
+
+    return PlaylistDiff(added=added, removed=removed, reordered=kept_before != kept_after)
@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Set
+
+# Directory mtimes closer to "now" than this are not trusted, because a file
+# added within the same timestamp granularity would not change the mtime.
+_MTIME_SAFETY_NS = 2_000_000_000
+
+class DirectoryIndex:
+    """
+    In-memory index of the files below a root directory.
+
+    Each subdirectory is read with a single `os.scandir` pass the first time it
+    is queried, so existence checks cost one directory read per subdirectory
+    instead of one `stat` per file.
+
+    If `cache_path` is given, listings are persisted together with the
+    directory mtime. On the next run a directory is only rescanned if its
+    mtime changed, which costs one `stat` per directory.
+    """
+    def __init__(self, root: str, cache_path: Optional[str] = None) -> None:
+        self.root = root
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._listings: Dict[str, Set[str]] = {}
+        self._validated: Set[str] = set()
+        self._mtimes: Dict[str, Optional[int]] = {}
+        self._dirty = False
+
+        if cache_path:
+            self._load()
+
+    def contains(self, directory: str, filename: str) -> bool:
+        """
+        Checks whether `root/directory/filename` exists.
+
+        Args:
+            directory (str): Subdirectory relative to the root.
+            filename (str): File name inside the subdirectory.
+
+        Returns:
+            bool: True if the file exists, False otherwise.
+        """
+        return filename in self.listing(directory)
+
+    def listing(self, directory: str) -> Set[str]:
+        """
+        Returns the names of the entries in `root/directory`.
+
+        Args:
+            directory (str): Subdirectory relative to the root.
+
+        Returns:
+            Set[str]: Entry names. Empty if the directory does not exist.
+        """
+        with self._lock:
+            if directory in self._validated:
+                return self._listings[directory]
+
+            path = os.path.join(self.root, directory)
+            try:
+                mtime: Optional[int] = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+
+            if mtime is None:
+                files: Set[str] = set()
+            elif directory in self._listings and self._mtimes.get(directory) == mtime:
+                files = self._listings[directory]
+            else:
+                files = self._scan(path)
+                if time.time_ns() - mtime < _MTIME_SAFETY_NS:
+                    mtime = None # Force a rescan next time
+                self._dirty = True
+
+            self._listings[directory] = files
+            self._mtimes[directory] = mtime
+            self._validated.add(directory)
+            return files
+
+    def add(self, directory: str, filename: str) -> None:
+        """
+        Records a file created by this process without rescanning its directory.
+
+        Args:
+            directory (str): Subdirectory relative to the root.
+            filename (str): File name inside the subdirectory.
+        """
+        with self._lock:
+            if directory in self._listings:
+                self._listings[directory].add(filename)
+                self._mtimes[directory] = None
+                self._dirty = True
+
+    def save(self) -> None:
+        """
+        Persists the index to `cache_path`, if configured and changed.
+        """
+        if not self.cache_path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                directory: {"mtime": self._mtimes.get(directory), "files": sorted(files)}
+                for directory, files in self._listings.items()
+                if self._mtimes.get(directory) is not None
+            }
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+
+    def _scan(self, path: str) -> Set[str]:
+        try:
+            with os.scandir(path) as it:
+                # Avoid DirEntry.is_file(): on network mounts it may cost a stat per entry
+                return {entry.name for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
+            return set()
+
+    def _load(self) -> None:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f: # type: ignore
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for directory, item in data.items():
+            self._listings[directory] = set(item.get("files", []))
+            self._mtimes[directory] = item.get("mtime")
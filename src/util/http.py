@@ -0,0 +1,178 @@
+import io
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import src.config as config
+import src.downloader.retry as retry
+from src.exceptions import RangeNotSupportedError
+from src.util.rate_limit import RateLimiter
+
+if TYPE_CHECKING:
+    import requests
+
+# Transfers smaller than this finish too quickly to judge their speed
+_THROTTLE_CHECK_MIN_SIZE = 1024 * 1024
+
+_session: Optional["requests.Session"] = None
+_session_lock = threading.Lock()
+
+def get_session() -> "requests.Session":
+    """
+    Returns the process-wide `requests.Session`.
+
+    Sharing one session keeps TCP/TLS connections alive across requests
+    instead of opening a new connection for every download.
+
+    Returns:
+        requests.Session: Shared session with a connection pool.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=config.HTTP_POOL_SIZE, pool_maxsize=config.HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+class RangeStream(io.RawIOBase):
+    """
+    Read-only stream over an HTTP resource, fetched in sequential Range requests.
+
+    Fetching in bounded chunks keeps memory flat and avoids the per-connection
+    throttling that some CDNs apply to long single responses. If the
+    connection drops, the stream reconnects with a Range request starting at
+    the current offset, up to `max_resumes` times. A short read from the
+    server raises an error instead of silently truncating the stream. Other
+    errors are not retried; a server that ignores the Range header after the
+    first chunk raises `RangeNotSupportedError`.
+
+    If a `limiter` is given, rejected (HTTP 429/403) and throttled-speed
+    chunks are reported to it. Chunk requests don't take tokens themselves;
+    the caller is expected to hold a download slot for the whole stream.
+    """
+    def __init__(self,
+                 url: str,
+                 headers: Optional[Dict[str, str]] = None,
+                 size: Optional[int] = None,
+                 chunk_size: int = config.HTTP_CHUNK_SIZE,
+                 max_resumes: int = config.HTTP_RESUME_ATTEMPTS,
+                 limiter: Optional[RateLimiter] = None) -> None:
+        super().__init__()
+        self.url = url
+        self.headers = dict(headers or {})
+        self.size = size
+        self.chunk_size = chunk_size
+        self.max_resumes = max_resumes
+        self.limiter = limiter
+        self.pos = 0
+        self._response: Optional["requests.Response"] = None
+        self._chunk_start = 0
+        self._chunk_end = 0 # Exclusive end offset of the current response
+        self._chunk_opened_at = 0.0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        import requests
+        import urllib3
+        # Reading `raw` raises urllib3's errors; requests only wraps those of the request itself
+        resumable = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                     urllib3.exceptions.ProtocolError, urllib3.exceptions.ReadTimeoutError)
+        attempt = 0
+        while True:
+            try:
+                return self._readinto(buffer)
+            except resumable:
+                # Connection dropped: reconnect and continue from the current offset
+                if attempt >= self.max_resumes:
+                    raise
+                if self._response is not None:
+                    self._response.close()
+                    self._response = None
+                time.sleep(retry.backoff_delay(attempt))
+                attempt += 1
+
+    def _readinto(self, buffer: Any) -> int:
+        if self.size is not None and self.pos >= self.size:
+            return 0
+        if self._response is None or self.pos >= self._chunk_end:
+            if not self._open_chunk():
+                return 0
+
+        assert self._response is not None
+        view = memoryview(buffer).cast("B")
+        want = min(len(view), self._chunk_end - self.pos)
+        n = self._response.raw.readinto(view[:want])
+        if not n and self.size is None:
+            self.size = self.pos
+            return 0
+        if not n:
+            import requests
+            raise requests.ConnectionError(f"Connection closed at byte {self.pos} of {self.size if self.size is not None else '?'}")
+        self.pos += n
+        return n
+
+    def close(self) -> None:
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+            self._check_speed()
+        super().close()
+
+    def _open_chunk(self) -> bool:
+        """Requests the next chunk. Returns False at the end of the resource."""
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+            self._check_speed()
+
+        end = self.pos + self.chunk_size - 1
+        if self.size is not None:
+            end = min(end, self.size - 1)
+        headers = dict(self.headers)
+        headers["Range"] = f"bytes={self.pos}-{end}"
+
+        response = get_session().get(self.url, headers=headers, stream=True, timeout=config.HTTP_TIMEOUT)
+        if response.status_code == 416: # Range starts past the end
+            response.close()
+            self.size = self.pos
+            return False
+        if self.limiter and response.status_code in (429, 403):
+            self.limiter.report_throttled(f"HTTP {response.status_code}")
+        response.raise_for_status()
+
+        if response.status_code == 206:
+            content_range = response.headers.get("Content-Range", "")
+            total = content_range.rpartition("/")[2]
+            if self.size is None and total.isdigit():
+                self.size = int(total)
+            self._chunk_end = self.pos + int(response.headers.get("Content-Length", end - self.pos + 1))
+        else:
+            # Server ignored the Range header and sent the whole resource
+            if self.pos:
+                response.close()
+                raise RangeNotSupportedError(url=self.url)
+            length = response.headers.get("Content-Length")
+            self.size = int(length) if length and length.isdigit() else None
+            self._chunk_end = self.size if self.size is not None else 1 << 62
+
+        response.raw.decode_content = True
+        self._response = response
+        self._chunk_start = self.pos
+        self._chunk_opened_at = time.monotonic()
+        return True
+
+    def _check_speed(self) -> None:
+        """Reports a fully read chunk to the limiter if it arrived at a throttled speed."""
+        if not self.limiter or self.pos < self._chunk_end:
+            return
+        size = self.pos - self._chunk_start
+        elapsed = time.monotonic() - self._chunk_opened_at
+        if size >= _THROTTLE_CHECK_MIN_SIZE and elapsed > 0 and size / elapsed < config.RATE_LIMIT_THROTTLED_SPEED:
+            self.limiter.report_throttled("slow download")
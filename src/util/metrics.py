@@ -0,0 +1,274 @@
+import bisect
+import functools
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+# Upper bounds of the default histogram buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+# Upper bounds of the transfer speed buckets, in bytes per second
+SPEED_BUCKETS = tuple(float(2 ** exponent) for exponent in range(14, 28, 2)) # 16 KiB/s ... 64 MiB/s
+
+_PROMETHEUS_PREFIX = "ypd_"
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+_metrics: Optional["Metrics"] = None
+_metrics_lock = threading.Lock()
+
+def get_metrics() -> "Metrics":
+    """
+    Returns the process-wide `Metrics` registry.
+
+    Returns:
+        Metrics: Shared registry.
+    """
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+        return _metrics
+
+def timed(name: str, **labels: str) -> Callable[[_F], _F]:
+    """
+    Decorator that records the duration of every call in the histogram `name`,
+    labelled with the function's name as `call`.
+
+    Args:
+        name (str): Histogram name.
+        **labels (str): Additional labels.
+    """
+    def decorator(func: _F) -> _F:
+        call_labels = {"call": func.__name__, **labels}
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with get_metrics().timer(name, **call_labels):
+                return func(*args, **kwargs)
+        return wrapper # type: ignore
+    return decorator
+
+class Histogram:
+    """
+    Cumulative bucket histogram (as in Prometheus) with count, sum, min and max.
+    """
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1) # Last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile by linear interpolation within its bucket.
+
+        Args:
+            q (float): Quantile between 0 and 1.
+
+        Returns:
+            float: The estimate, clamped to the observed min and max.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(max(estimate, self.min), self.max)
+            seen += count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0, "sum": 0.0}
+        return {"count": self.count,
+                "sum": self.sum,
+                "mean": self.sum / self.count,
+                "min": self.min,
+                "max": self.max,
+                "p50": self.quantile(0.5),
+                "p95": self.quantile(0.95),
+                "p99": self.quantile(0.99)}
+
+class Metrics:
+    """
+    Thread-safe registry of counters and histograms.
+
+    Metrics are identified by name and an optional set of labels, e.g.
+    `observe("download_seconds", 1.2, mode="stream")`, and cover the whole
+    lifetime of the process (e.g. every poll in watch mode).
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[_Key, float] = {}
+        self._histograms: Dict[_Key, Histogram] = {}
+        self.started_at = time.time()
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> _Key:
+        return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """
+        Adds `value` to a counter.
+
+        Args:
+            name (str): Counter name.
+            value (float): Amount to add.
+            **labels (str): Labels of the counter.
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS, **labels: str) -> None:
+        """
+        Records a value in a histogram.
+
+        Args:
+            name (str): Histogram name.
+            value (float): Observed value.
+            buckets (Sequence[float]): Bucket upper bounds, used when the histogram is created.
+            **labels (str): Labels of the histogram.
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """
+        Records the duration of the block, in seconds, in a histogram.
+        The duration is recorded even if the block raises.
+
+        Args:
+            name (str): Histogram name.
+            **labels (str): Labels of the histogram.
+        """
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started_at, **labels)
+
+    def total(self, name: str, **labels: str) -> float:
+        """
+        Returns the sum of a counter over every label set that includes `labels`.
+
+        Args:
+            name (str): Counter name.
+            **labels (str): Labels to match.
+
+        Returns:
+            float: The sum, 0 if nothing was counted.
+        """
+        wanted = set(self._key(name, labels)[1])
+        with self._lock:
+            return sum(value for (counter_name, counter_labels), value in self._counters.items()
+                       if counter_name == name and wanted.issubset(counter_labels))
+
+    def reset(self) -> None:
+        """
+        Discards every recorded value.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns all metrics as a JSON-serializable dict.
+
+        Returns:
+            Dict[str, Any]: `counters` and `histograms`, each mapping a metric name
+                            to one entry per label set.
+        """
+        with self._lock:
+            counters: Dict[str, List[Dict[str, Any]]] = {}
+            for (name, labels), value in sorted(self._counters.items()):
+                counters.setdefault(name, []).append({"labels": dict(labels), "value": value})
+            histograms: Dict[str, List[Dict[str, Any]]] = {}
+            for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                histograms.setdefault(name, []).append({"labels": dict(labels), **histogram.summary()})
+        return {"started_at": self.started_at,
+                "uptime_seconds": time.time() - self.started_at,
+                "counters": counters,
+                "histograms": histograms}
+
+    def write_json(self, path: str) -> None:
+        """
+        Writes the summary as JSON.
+
+        Args:
+            path (str): Output file path.
+        """
+        _write_atomic(path, json.dumps(self.summary(), indent=2))
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Writes all metrics in the Prometheus text exposition format, e.g. for
+        the node_exporter textfile collector. Metric names are prefixed with `ypd_`.
+
+        Args:
+            path (str): Output file path (node_exporter reads `*.prom` files).
+        """
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted({name for name, _ in self._counters}):
+                metric = _PROMETHEUS_PREFIX + name
+                lines.append(f"# TYPE {metric} counter")
+                for (counter_name, labels), value in sorted(self._counters.items()):
+                    if counter_name == name:
+                        lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+
+            for name in sorted({name for name, _ in self._histograms}):
+                metric = _PROMETHEUS_PREFIX + name
+                lines.append(f"# TYPE {metric} histogram")
+                for (histogram_name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                    if histogram_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(list(histogram.buckets) + [math.inf], histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == math.inf else f"{bound:g}"
+                        lines.append(f"{metric}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                    lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.sum:g}")
+                    lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f"{label}=\"{value}\"" for (label, _), value in zip(labels, escaped)) + "}"
+
+def _write_atomic(path: str, content: str) -> None:
+    # Readers (e.g. node_exporter) must never see a half-written file
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False, encoding="utf-8") as f:
+        f.write(content)
+    os.chmod(f.name, 0o644) # Temp files are private (0600); exporters may run as another user
+    os.replace(f.name, path)
@@ -0,0 +1,197 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Iterator, Optional
+
+from rich.console import Console as RichConsole
+
+import src.config as config
+
+# Output modes: styled console, JSON lines, or only a final summary
+CONSOLE = "console"
+JSON = "json"
+QUIET = "quiet"
+MODES = (CONSOLE, JSON, QUIET)
+
+# Levels of JSON lines, by the markup or symbol a message starts with
+_LEVEL_MARKERS = (
+    ("error", ("[red]", "✖")),
+    ("warning", ("[yellow]", "⚠")),
+    ("debug", ("[dim]",)),
+)
+
+_console: Optional[RichConsole] = None
+_console_lock = threading.Lock()
+
+def get_console() -> RichConsole:
+    """
+    Returns the process-wide console all output goes through.
+
+    Every component prints to this console unless it is given its own, so
+    progress bars and log lines never interleave, and the output mode is
+    chosen in one place.
+
+    Returns:
+        RichConsole: Shared console for the configured output mode.
+    """
+    global _console
+    with _console_lock:
+        if _console is None:
+            _console = create_console(config.OUTPUT_MODE)
+        return _console
+
+def configure(mode: str) -> RichConsole:
+    """
+    Replaces the shared console with one for `mode`.
+    Call it before the components using the console are created.
+
+    Args:
+        mode (str): One of `MODES`.
+
+    Returns:
+        RichConsole: The new shared console.
+    """
+    global _console
+    with _console_lock:
+        _console = create_console(mode)
+        return _console
+
+def create_console(mode: str, file: Optional[IO[str]] = None) -> RichConsole:
+    """
+    Creates a console for an output mode.
+
+    Args:
+        mode (str): One of `MODES`.
+        file (Optional[IO[str]]): Output stream. Defaults to stdout.
+
+    Returns:
+        RichConsole: The console.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    if mode == CONSOLE:
+        return RichConsole(file=file)
+    if mode == JSON:
+        return JsonLinesConsole(file=file)
+    if mode == QUIET:
+        return RichConsole(file=file, quiet=True)
+    raise ValueError(f"Unknown output mode: {mode}")
+
+class JsonLinesConsole(RichConsole):
+    """
+    Console for headless runs (e.g. cron) that writes every printed message
+    as one JSON object per line, e.g.
+    `{"time": 1700000000.0, "level": "info", "message": "✔ Downloaded"}`.
+
+    Markup is converted to plain text instead of rendered, so the message reads as
+    the console would show it; user-provided text (e.g. titles) must be escaped with
+    `rich.markup.escape` like for any other console.
+    """
+    def __init__(self, file: Optional[IO[str]] = None) -> None:
+        super().__init__(file=file, color_system=None, force_terminal=False, highlight=False)
+        self._write_lock = threading.Lock()
+
+    def print(self, *objects: Any, sep: str = " ", end: str = "\n", markup: Optional[bool] = None, **kwargs: Any) -> None:
+        raw = sep.join(str(obj) for obj in objects).strip()
+        if not raw:
+            return
+        self.event(_level(raw), _plain(raw).strip() if markup is not False else raw)
+
+    def event(self, level: str, message: str, **fields: Any) -> None:
+        """
+        Writes one JSON line.
+
+        Args:
+            level (str): Severity, e.g. "info" or "error".
+            message (str): Plain-text message.
+            **fields (Any): Additional JSON-serializable fields.
+        """
+        line = json.dumps({"time": round(time.time(), 3), "level": level, "message": message, **fields},
+                          ensure_ascii=False, default=str)
+        with self._write_lock:
+            self.file.write(line + "\n")
+            self.file.flush()
+
+def _plain(raw: str) -> str:
+    from rich.errors import MarkupError
+    from rich.text import Text
+    try:
+        return Text.from_markup(raw).plain
+    except MarkupError:
+        return raw # e.g. a stray closing tag; keep the message rather than lose it
+
+def _level(raw: str) -> str:
+    for level, markers in _LEVEL_MARKERS:
+        if raw.startswith(markers):
+            return level
+    return "info"
+
+def print_summary(console: RichConsole, message: str, **fields: Any) -> None:
+    """
+    Prints the final summary of a run. Unlike other output, it is printed in quiet mode too.
+
+    Args:
+        console (RichConsole): Console of the run.
+        message (str): Summary sentence.
+        **fields (Any): Figures of the summary, e.g. `downloaded=3`.
+    """
+    details = ", ".join(f"{name.replace('_', ' ')}: {value}" for name, value in fields.items())
+    if isinstance(console, JsonLinesConsole):
+        console.event("info", message, event="summary", **fields)
+    elif console.quiet:
+        print(f"{message} ({details})" if details else message, file=console.file, flush=True)
+    else:
+        console.print(f"[bold green]✔ {message}[/bold green]" + (f" ({details})" if details else ""))
+
+class ProgressTracker:
+    """
+    Aggregate progress of a run, shown as a live progress bar.
+    Does nothing unless the console is an interactive terminal.
+    """
+    def __init__(self, progress: Any = None, task_id: Any = None) -> None:
+        self._progress = progress
+        self._task_id = task_id
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def add_total(self, count: int) -> None:
+        """Adds `count` items to the expected total."""
+        if self._progress is None or not count:
+            return
+        with self._lock:
+            self._total += count
+            self._progress.update(self._task_id, total=self._total)
+
+    def advance(self, count: int = 1) -> None:
+        """Marks `count` items as done."""
+        if self._progress is not None:
+            self._progress.advance(self._task_id, count)
+
+@contextmanager
+def progress(console: RichConsole, description: str) -> Iterator[ProgressTracker]:
+    """
+    Shows a live progress bar for the duration of the block if the console is
+    attached to a terminal. The bar is removed once the block exits.
+
+    Args:
+        console (RichConsole): Console to draw on. Other output printed to it
+                               during the block is shown above the bar.
+        description (str): Label of the bar.
+
+    Yields:
+        ProgressTracker: Tracker to report the total and finished items to.
+    """
+    if isinstance(console, JsonLinesConsole) or console.quiet or not console.is_terminal:
+        yield ProgressTracker()
+        return
+
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+    with Progress(TextColumn("[bold blue]{task.description}"),
+                  BarColumn(),
+                  MofNCompleteColumn(),
+                  TimeElapsedColumn(),
+                  console=console,
+                  transient=True) as live_progress:
+        yield ProgressTracker(live_progress, live_progress.add_task(description, total=None))
@@ -0,0 +1,86 @@
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional
+
+from rich.console import Console as RichConsole
+
+import src.config as config
+import src.util.output as output
+
+@contextmanager
+def profile(top: int = config.PROFILE_TOP,
+            output_path: Optional[str] = config.PROFILE_PATH,
+            console: Optional[RichConsole] = None) -> Iterator[None]:
+    """
+    Profiles the block with cProfile and tracemalloc, then prints the hottest
+    call sites and the largest allocation sites.
+
+    Threads started inside the block (e.g. pipeline workers) are profiled too.
+
+    Args:
+        top (int): Number of call sites and allocation sites to print.
+        output_path (Optional[str]): Where to dump the raw cProfile stats (for
+                                     e.g. snakeviz or `python -m pstats`). None to skip.
+        console (Optional[RichConsole]): `rich.console.Console` for styled output.
+    """
+    _console = console if console else output.get_console()
+
+    profilers: List[cProfile.Profile] = []
+    profilers_lock = threading.Lock()
+
+    def profile_thread(*args: Any) -> None:
+        # Runs once at the start of every new thread; swaps itself for a profiler
+        sys.setprofile(None)
+        profiler = cProfile.Profile()
+        with profilers_lock:
+            profilers.append(profiler)
+        profiler.enable()
+
+    # Since Python 3.12 one profiler covers every thread
+    per_thread = sys.version_info < (3, 12)
+
+    tracemalloc.start()
+    main_profiler = cProfile.Profile()
+    profilers.append(main_profiler)
+    if per_thread:
+        threading.setprofile(profile_thread)
+    main_profiler.enable()
+    try:
+        yield
+    finally:
+        main_profiler.disable()
+        if per_thread:
+            threading.setprofile(None) # type: ignore
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        with profilers_lock:
+            stats = pstats.Stats(*profilers, stream=io.StringIO())
+
+        _console.print(f"[bold blue]➜ Hottest call sites (by cumulative time)[/bold blue]")
+        _print_stats(stats, "cumulative", top, _console)
+        _console.print(f"[bold blue]➜ Hottest call sites (by own time)[/bold blue]")
+        _print_stats(stats, "tottime", top, _console)
+
+        _console.print(f"[bold blue]➜ Largest allocation sites[/bold blue] (peak traced memory: {peak / 1024 / 1024:.1f} MiB)")
+        for statistic in snapshot.statistics("lineno")[:top]:
+            _console.print(f"  {statistic}", markup=False, highlight=False, soft_wrap=True)
+
+        if output_path:
+            stats.dump_stats(output_path)
+            _console.print(f"[bold green]✔ Profile saved:[/bold green] {output_path}")
+
+def _print_stats(stats: pstats.Stats, sort_key: str, top: int, console: RichConsole) -> None:
+    buffer = io.StringIO()
+    stats.stream = buffer # type: ignore
+    stats.sort_stats(sort_key).print_stats(top)
+    # Skip pstats' header; keep the table
+    report = buffer.getvalue()
+    table_start = report.find("   ncalls")
+    console.print(report[table_start:] if table_start >= 0 else report, markup=False, highlight=False, soft_wrap=True)
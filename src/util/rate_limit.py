@@ -0,0 +1,182 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from rich.console import Console as RichConsole
+
+import src.config as config
+import src.util.metrics as metrics
+import src.util.output as output
+
+# Substrings of error messages that mean YouTube is throttling us
+_THROTTLE_ERROR_MARKERS = (
+    "http error 429",
+    "http error 403",
+    "429 client error",
+    "403 client error",
+    "too many requests",
+)
+
+_rate_limiter: Optional["RateLimiter"] = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> "RateLimiter":
+    """
+    Returns the process-wide `RateLimiter` shared by all YouTube requests.
+
+    Returns:
+        RateLimiter: Shared rate limiter.
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
+
+def is_throttle_error(error: Optional[BaseException]) -> bool:
+    """
+    Checks whether a request failed because YouTube is throttling us (HTTP 429/403).
+
+    Args:
+        error (Optional[BaseException]): The error raised by the request.
+
+    Returns:
+        bool: True if the error is a throttling signal.
+    """
+    if error is None:
+        return False
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None) or getattr(error, "status", None)
+    if status in (429, 403):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in _THROTTLE_ERROR_MARKERS)
+
+class RateLimiter:
+    """
+    Token bucket with an adaptive concurrency limit.
+
+    Requests take a token from a bucket refilled at `rate` tokens per second,
+    and long-running requests (e.g. downloads) also hold one of `concurrency`
+    slots. Both adapt AIMD-style: they are halved when a request is
+    throttled (HTTP 429/403 or a throttled transfer speed) and grow back
+    additively while requests succeed.
+    """
+    def __init__(self,
+                 rate: float = config.RATE_LIMIT_RATE,
+                 burst: int = config.RATE_LIMIT_BURST,
+                 min_rate: float = config.RATE_LIMIT_MIN_RATE,
+                 max_concurrency: int = config.RATE_LIMIT_MAX_CONCURRENCY,
+                 cooldown: float = config.RATE_LIMIT_COOLDOWN,
+                 console: Optional[RichConsole] = None) -> None:
+        self._console = console if console else output.get_console()
+        self._max_rate = rate
+        self._min_rate = min(min_rate, rate)
+        self._burst = max(1, burst)
+        self._max_concurrency = max(1, max_concurrency)
+        self._cooldown = cooldown
+
+        self._cond = threading.Condition()
+        self._rate = rate
+        self._limit = float(self._max_concurrency)
+        self._tokens = float(self._burst)
+        self._refilled_at = time.monotonic()
+        self._throttled_at = float("-inf")
+        self._in_flight = 0
+
+    @property
+    def rate(self) -> float:
+        """Current request rate in requests per second."""
+        return self._rate
+
+    @property
+    def concurrency(self) -> int:
+        """Current number of concurrent long-running requests allowed."""
+        return max(1, int(self._limit))
+
+    def status(self) -> str:
+        """Human-readable current rate and concurrency."""
+        return f"{self._rate:.2f} req/s, concurrency {self.concurrency}"
+
+    @contextmanager
+    def request(self, slot: bool = True) -> Iterator[None]:
+        """
+        Runs a request within the rate (and concurrency) limits.
+
+        The request succeeds if the block exits normally; throttling errors
+        raised from the block shrink the limits. Don't nest `request(slot=True)`
+        blocks in one thread, since the inner one may wait for the outer slot.
+
+        Args:
+            slot (bool): Hold a concurrency slot for the duration of the block.
+                         Use it for downloads; short API calls only need a token.
+        """
+        with metrics.get_metrics().timer("rate_limit_wait_seconds", slot=str(slot).lower()):
+            self._acquire(slot=slot)
+        try:
+            yield
+        except BaseException as e:
+            if is_throttle_error(e):
+                self.report_throttled("request rejected")
+            raise
+        else:
+            self.report_success()
+        finally:
+            if slot:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._cond.notify_all()
+
+    def report_success(self) -> None:
+        """
+        Grows the limits additively after a successful request.
+        """
+        with self._cond:
+            old_concurrency = self.concurrency
+            self._rate = min(self._max_rate, self._rate + 0.1 * self._max_rate / max(1.0, self._limit))
+            self._limit = min(float(self._max_concurrency), self._limit + 1.0 / self._limit)
+            grew = self.concurrency > old_concurrency
+            self._cond.notify_all()
+        if grew:
+            self._console.print(f"[dim]⚖ Rate limit raised: {self.status()}[/dim]")
+
+    def report_throttled(self, reason: str = "") -> None:
+        """
+        Halves the limits after a throttled request.
+
+        Throttling reported by requests that were already in flight when the
+        limits were last cut is ignored for `cooldown` seconds, so that one
+        burst of errors only halves the limits once.
+
+        Args:
+            reason (str): Short description of the throttling signal, for the log.
+        """
+        metrics.get_metrics().increment("throttle_signals_total", reason=reason)
+        with self._cond:
+            now = time.monotonic()
+            if now - self._throttled_at < self._cooldown:
+                return
+            self._throttled_at = now
+            self._rate = max(self._min_rate, self._rate / 2)
+            self._limit = max(1.0, self._limit / 2)
+            self._tokens = min(self._tokens, 0.0)
+        self._console.print(f"[yellow]⚖ Throttled{f' ({reason})' if reason else ''}, "
+                            f"slowing down: {self.status()}[/yellow]")
+
+    def _acquire(self, slot: bool) -> None:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(float(self._burst), self._tokens + (now - self._refilled_at) * self._rate)
+                self._refilled_at = now
+
+                if slot and self._in_flight >= self.concurrency:
+                    self._cond.wait()
+                    continue
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    if slot:
+                        self._in_flight += 1
+                    return
+                self._cond.wait((1 - self._tokens) / self._rate)
@@ -0,0 +1,98 @@
+import pytest
+
+import src.config as config
+import src.downloader.download_playlist as download_playlist
+import src.playlist.smpl as smpl
+import src.util.output as output
+from src.app import Application
+from src.exceptions import BatchFileError
+from src.playlist.batch import PlaylistRequest, read_batch_file
+from src.playlist.model import Playlist, PlaylistEntry
+from src.util.fs_index import DirectoryIndex
+
+def _batch_file(tmp_path, text: str) -> str:
+    path = tmp_path / "batch.txt"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+def test_comments_and_blank_lines_are_skipped(tmp_path):
+    path = _batch_file(tmp_path, "# url, name, reverse, interval\n"
+                                 "\n"
+                                 "https://example.com/a\n"
+                                 "   # indented comment\n"
+                                 "   \n"
+                                 "https://example.com/b, \"Name, with comma\", yes, 15m\n")
+    assert read_batch_file(path) == [
+        PlaylistRequest(url="https://example.com/a"),
+        PlaylistRequest(url="https://example.com/b", name="Name, with comma", reverse=True, interval=900.0),
+    ]
+
+def test_duplicate_lines_are_kept_in_file_order(tmp_path):
+    path = _batch_file(tmp_path, "https://example.com/a,First\n"
+                                 "https://example.com/b\n"
+                                 "https://example.com/a,Second,r\n")
+    assert [(request.url, request.name, request.reverse) for request in read_batch_file(path)] == [
+        ("https://example.com/a", "First", False),
+        ("https://example.com/b", None, False),
+        ("https://example.com/a", "Second", True),
+    ]
+
+@pytest.mark.parametrize("line", ["https://example.com/a,name,maybe",
+                                  "https://example.com/a,name,no,soon",
+                                  "https://example.com/a,name,no,1h,extra",
+                                  ",name"])
+def test_malformed_row_reports_its_line(tmp_path, line):
+    path = _batch_file(tmp_path, f"# header\n{line}\n")
+    with pytest.raises(BatchFileError) as excinfo:
+        read_batch_file(path)
+    assert excinfo.value.line == 2
+
+def test_missing_file_raises_batch_file_error(tmp_path):
+    with pytest.raises(BatchFileError):
+        read_batch_file(str(tmp_path / "missing.txt"))
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.setattr(config, "DOWN_DIR", str(tmp_path / "Downloads"))
+    monkeypatch.setattr(config, "SMPL_DIR", str(tmp_path / "Downloads" / "Playlists"))
+    monkeypatch.setattr(config, "FS_INDEX_PATH", str(tmp_path / "fs_index.json"))
+    monkeypatch.setattr(output, "_console", output.create_console(output.QUIET))
+    application = Application(metrics_path=None, prometheus_path=None)
+    yield application
+    application.close()
+
+def test_run_batch_shares_one_directory_index(app, monkeypatch):
+    playlists = {
+        "https://example.com/a": Playlist(id="A", title="A", entries=[PlaylistEntry(id="x", url="", title="x"),
+                                                                      PlaylistEntry(id="y", url="", title="y")]),
+        "https://example.com/b": Playlist(id="B", title="B", entries=[PlaylistEntry(id="y", url="", title="y"),
+                                                                      PlaylistEntry(id="z", url="", title="z")]),
+    }
+    monkeypatch.setattr(download_playlist, "get_playlist_info", lambda url, **kwargs: playlists[url])
+    downloaded = []
+    def fake_download_playlist(playlist, db_manager, **kwargs):
+        downloaded.append([entry.id for entry in playlist.entries])
+        return playlist
+    monkeypatch.setattr(download_playlist, "download_playlist", fake_download_playlist)
+
+    indexes = []
+    def generate_smpl(playlist, playlist_name, db_manager, reverse=False, fs_index=None, console=None):
+        indexes.append(fs_index)
+        return True
+    monkeypatch.setattr(smpl, "generate_smpl", generate_smpl)
+
+    saves = []
+    original_save = DirectoryIndex.save
+    def save(self):
+        saves.append(self)
+        original_save(self)
+    monkeypatch.setattr(DirectoryIndex, "save", save)
+
+    app.run_batch([PlaylistRequest(url=url) for url in playlists])
+
+    assert downloaded == [["x", "y", "y", "z"]] # One pipeline for both playlists
+    assert len(indexes) == 2
+    assert indexes[0] is indexes[1]
+    assert isinstance(indexes[0], DirectoryIndex)
+    assert saves == [indexes[0]]
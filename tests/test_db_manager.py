@@ -0,0 +1,66 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import src.config as config
+from src.db.db_manager import DatabaseManager
+from src.util.output import create_console
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "test.db")
+    monkeypatch.setattr(config, "DB_PATH", path)
+    return path
+
+def _committed_ids(path: str) -> list:
+    conn = sqlite3.connect(path)
+    try:
+        return sorted(row[0] for row in conn.execute("SELECT video_id FROM videos"))
+    finally:
+        conn.close()
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_pending_writes_are_flushed_without_further_writes(db_path):
+    db_manager = DatabaseManager(console=create_console("quiet"), batch_size=100, flush_interval=0.05)
+    try:
+        db_manager.save_video_info("a", "A", "Channel", "@channel", "a.ogg")
+        assert _wait_for(lambda: _committed_ids(db_path) == ["a"])
+
+        flusher = db_manager._flush_thread
+        db_manager.save_video_info("b", "B", "Channel", "@channel", "b.ogg")
+        assert _wait_for(lambda: _committed_ids(db_path) == ["a", "b"])
+        # The same thread (and connection) serves every timed flush
+        assert db_manager._flush_thread is flusher
+    finally:
+        db_manager.close()
+
+def test_close_stops_the_flusher(db_path):
+    db_manager = DatabaseManager(console=create_console("quiet"), batch_size=100, flush_interval=60)
+    db_manager.save_video_info("a", "A", "Channel", "@channel", "a.ogg")
+    flusher = db_manager._flush_thread
+    db_manager.close()
+
+    assert not flusher.is_alive()
+    assert not any(thread.name == "db-flush" for thread in threading.enumerate())
+    assert _committed_ids(db_path) == ["a"]
+
+@pytest.mark.parametrize("batch_writes", [True, False], ids=["batched", "direct"])
+def test_recording_a_video_again_updates_it(db_path, batch_writes):
+    with DatabaseManager(console=create_console("quiet"), batch_writes=batch_writes) as db_manager:
+        db_manager.save_video_info("a", "Old", "Channel", "@channel", "old.ogg")
+        db_manager.flush()
+        db_manager.save_video_info("a", "New", "Channel", "@channel", "new.ogg", file_size=10)
+        db_manager.flush()
+        info = db_manager.get_video_info("a")
+
+    assert info["title"] == "New"
+    assert info["filename"] == "new.ogg"
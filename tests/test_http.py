@@ -0,0 +1,93 @@
+import io
+
+import pytest
+import requests
+import urllib3
+
+import src.util.http as http
+from src.exceptions import RangeNotSupportedError
+
+DATA = bytes(range(256)) * 64
+
+class _Raw:
+    def __init__(self, data: bytes, fail_after: int = -1) -> None:
+        self._stream = io.BytesIO(data)
+        self._fail_after = fail_after
+        self.decode_content = False
+
+    def readinto(self, view) -> int:
+        if self._fail_after >= 0:
+            if self._stream.tell() >= self._fail_after:
+                raise urllib3.exceptions.ProtocolError("Connection reset by peer")
+            view = view[:self._fail_after - self._stream.tell()]
+        return self._stream.readinto(view)
+
+class _Response:
+    def __init__(self, status_code: int, data: bytes, start: int = 0, fail_after: int = -1) -> None:
+        self.status_code = status_code
+        self.headers = {"Content-Length": str(len(data))}
+        if status_code == 206:
+            self.headers["Content-Range"] = f"bytes {start}-{start + len(data) - 1}/{len(DATA)}"
+        self.raw = _Raw(data, fail_after)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+    def close(self) -> None:
+        pass
+
+class _Session:
+    """Serves Range requests from DATA, with one scripted response per request."""
+    def __init__(self, script) -> None:
+        self._script = list(script)
+        self.ranges = []
+
+    def get(self, url, headers, stream, timeout):
+        start, _, end = headers["Range"][len("bytes="):].partition("-")
+        start, end = int(start), int(end)
+        self.ranges.append((start, end))
+        return self._script.pop(0)(start, end)
+
+def _partial(fail_after: int = -1):
+    return lambda start, end: _Response(206, DATA[start:end + 1], start, fail_after)
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(http.time, "sleep", lambda seconds: None)
+
+def _read_all(stream: http.RangeStream) -> bytes:
+    with io.BufferedReader(stream) as reader:
+        return reader.read()
+
+def test_dropped_connection_resumes(monkeypatch, no_sleep):
+    session = _Session([_partial(fail_after=1000), _partial()])
+    monkeypatch.setattr(http, "get_session", lambda: session)
+
+    assert _read_all(http.RangeStream("https://example.com/a", chunk_size=len(DATA))) == DATA
+    assert session.ranges[1][0] == 1000
+
+def test_missing_range_support_is_not_retried(monkeypatch, no_sleep):
+    full = lambda start, end: _Response(200, DATA)
+    session = _Session([_partial(), full, full, full])
+    monkeypatch.setattr(http, "get_session", lambda: session)
+
+    with pytest.raises(RangeNotSupportedError):
+        _read_all(http.RangeStream("https://example.com/a", chunk_size=4096))
+    assert len(session.ranges) == 2
+
+def test_http_error_is_not_retried(monkeypatch, no_sleep):
+    session = _Session([lambda start, end: _Response(404, b"")] * 3)
+    monkeypatch.setattr(http, "get_session", lambda: session)
+
+    with pytest.raises(requests.HTTPError):
+        _read_all(http.RangeStream("https://example.com/a"))
+    assert len(session.ranges) == 1
+
+def test_resumes_are_limited(monkeypatch, no_sleep):
+    session = _Session([_partial(fail_after=0)] * 3)
+    monkeypatch.setattr(http, "get_session", lambda: session)
+
+    with pytest.raises(urllib3.exceptions.ProtocolError):
+        _read_all(http.RangeStream("https://example.com/a", max_resumes=2))
+    assert len(session.ranges) == 3
@@ -0,0 +1,63 @@
+import os
+import sqlite3
+import time
+
+import pytest
+
+import src.config as config
+from src.db.db_manager import DatabaseManager
+from src.downloader import journal
+from src.downloader.journal import JobJournal
+from src.util.output import create_console
+
+@pytest.fixture
+def db_manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "test.db"))
+    manager = DatabaseManager(console=create_console("quiet"), batch_size=100, flush_interval=60)
+    yield manager
+    manager.close()
+
+def _committed(path: str, sql: str) -> list:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+def test_recorded_stage_is_committed_with_the_video(db_manager, tmp_path):
+    job_journal = JobJournal(db_manager, console=create_console("quiet"))
+    filepath = str(tmp_path / "a.ogg")
+    open(filepath, "wb").close()
+    job_journal.add([("a", filepath)])
+    job_journal.mark("a", journal.TAGGED, filepath)
+
+    db_manager.save_video_info("a", "A", "Channel", "@channel", "a.ogg")
+    job_journal.mark("a", journal.RECORDED, filepath)
+    # Neither is committed yet; a crash now resumes the video from TAGGED
+    assert _committed(config.DB_PATH, "SELECT stage FROM video_jobs") == [(journal.TAGGED,)]
+    assert _committed(config.DB_PATH, "SELECT video_id FROM videos") == []
+
+    db_manager.flush()
+    assert _committed(config.DB_PATH, "SELECT stage FROM video_jobs") == [(journal.RECORDED,)]
+    assert _committed(config.DB_PATH, "SELECT video_id FROM videos") == [("a",)]
+
+def test_garbage_collection_spares_recent_files(db_manager, tmp_path):
+    job_journal = JobJournal(db_manager, console=create_console("quiet"))
+    old_base, new_base = str(tmp_path / "old"), str(tmp_path / "new")
+    for base in (old_base, new_base):
+        for suffix in (".webm", ".ogg.part"):
+            open(base + suffix, "wb").close()
+    an_hour_ago = time.time() - 3600
+    for suffix in (".webm", ".ogg.part"):
+        os.utime(old_base + suffix, (an_hour_ago, an_hour_ago))
+    job_journal.add([("old", old_base + ".webm"), ("new", new_base + ".webm")])
+    job_journal.mark("old", journal.REMUXED, old_base + ".ogg")
+    job_journal.mark("new", journal.REMUXED, new_base + ".ogg")
+
+    job_journal.collect_garbage(min_age=600)
+
+    assert not os.path.exists(old_base + ".webm")
+    assert not os.path.exists(old_base + ".ogg.part")
+    # Possibly in use by another running sync
+    assert os.path.exists(new_base + ".webm")
+    assert os.path.exists(new_base + ".ogg.part")
@@ -0,0 +1,65 @@
+import os
+import sqlite3
+
+import pytest
+
+import src.config as config
+import src.converter.metadata as metadata
+from src.db import migrations
+from src.util.output import create_console
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    # A database from before schema versioning, with three downloaded videos
+    monkeypatch.setattr(config, "DOWN_DIR", str(tmp_path / "Downloads"))
+    channel_dir = tmp_path / "Downloads" / "Channel"
+    channel_dir.mkdir(parents=True)
+    (channel_dir / "a.ogg").write_bytes(b"\0" * 100)
+    (channel_dir / "corrupt.ogg").write_bytes(b"not an ogg file")
+
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE videos (video_id TEXT PRIMARY KEY, title TEXT, channel_name TEXT, channel_handle TEXT, filename TEXT)")
+    conn.executemany("INSERT INTO videos VALUES (?, ?, ?, ?, ?)", [
+        ("a", "A", "Channel", "@channel", "a.ogg"),
+        ("corrupt", "Corrupt", "Channel", "@channel", "corrupt.ogg"),
+        ("gone", "Gone", "Channel", "@channel", "gone.ogg"),
+    ])
+    conn.commit()
+    yield conn, path
+    conn.close()
+
+def test_backfill_runs_outside_the_write_lock(legacy_db, monkeypatch):
+    conn, path = legacy_db
+    console = create_console("quiet")
+    migrations.migrate(conn, console=console)
+
+    def read_duration(filepath):
+        # Another process must be able to write while files are being read
+        other = sqlite3.connect(path, timeout=0)
+        other.execute("BEGIN IMMEDIATE")
+        other.rollback()
+        other.close()
+        if filepath.endswith("corrupt.ogg"):
+            raise ValueError("corrupt")
+        return 1.5
+    monkeypatch.setattr(metadata, "read_duration", read_duration)
+
+    assert migrations.backfill_video_files(conn, batch_size=2, console=console) == 3
+    rows = {row[0]: row[1:] for row in conn.execute("SELECT video_id, file_size, duration, added_at FROM videos")}
+    assert rows["a"][:2] == (100, 1.5)
+    assert rows["corrupt"][:2] == (len(b"not an ogg file"), None)
+    assert rows["gone"][:2] == (None, None)
+    # Every row is done, including the one without a file
+    assert all(added_at is not None for _, _, added_at in rows.values())
+    assert migrations.backfill_video_files(conn, console=console) == 0
+
+def test_migrations_are_recorded_once(legacy_db):
+    conn, _ = legacy_db
+    console = create_console("quiet")
+
+    assert migrations.migrate(conn, console=console) == len(migrations.MIGRATIONS)
+    assert migrations.migrate(conn, console=console) == 0
+    assert migrations.get_schema_version(conn) == migrations.SCHEMA_VERSION
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(videos)")}
+    assert {"file_size", "mtime", "duration", "added_at"} <= columns
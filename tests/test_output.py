@@ -0,0 +1,49 @@
+import io
+import json
+
+from rich.markup import escape
+
+from src.util import output
+
+def _json_lines(console_file: io.StringIO) -> list:
+    return [json.loads(line) for line in console_file.getvalue().splitlines()]
+
+def test_json_lines_keep_bracketed_text():
+    console_file = io.StringIO()
+    console = output.create_console(output.JSON, file=console_file)
+
+    console.print(f"[bold green]⬇ Downloading {escape('[asmr] Rain [live]')} (abc)[/bold green]")
+    console.print(f"  [red]✖ Error:[/red] {escape('[youtube] abc: Video unavailable')}")
+
+    first, second = _json_lines(console_file)
+    assert first["message"] == "⬇ Downloading [asmr] Rain [live] (abc)"
+    assert first["level"] == "info"
+    assert second["message"] == "✖ Error: [youtube] abc: Video unavailable"
+
+def test_json_lines_levels_and_stray_tags():
+    console_file = io.StringIO()
+    console = output.create_console(output.JSON, file=console_file)
+
+    console.print("[yellow]⚠ Throttled[/yellow]")
+    console.print("[dim]details[/]")
+    console.print("unbalanced [/bold] tag")
+    console.print("[not markup]", markup=False)
+
+    lines = _json_lines(console_file)
+    assert [line["level"] for line in lines] == ["warning", "debug", "info", "info"]
+    assert [line["message"] for line in lines] == ["⚠ Throttled", "details", "unbalanced [/bold] tag", "[not markup]"]
+
+def test_console_output_keeps_escaped_titles():
+    console_file = io.StringIO()
+    console = output.create_console(output.CONSOLE, file=console_file)
+    console.print(f"[bold green]⬇ Downloading {escape('[asmr] Rain')}[/bold green]")
+    assert "[asmr] Rain" in console_file.getvalue()
+
+def test_quiet_mode_prints_only_the_summary():
+    console_file = io.StringIO()
+    console = output.create_console(output.QUIET, file=console_file)
+
+    console.print("[bold green]✔ Downloaded[/bold green]")
+    output.print_summary(console, "All done!", downloaded=2)
+
+    assert console_file.getvalue() == "All done! (downloaded: 2)\n"
@@ -0,0 +1,115 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from src.pipeline.engine import Pipeline, Stage
+
+def _alive_workers(*names: str) -> list:
+    return [thread for thread in threading.enumerate() if thread.name.split("-")[0] in names]
+
+def test_items_flow_through_every_stage():
+    done = []
+    pipeline = Pipeline([Stage("double", lambda x: x * 2, workers=3, queue_size=2),
+                         Stage("odd", lambda x: x + 1, workers=2)],
+                        on_item_done=lambda: done.append(1))
+
+    assert sorted(pipeline.run(range(50))) == [x * 2 + 1 for x in range(50)]
+    assert len(done) == 50
+
+def test_dropped_items_are_counted_and_reported():
+    done = []
+    pipeline = Pipeline([Stage("even", lambda x: x if x % 2 == 0 else None, workers=2),
+                         Stage("keep", lambda x: x)],
+                        on_item_done=lambda: done.append(1))
+
+    assert sorted(pipeline.run(range(10))) == [0, 2, 4, 6, 8]
+    assert len(done) == 10
+    even, keep = pipeline.stats()
+    assert (even.processed, even.dropped) == (5, 5)
+    assert (keep.processed, keep.dropped) == (5, 0)
+
+def test_stage_runs_its_workers_concurrently():
+    workers = 3
+    barrier = threading.Barrier(workers, timeout=5)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work(item):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        if item < workers:
+            barrier.wait() # Only passes if all workers run at once
+        time.sleep(0.001)
+        with lock:
+            active -= 1
+        return item
+
+    pipeline = Pipeline([Stage("work", work, workers=workers, queue_size=1)])
+    assert sorted(pipeline.run(range(20))) == list(range(20))
+    assert peak == workers
+
+def test_full_queues_block_the_input():
+    release = threading.Event()
+    pulled = []
+
+    def source():
+        for item in itertools.count():
+            pulled.append(item)
+            yield item
+            if item == 100:
+                return
+
+    def slow(item):
+        release.wait(5)
+        return item
+
+    pipeline = Pipeline([Stage("fast", lambda x: x, queue_size=1), Stage("slow", slow, queue_size=1)])
+    results = []
+    runner = threading.Thread(target=lambda: results.extend(pipeline.run(source())))
+    runner.start()
+    time.sleep(0.2)
+    # slow: 1 in progress + 1 queued; fast: 1 blocked on put + 1 queued; 1 blocked in the feeder
+    assert len(pulled) <= 5
+    release.set()
+    runner.join(5)
+    assert not runner.is_alive()
+    assert len(results) == 101
+
+def test_stage_error_aborts_and_propagates():
+    def fail_on_five(item):
+        if item == 5:
+            raise ValueError("bad item")
+        return item
+
+    pipeline = Pipeline([Stage("check", fail_on_five, workers=2, queue_size=2), Stage("after", lambda x: x, workers=2)])
+    with pytest.raises(ValueError, match="bad item"):
+        pipeline.run(itertools.count()) # Endless input; only the abort ends the run
+    assert not _alive_workers("check", "after")
+
+def test_input_error_propagates_after_shutdown():
+    def source():
+        yield 1
+        raise RuntimeError("listing failed")
+
+    pipeline = Pipeline([Stage("one", lambda x: x), Stage("two", lambda x: x)])
+    with pytest.raises(RuntimeError, match="listing failed"):
+        pipeline.run(source())
+    assert not _alive_workers("one", "two")
+
+def test_first_error_wins():
+    def fail(item):
+        raise KeyError(item)
+
+    pipeline = Pipeline([Stage("fail", fail, workers=4, queue_size=4)])
+    with pytest.raises(KeyError):
+        pipeline.run(range(20))
+    assert pipeline.stats()[0].dropped >= 1
+
+def test_pipeline_needs_a_stage():
+    with pytest.raises(ValueError):
+        Pipeline([])
@@ -0,0 +1,158 @@
+import io
+import struct
+
+import pytest
+
+from benchmarks.media import make_webm
+from src.converter import remux
+from src.exceptions import RemuxError
+
+def _reference_crc(data: bytes) -> int:
+    # Bitwise Ogg CRC-32 as in the spec, to check the zlib-based implementation against
+    crc = 0
+    for byte in data:
+        crc ^= byte << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) if crc & 0x80000000 else crc << 1
+            crc &= 0xFFFFFFFF
+    return crc
+
+def _read_pages(data: bytes) -> list:
+    pages = []
+    offset = 0
+    while offset < len(data):
+        capture, version, flags, granule, serial, sequence, crc, segment_count = \
+            struct.unpack_from("<4sBBqIIIB", data, offset)
+        assert capture == b"OggS"
+        assert version == 0
+        lacing = data[offset + 27:offset + 27 + segment_count]
+        payload_start = offset + 27 + segment_count
+        end = payload_start + sum(lacing)
+        assert end <= len(data), "lacing values exceed the page"
+
+        page = bytearray(data[offset:end])
+        page[22:26] = b"\x00\x00\x00\x00"
+        assert _reference_crc(bytes(page)) == crc
+
+        pages.append({"flags": flags, "granule": granule, "serial": serial, "sequence": sequence,
+                      "lacing": bytes(lacing), "payload": data[payload_start:end]})
+        offset = end
+    return pages
+
+def _packets(pages: list) -> list:
+    # Reassembles packets from the lacing values: a lace below 255 ends a packet
+    packets = []
+    current = b""
+    for page in pages:
+        position = 0
+        for lace in page["lacing"]:
+            current += page["payload"][position:position + lace]
+            position += lace
+            if lace < 255:
+                packets.append(current)
+                current = b""
+    assert current == b"", "stream ends inside a packet"
+    return packets
+
+@pytest.fixture
+def remuxed(tmp_path):
+    output_path = str(tmp_path / "out.ogg")
+    remux.remux_webm_to_ogg(io.BytesIO(make_webm(12, bitrate=160000)), output_path, {"title": ["Test"]})
+    with open(output_path, "rb") as f:
+        return f.read()
+
+def test_ogg_crc_matches_reference():
+    for data in (b"", b"OggS", bytes(range(256)) * 3):
+        assert remux._ogg_crc(data) == _reference_crc(data)
+
+def test_pages_are_valid(remuxed):
+    pages = _read_pages(remuxed)
+
+    assert [page["sequence"] for page in pages] == list(range(len(pages)))
+    assert len({page["serial"] for page in pages}) == 1
+    assert pages[0]["flags"] & 0x02
+    assert not any(page["flags"] & 0x02 for page in pages[1:])
+    assert pages[-1]["flags"] & 0x04
+    assert not any(page["flags"] & 0x04 for page in pages[:-1])
+
+def test_header_packets_have_own_pages(remuxed):
+    pages = _read_pages(remuxed)
+
+    assert pages[0]["granule"] == 0 and pages[0]["payload"].startswith(b"OpusHead")
+    assert pages[1]["granule"] == 0 and pages[1]["payload"].startswith(b"OpusTags")
+    assert b"title=Test" in pages[1]["payload"]
+
+def test_granule_positions(remuxed):
+    pages = _read_pages(remuxed)
+    audio_pages = pages[2:]
+
+    granules = [page["granule"] for page in audio_pages if page["granule"] != -1]
+    assert granules == sorted(granules)
+    # 12 s at 48 kHz; the synthetic stream has no end trimming
+    assert audio_pages[-1]["granule"] == 12 * 48000
+    # Pages on which no packet ends carry granule -1
+    for page in audio_pages:
+        if page["granule"] == -1:
+            assert all(lace == 255 for lace in page["lacing"])
+
+def test_packets_survive_round_trip(remuxed, tmp_path):
+    packets = _packets(_read_pages(remuxed))
+    webm = make_webm(12, bitrate=160000)
+    demuxed = [packet for packet, _ in remux._WebmOpusDemuxer(io.BytesIO(webm)).packets()]
+
+    assert packets[0].startswith(b"OpusHead")
+    assert packets[1].startswith(b"OpusTags")
+    assert packets[2:] == demuxed
+
+def test_large_packet_spans_pages(tmp_path):
+    buffer = io.BytesIO()
+    writer = remux._OggWriter(buffer, serial=1)
+    packet = bytes(range(256)) * 300 # Needs more than 255 lacing values
+    writer.write_packet(packet, 960)
+    writer.close()
+
+    pages = _read_pages(buffer.getvalue())
+    assert len(pages) == 2
+    assert pages[0]["granule"] == -1
+    assert pages[1]["flags"] & 0x01
+    assert _packets(pages) == [packet]
+
+@pytest.mark.parametrize("cut", [100, 1000, 5000])
+def test_truncated_input_raises_remux_error(tmp_path, cut):
+    webm = make_webm(2)
+    with pytest.raises(RemuxError):
+        remux.remux_webm_to_ogg(io.BytesIO(webm[:cut]), str(tmp_path / "out.ogg"))
+    assert not (tmp_path / "out.ogg.part").exists()
+
+@pytest.mark.parametrize("lace_sizes", [b"\xff\xff\xff\x10", b"\xff" * 240], ids=["overrun", "unterminated"])
+def test_corrupt_lacing_raises_remux_error(tmp_path, lace_sizes):
+    webm = bytearray(make_webm(2))
+    # Turn the first SimpleBlock into a Xiph-laced one whose lace sizes run past its end
+    block_start = webm.index(b"\x81\x00\x00\x80") # Track 1, timecode 0, keyframe
+    webm[block_start + 3] = 0x82
+    webm[block_start + 4:block_start + 4 + len(lace_sizes)] = lace_sizes
+    with pytest.raises(RemuxError):
+        remux.remux_webm_to_ogg(io.BytesIO(bytes(webm)), str(tmp_path / "out.ogg"))
+
+class _Unseekable(io.RawIOBase):
+    def __init__(self, stream: io.BytesIO) -> None:
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        return self._stream.readinto(buffer)
+
+@pytest.mark.parametrize("seekable", [True, False], ids=["file", "stream"])
+def test_input_cut_at_cluster_boundary_raises_remux_error(tmp_path, seekable):
+    webm = make_webm(12)
+    cluster_header = b"\x1f\x43\xb6\x75\x01\x00\x00\x00" # Cluster ID, 8-byte size
+    second_cluster = webm.index(cluster_header, webm.index(cluster_header) + 1)
+
+    source = io.BytesIO(webm[:second_cluster])
+    if not seekable:
+        source = io.BufferedReader(_Unseekable(source))
+    with pytest.raises(RemuxError):
+        remux.remux_webm_to_ogg(source, str(tmp_path / "out.ogg"))
+    assert not (tmp_path / "out.ogg").exists()
@@ -0,0 +1,41 @@
+import pytest
+from yt_dlp.utils import DownloadError, ExtractorError, GeoRestrictedError, UnsupportedError
+
+from src.downloader import retry
+
+def _download_error(message: str, expected: bool = True) -> DownloadError:
+    # As raised by YoutubeDL.extract_info for an extractor error
+    cause = ExtractorError(message, video_id="dQw4w9WgXcQ", ie="youtube", expected=expected)
+    return DownloadError(f"ERROR: {cause}", (type(cause), cause, None))
+
+@pytest.mark.parametrize("message", [
+    "Private video. Sign in if you've been granted access to this video",
+    "Video unavailable. This video has been removed by the uploader",
+    "This video is no longer available due to a copyright claim by Someone",
+    "This video contains content from Someone, who has blocked it on copyright grounds",
+    "Join this channel to get access to members-only content like this video, and other exclusive perks.",
+    "Sign in to confirm your age. This video may be inappropriate for some users.",
+])
+def test_unavailable_videos_are_permanent(message):
+    assert retry.is_permanent_error(_download_error(message))
+
+@pytest.mark.parametrize("message", [
+    "Video unavailable. This content isn't available, try again later.",
+    "Unable to download API page: HTTP Error 429: Too Many Requests",
+    "Unable to extract copyright notice; please report this issue",
+    "Requested format is not available. Use --list-formats for a list of available formats",
+])
+def test_transient_errors_are_retried(message):
+    assert not retry.is_permanent_error(_download_error(message))
+
+def test_classified_by_exception_type():
+    assert retry.is_permanent_error(UnsupportedError("https://example.com/video"))
+    geo = GeoRestrictedError("The uploader has not made this video available in your country.")
+    assert retry.is_permanent_error(DownloadError(f"ERROR: {geo}", (type(geo), geo, None)))
+
+def test_plain_messages():
+    assert retry.is_permanent_error(Exception("ERROR: [youtube] abc-123_x: Private video"))
+    # Only the start of the message counts
+    assert not retry.is_permanent_error(Exception("ERROR: [youtube] abc: Got error: copyright footer not found"))
+    assert not retry.is_permanent_error(ConnectionResetError("Connection reset by peer"))
+    assert not retry.is_permanent_error(None)
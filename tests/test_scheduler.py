@@ -0,0 +1,70 @@
+import pytest
+
+import src.util.output as output
+from src.playlist.batch import PlaylistRequest, parse_interval
+from src.playlist.scheduler import SyncScheduler
+
+@pytest.mark.parametrize("value, seconds", [("900", 900.0), ("90s", 90.0), ("15m", 900.0), ("2h", 7200.0),
+                                            ("1d", 86400.0), ("1.5h", 5400.0), (" 10 M ", 600.0)])
+def test_parse_interval(value, seconds):
+    assert parse_interval(value) == seconds
+
+@pytest.mark.parametrize("value", ["", "0", "0m", "-5", "5x", "m", "1h30m"])
+def test_parse_interval_rejects_invalid(value):
+    assert parse_interval(value) is None
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+def _run(requests, polls: int, sync_duration: float = 0.0, fail: bool = False, default_interval: float = 60.0):
+    """
+    Runs a scheduler on a fake clock for `polls` syncs; returns (time, urls) per sync.
+    """
+    clock = FakeClock()
+    synced = []
+    scheduler = None
+
+    def sync(due):
+        synced.append((clock.now - 1000.0, [request.url for request in due]))
+        clock.now += sync_duration
+        if len(synced) == polls:
+            scheduler.stop()
+        if fail:
+            raise RuntimeError("offline")
+
+    scheduler = SyncScheduler(requests, sync, default_interval=default_interval,
+                              console=output.create_console(output.QUIET), clock=clock, sleep=clock.sleep)
+    scheduler.run()
+    return synced
+
+def test_first_polls_are_staggered_across_the_interval():
+    requests = [PlaylistRequest(url=url) for url in ("a", "b", "c")]
+    assert _run(requests, polls=4) == [(0.0, ["a"]), (20.0, ["b"]), (40.0, ["c"]), (60.0, ["a"])]
+
+def test_playlists_due_together_are_synced_together():
+    requests = [PlaylistRequest(url="a", interval=10), PlaylistRequest(url="b", interval=20)]
+    assert _run(requests, polls=3) == [(0.0, ["a"]), (10.0, ["a", "b"]), (20.0, ["a"])]
+
+def test_long_sync_skips_missed_polls_but_keeps_the_schedule():
+    requests = [PlaylistRequest(url="a", interval=10)]
+    assert _run(requests, polls=3, sync_duration=25) == [(0.0, ["a"]), (30.0, ["a"]), (60.0, ["a"])]
+
+def test_failed_sync_is_retried_at_the_next_poll():
+    requests = [PlaylistRequest(url="a", interval=10)]
+    assert _run(requests, polls=2, fail=True) == [(0.0, ["a"]), (10.0, ["a"])]
+
+def test_stop_before_run_syncs_nothing():
+    synced = []
+    clock = FakeClock()
+    scheduler = SyncScheduler([PlaylistRequest(url="a")], synced.append,
+                              console=output.create_console(output.QUIET), clock=clock, sleep=clock.sleep)
+    scheduler.stop()
+    scheduler.run()
+    assert synced == []
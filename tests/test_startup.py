@@ -0,0 +1,26 @@
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Imported only when a download, conversion or HTTP request actually happens
+HEAVY_MODULES = ("yt_dlp", "mutagen", "ffmpeg", "magic", "requests")
+# About 0.05 s in practice; an eager yt_dlp import alone takes about 0.2 s
+IMPORT_TIME_BUDGET = 0.5 # seconds
+
+def _import_main() -> dict:
+    code = ("import json, sys, time\n"
+            "started_at = time.perf_counter()\n"
+            "import main\n"
+            "elapsed = time.perf_counter() - started_at\n"
+            f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n")
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_import_main_skips_heavy_dependencies():
+    assert _import_main()["loaded"] == []
+
+def test_import_main_is_fast():
+    assert _import_main()["elapsed"] < IMPORT_TIME_BUDGET
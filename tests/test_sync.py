@@ -0,0 +1,49 @@
+import pytest
+
+import src.config as config
+import src.playlist.smpl as smpl
+import src.util.output as output
+from src.app import Application
+from src.playlist.model import Playlist, PlaylistEntry
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.setattr(config, "SMPL_DIR", str(tmp_path / "Playlists"))
+    monkeypatch.setattr(output, "_console", output.create_console(output.QUIET))
+    application = Application(metrics_path=None, prometheus_path=None)
+    yield application
+    application.close()
+
+@pytest.fixture
+def generated(monkeypatch, tmp_path):
+    calls = []
+    def generate_smpl(playlist, playlist_name, db_manager, reverse=False, fs_index=None, console=None):
+        calls.append([entry.id for entry in playlist.entries])
+        (tmp_path / "Playlists").mkdir(exist_ok=True)
+        open(smpl.get_smpl_path(playlist_name), "w").close()
+        return True
+    monkeypatch.setattr(smpl, "generate_smpl", generate_smpl)
+    return calls
+
+def _sync(app: Application, ids: list, available: set) -> None:
+    playlist = Playlist(id="PL", title="Title",
+                        entries=[PlaylistEntry(id=video_id, url="", title=video_id) for video_id in ids if video_id in available])
+    app._sync_playlist(playlist, "PL", "Title", False, app.db_manager.get_playlist_snapshot("PL"),
+                       ids, available, fetched_at=0.0)
+    app.db_manager.flush()
+
+def test_unchanged_playlist_is_not_regenerated(app, generated):
+    _sync(app, ["a", "b"], {"a", "b"})
+    _sync(app, ["a", "b"], {"a", "b"})
+    assert generated == [["a", "b"]]
+
+def test_newly_available_video_regenerates(app, generated):
+    _sync(app, ["a", "b"], {"a"})
+    _sync(app, ["a", "b"], {"a", "b"})
+    assert generated == [["a"], ["a", "b"]]
+
+def test_video_no_longer_available_regenerates(app, generated):
+    _sync(app, ["a", "b"], {"a", "b"})
+    _sync(app, ["a", "b"], {"a"})
+    assert generated == [["a", "b"], ["a"]]